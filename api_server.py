@@ -0,0 +1,274 @@
+"""봇용 로컬 JSON HTTP API (asyncio, 표준 라이브러리만).
+
+    python api_server.py --port 8765
+
+엔드포인트 (요청/응답 모두 JSON, POST)
+  - /gear/deficit    : batch_deficit 의 연맹원 한 줄과 같은 형식
+                       {"parts": {"Coat": ["Gold", "Legendary"]}, "owned": {...}, "packages": {...}}
+  - /packages/totals : {"packages": {"Sublime_$5": 2}} → 자원별 합계
+  - /build/time      : {"levels": {"Furnace": ["FC5", "FC8"]}, "construction_speed": 85,
+                        "double_time": true, "vp": true, "hyena": 15}
+                       → 버프 적용 건설 시간 (build_time_new.py 와 같은 식, 속도/보너스는 % 단위)
+  - /batch           : [{"path": "/build/time", "body": {...}}, ...] → 같은 순서의 결과 목록
+                       (연결 하나, 요청 하나로 여러 계산 — 항목마다 캐시를 따로 본다)
+  - GET /health, GET /stats
+
+  - 표는 시작할 때 한 번 읽는다 (calc_engine, data/snapshot.bin). 데이터 파일이 바뀌면
+    data_watch 가 재시작 없이 새 표로 바꾸고 응답 캐시를 비운다.
+  - 계산 결과는 (경로, 정규화한 본문) 을 키로 result_cache 에 객체로 둔다 (/batch 가 항목마다 같은 캐시를
+    쓰므로). JSON 인코딩은 응답마다 한다.
+  - 계산은 수 μs 라 이벤트 루프에서 바로 한다. HTTP/1.1 keep-alive 를 지원한다.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import calc_engine as engine
+import data_watch
+import result_cache
+from batch_deficit import member_deficit
+
+MAX_BODY_BYTES = 1_000_000
+MAX_BATCH = 1000
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+class RequestError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# --- 계산 ---
+
+def _number(value: Any, what: str) -> float:
+    """0 이상의 유한한 JSON 수 (true / false, 문자열은 안 된다)."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value < 0:
+        raise RequestError(400, f"{what} must be a non-negative number")
+    return float(value)
+
+
+def _counts(values: Any, what: str) -> Dict[str, int]:
+    """이름 → 0 이상 정수 (수량 / 보유량)."""
+    if not isinstance(values, dict):
+        raise RequestError(400, f"{what} must be a JSON object")
+    counts = {}
+    for key, value in values.items():
+        if _number(value, f"{what} {key}") != int(value):
+            raise RequestError(400, f"{what} {key} must be an integer")
+        counts[key] = int(value)
+    return counts
+
+
+def gear_deficit(body: dict) -> dict:
+    # 평면 형식이면 보유량 / 패키지 수량이 본문 최상위에 있다 (batch_deficit.normalize_profile 과 같은 규칙)
+    for what, keys in (("owned", engine.GEAR_RESOURCES), ("packages", engine.load_packages().keys)):
+        values = body.get(what) or body
+        _counts({k: v for k, v in values.items() if k in keys} if isinstance(values, dict) else values, what)
+    result = member_deficit(body)
+    if "error" in result:
+        raise RequestError(400, result["error"])
+    result.pop("member", None)
+    return result
+
+
+def package_totals(body: dict) -> dict:
+    packages = engine.load_packages()
+    counts = _counts(body.get("packages") or {}, "packages")
+    unknown = [k for k in counts if k not in packages.index]
+    if unknown:
+        raise RequestError(400, f"unknown packages: {', '.join(unknown)}")
+    return engine.package_totals(counts, packages)
+
+
+def _flag(body: dict, key: str, default: bool) -> bool:
+    value = body.get(key, default)
+    if not isinstance(value, bool):
+        raise RequestError(400, f"{key} must be true or false")
+    return value
+
+
+def build_time(body: dict) -> dict:
+    table = engine.load_build_table()
+    per_building = {}
+    for b, (start, end) in (body.get("levels") or {}).items():
+        if b not in table.level_to_num or start not in table.level_to_num[b] or end not in table.level_to_num[b]:
+            raise RequestError(400, f"unknown building or level: {b} {start} → {end}")
+        per_building[b] = table.range_total(b, start, end)
+    total = sum(per_building.values())
+    adjusted = engine.adjusted_build_time(
+        total,
+        _number(body.get("construction_speed", 85.0), "construction_speed") / 100,
+        _flag(body, "double_time", True),
+        _flag(body, "vp", True),
+        _number(body.get("hyena", 0), "hyena") / 100,
+    )
+    return {
+        "total_seconds": total,
+        "adjusted_seconds": adjusted,
+        "adjusted": engine.secs_to_str(adjusted),
+        "per_building_seconds": per_building,
+    }
+
+
+HANDLERS: Dict[str, Callable[[dict], Any]] = {
+    "/gear/deficit": gear_deficit,
+    "/packages/totals": package_totals,
+    "/build/time": build_time,
+}
+
+
+# --- 라우팅 / 캐시 ---
+
+class Api:
+    def __init__(self, cache: result_cache.ResultCache):
+        self.cache = cache
+        self.requests = 0
+        self.started = time.time()
+
+    def call(self, path: str, body: Any) -> Any:
+        """한 계산의 결과 (JSON 으로 바꿀 수 있는 값). 캐시는 정규화한 (경로, 본문) 기준."""
+        handler = HANDLERS.get(path)
+        if handler is None:
+            raise RequestError(404, f"no endpoint {path}")
+        if not isinstance(body, dict):
+            raise RequestError(400, "body must be a JSON object")
+        key = (path, result_cache.encode_plan(body))
+        missing = object()
+        generation = self.cache.generation
+        result = self.cache.get(key, missing)
+        if result is missing:
+            try:
+                result = handler(body)
+            except RequestError:
+                raise
+            except (KeyError, ValueError, TypeError, AttributeError, ArithmeticError) as e:
+                raise RequestError(400, f"{type(e).__name__}: {e}")
+            self.cache.put(key, result, generation)
+        return result
+
+    def batch(self, items: Any) -> list:
+        if not isinstance(items, list):
+            raise RequestError(400, "batch body must be a JSON list")
+        if len(items) > MAX_BATCH:
+            raise RequestError(413, f"at most {MAX_BATCH} items per batch")
+        out = []
+        for item in items:
+            try:
+                if not isinstance(item, dict):
+                    raise RequestError(400, "batch item must be {\"path\": ..., \"body\": {...}}")
+                out.append({"result": self.call(item.get("path", ""), item.get("body") or {})})
+            except RequestError as e:
+                out.append({"error": str(e), "status": e.status})
+        return out
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "uptime_seconds": round(time.time() - self.started, 1),
+                "cache": self.cache.stats()}
+
+    def dispatch(self, method: str, path: str, raw: bytes) -> Tuple[int, Any]:
+        self.requests += 1
+        try:
+            if method == "GET":
+                if path == "/health":
+                    return 200, {"ok": True}
+                if path == "/stats":
+                    return 200, self.stats()
+                raise RequestError(405 if path in HANDLERS or path == "/batch" else 404, f"GET {path}")
+            if method != "POST":
+                raise RequestError(405, f"{method} not allowed")
+            try:
+                body = json.loads(raw or b"{}")
+            except ValueError as e:
+                raise RequestError(400, f"invalid JSON: {e}")
+            if path == "/batch":
+                return 200, self.batch(body)
+            return 200, self.call(path, body)
+        except RequestError as e:
+            return e.status, {"error": str(e)}
+
+
+# --- HTTP ---
+
+def _response(status: int, payload: Any, keep_alive: bool) -> bytes:
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def _serve_connection(api: Api, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            method, target, version = request_line.decode("latin-1").split()
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+            length = int(headers.get("content-length") or 0)
+            if length > MAX_BODY_BYTES:
+                writer.write(_response(413, {"error": "body too large"}, False))
+                await writer.drain()
+                break
+            raw = await reader.readexactly(length) if length else b""
+            status, payload = api.dispatch(method, target.split("?", 1)[0], raw)
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8765, cache: Optional[result_cache.ResultCache] = None,
+                ready: Optional[Callable[[int], None]] = None) -> None:
+    # 표는 프로세스당 한 번 (첫 요청이 읽기를 기다리지 않도록 미리)
+    engine.load_gear_table()
+    engine.load_packages()
+    engine.load_build_table()
+    api = Api(cache or result_cache.ResultCache(maxsize=4096, ttl=600))
+    data_watch.on_swap(api.cache.clear)
+    data_watch.start()
+    server = await asyncio.start_server(lambda r, w: _serve_connection(api, r, w), host, port)
+    bound = server.sockets[0].getsockname()[1]
+    if ready:
+        ready(bound)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="WOS 계산기 JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="0 이면 빈 포트")
+    parser.add_argument("--cache-size", type=int, default=4096)
+    parser.add_argument("--cache-ttl", type=float, default=600, help="초")
+    args = parser.parse_args(argv)
+    cache = result_cache.ResultCache(args.cache_size, args.cache_ttl)
+    try:
+        asyncio.run(serve(args.host, args.port, cache,
+                          ready=lambda port: print(f"listening on http://{args.host}:{port}", flush=True)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
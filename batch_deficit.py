@@ -0,0 +1,134 @@
+"""연맹원 명단 일괄 부족 자원 계산.
+
+입력: CSV 또는 JSONL (한 줄 = 연맹원 1명)
+  - member                           : 이름 / ID
+  - Coat_cur, Coat_tar, ... Watch_tar : 부위별 현재 / 목표 등급 (gear_data.csv 의 Level)
+  - Design, Alloy, Polish, Amber      : 보유 자원
+  - Sublime_$5 ... DawnMarket_$100    : 패키지 구매 수량 (packages.csv 의 Category_Package)
+  JSONL 은 위 평면 형식 외에 {"parts": {"Coat": [cur, tar]}, "owned": {...}, "packages": {...}} 도 허용.
+
+출력: 연맹원별 필요량 / 보유량(패키지 포함) / 부족량을 입력 순서대로 한 줄씩 스트리밍.
+
+    python batch_deficit.py roster.csv -o deficits.jsonl --workers 4
+"""
+
+import argparse
+import sys
+from typing import Iterable, Iterator, List, Mapping, Optional, TextIO, Tuple, Union
+
+import calc_engine as engine
+from roster_io import (
+    BadLine, chunks, default_workers, detect_format, map_chunks, open_streams, read_profiles, write_rows,
+)
+
+# 이 크기 이상의 입력 파일은 프로세스 풀로 처리 (연맹원 1명 ≈ 200 바이트)
+POOL_THRESHOLD_BYTES = 20_000_000
+
+
+def _count(value) -> int:
+    return int(float(value)) if value not in (None, "") else 0
+
+
+def normalize_profile(raw: dict) -> dict:
+    """평면 / 중첩 형식 → {"member", "plan": [(cur, tar)], "owned", "packages"}."""
+    parts = raw.get("parts") or {}
+    plan = []
+    for part in engine.GEAR_PARTS:
+        cur, tar = parts.get(part) or (raw.get(f"{part}_cur"), raw.get(f"{part}_tar"))
+        if cur and tar:
+            plan.append((cur.strip(), tar.strip()))
+    owned_src = raw.get("owned") or raw
+    owned = {k: _count(owned_src.get(k)) for k in engine.GEAR_RESOURCES}
+    packages_src = raw.get("packages") or raw
+    packages = {
+        key: _count(packages_src.get(key))
+        for key in engine.load_packages().keys if _count(packages_src.get(key)) > 0
+    }
+    return {"member": raw.get("member", ""), "plan": plan, "owned": owned, "packages": packages}
+
+
+def _profile(raw: Union[dict, BadLine]) -> Union[dict, Tuple[None, dict]]:
+    """정규화한 명단 한 줄, 또는 읽을 수 없으면 (None, error 행)."""
+    if isinstance(raw, BadLine):
+        return None, {"member": "", "error": f"line {raw.line}: {raw.error}"}
+    if not isinstance(raw, dict):
+        return None, {"member": "", "error": f"TypeError: expected a JSON object, got {type(raw).__name__}"}
+    try:
+        return normalize_profile(raw)
+    except (KeyError, ValueError, TypeError, AttributeError) as e:
+        return None, {"member": raw.get("member", ""), "error": f"{type(e).__name__}: {e}"}
+
+
+def _summarize(profile: dict, package_resources: Mapping[str, int]) -> dict:
+    owned = {k: v + package_resources.get(k, 0) for k, v in profile["owned"].items()}
+    try:
+        summary = engine.gear_deficit(profile["plan"], owned)
+    except (KeyError, ValueError, TypeError, AttributeError) as e:
+        return {"member": profile["member"], "error": f"{type(e).__name__}: {e}"}
+    result = {"member": profile["member"]}
+    for row in summary:
+        result[f"{row.resource}_needed"] = row.needed
+        result[f"{row.resource}_owned"] = row.owned
+        result[f"{row.resource}_deficit"] = row.deficit
+    return result
+
+
+def member_deficit(raw: Union[dict, BadLine]) -> dict:
+    profile = _profile(raw)
+    if isinstance(profile, tuple):
+        return profile[1]
+    return _summarize(profile, engine.package_totals(profile["packages"]))
+
+
+def _deficit_chunk(chunk: List[Union[dict, BadLine]]) -> List[dict]:
+    """청크 단위: 읽은 연맹원들의 패키지 합계는 PackageMatrix.totals_batch 행렬 곱 한 번으로."""
+    profiles = [_profile(raw) for raw in chunk]
+    ok = [p for p in profiles if not isinstance(p, tuple)]
+    totals = engine.load_packages().totals_batch([p["packages"] for p in ok]).tolist() if ok else []
+    per_member = iter(totals)
+    return [
+        p[1] if isinstance(p, tuple) else _summarize(p, dict(zip(engine.GEAR_RESOURCES, next(per_member))))
+        for p in profiles
+    ]
+
+
+def iter_deficits(
+    profiles: Iterable[dict], workers: int = 0, chunk_size: int = 500
+) -> Iterator[dict]:
+    """입력 순서대로 결과를 내보낸다 (workers > 0 이면 프로세스 풀, roster_io.map_chunks)."""
+    return map_chunks(_deficit_chunk, ((chunk,) for chunk in chunks(profiles, chunk_size)), workers)
+
+
+FIELDS: List[str] = ["member"] + [
+    f"{k}_{col}" for k in engine.GEAR_RESOURCES for col in ("needed", "owned", "deficit")
+] + ["error"]
+
+
+def write_results(results: Iterable[dict], out: TextIO, fmt: str) -> int:
+    return write_rows(results, out, fmt, FIELDS)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="연맹원 명단 일괄 부족 자원 계산")
+    parser.add_argument("input", help="명단 파일 (.csv / .jsonl, '-' = stdin)")
+    parser.add_argument("-o", "--output", default="-", help="결과 파일 (.csv / .jsonl, 기본: stdout)")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"])
+    parser.add_argument("--output-format", choices=["csv", "jsonl"])
+    parser.add_argument("--workers", type=int, default=None,
+                        help=f"프로세스 수 (기본: {POOL_THRESHOLD_BYTES:,} 바이트 이상이고 CPU 가 2개 이상이면 CPU 수, 아니면 0)")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    in_fmt = args.input_format or detect_format(args.input)
+    out_fmt = args.output_format or ("jsonl" if args.output == "-" else detect_format(args.output))
+    workers = args.workers if args.workers is not None else default_workers(args.input, POOL_THRESHOLD_BYTES)
+
+    with open_streams(args.input, args.output) as (fin, fout):
+        results = iter_deficits(read_profiles(fin, in_fmt), workers, args.chunk_size)
+        n = write_results(results, fout, out_fmt)
+    print(f"{n} members processed", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
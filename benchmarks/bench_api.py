@@ -0,0 +1,141 @@
+"""api_server 부하 테스트 (keep-alive 연결 여러 개로 동시에 요청).
+
+서버를 자식 프로세스로 띄우거나 (기본), --port 로 이미 떠 있는 서버를 친다.
+요청은 고정 시드로 만든 계획 --distinct 개 중에서 고르므로 캐시 적중률도 함께 볼 수 있다.
+
+    python benchmarks/bench_api.py --requests 5000 --concurrency 32
+    python benchmarks/bench_api.py --port 8765 --batch 20
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import calc_engine as engine  # noqa: E402
+
+
+def make_requests(rng: random.Random, distinct: int):
+    gear = engine.load_gear_table()
+    build = engine.load_build_table()
+    packages = engine.load_packages()
+    out = []
+    for i in range(distinct):
+        kind = i % 3
+        if kind == 0:
+            parts = {}
+            for part in engine.GEAR_PARTS:
+                a, b = sorted(rng.sample(range(len(gear.levels)), 2))
+                parts[part] = [gear.levels[a], gear.levels[b]]
+            body = {"parts": parts, "owned": {"Design": rng.randrange(0, 2000)}}
+            out.append(("/gear/deficit", body))
+        elif kind == 1:
+            body = {"packages": {k: rng.randrange(1, 4) for k in rng.sample(packages.keys, 3)}}
+            out.append(("/packages/totals", body))
+        else:
+            levels = {}
+            for b in rng.sample(list(build.levels), 3):
+                a, c = sorted(rng.sample(range(len(build.levels[b])), 2))
+                levels[b] = [build.levels[b][a], build.levels[b][c]]
+            body = {"levels": levels, "construction_speed": rng.choice([70, 85, 100]), "hyena": 15}
+            out.append(("/build/time", body))
+    return out
+
+
+async def _request(reader, writer, path: str, payload) -> int:
+    body = json.dumps(payload).encode()
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def _worker(port: int, jobs, latencies, errors):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while jobs:
+            path, payload = jobs.pop()
+            t = time.perf_counter()
+            status = await _request(reader, writer, path, payload)
+            latencies.append((time.perf_counter() - t) * 1000)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load(port: int, requests, concurrency: int):
+    jobs = list(requests)
+    latencies, errors = [], []
+    t = time.perf_counter()
+    await asyncio.gather(*(_worker(port, jobs, latencies, errors) for _ in range(concurrency)))
+    return time.perf_counter() - t, sorted(latencies), errors
+
+
+def _start_server():
+    proc = subprocess.Popen(
+        [sys.executable, str(ROOT / "api_server.py"), "--port", "0"],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True,
+    )
+    line = proc.stdout.readline()
+    if not line.startswith("listening"):
+        proc.kill()
+        raise RuntimeError(f"server did not start: {line!r}")
+    return proc, int(line.rsplit(":", 1)[1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="JSON API 부하 테스트")
+    parser.add_argument("--port", type=int, help="이미 떠 있는 서버 (없으면 자식 프로세스로 띄움)")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--distinct", type=int, default=300, help="서로 다른 계획 수 (작을수록 캐시 적중↑)")
+    parser.add_argument("--batch", type=int, default=0, help="N 개씩 /batch 로 묶어 보냄")
+    parser.add_argument("--seed", type=int, default=14)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    pool = make_requests(rng, args.distinct)
+    requests = [rng.choice(pool) for _ in range(args.requests)]
+    if args.batch:
+        requests = [
+            ("/batch", [{"path": p, "body": b} for p, b in requests[i:i + args.batch]])
+            for i in range(0, len(requests), args.batch)
+        ]
+
+    proc, port = (None, args.port) if args.port else _start_server()
+    try:
+        secs, latencies, errors = asyncio.run(run_load(port, requests, args.concurrency))
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+
+    items = args.requests
+    print(f"{len(requests)} HTTP requests ({items} calculations), concurrency {args.concurrency}")
+    print(f"  {len(requests) / secs:,.0f} req/s, {items / secs:,.0f} calculations/s, errors {len(errors)}")
+    print(f"  latency p50 {pct(0.5):.2f} ms, p95 {pct(0.95):.2f} ms, p99 {pct(0.99):.2f} ms")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
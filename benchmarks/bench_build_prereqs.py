@@ -0,0 +1,76 @@
+"""build_prereqs.plan_account 실행 시간 (선행 조건 확장 + 위상 정렬 + 시간 합계).
+
+  - cold   : 새 그래프 (닫힘 메모가 빈 상태) 에서 용광로 30 → FC10
+  - warm   : 같은 그래프로 다시 (메모 재사용)
+  - random : 건물 1~3개에 무작위 목표, 현재 레벨도 무작위 (고정 시드)
+
+data/build_prereqs.csv 에는 확인된 조건만 두므로 (지금은 비어 있다) 벤치마크는 비슷한 모양의
+가짜 그래프로 잰다: 용광로의 각 레벨은 대사관을, 주 FC 단계는 건물 하나를 더 한 단계 아래로 요구한다.
+게임의 실제 조건이 아니다.
+
+    python benchmarks/bench_build_prereqs.py --plans 200
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import build_prereqs  # noqa: E402
+import calc_engine as engine  # noqa: E402
+
+
+def synthetic_graph(table: engine.BuildTable) -> build_prereqs.PrereqGraph:
+    """data/build_prereqs.csv 와 같은 크기 · 모양의 가짜 선행 조건 (벤치마크 전용)."""
+    others = [b for b in table.levels if b not in ("Furnace", "Embassy")]
+    nums = {b: sorted(table.totals[b]) for b in table.levels}
+
+    def below(building, num):
+        lower = [n for n in nums[building] if n < num]
+        return (building, lower[-1]) if lower else None
+
+    requires = {}
+    for label in table.levels["Furnace"][1:]:
+        num = table.level_to_num["Furnace"][label]
+        deps = [below("Embassy", num)]
+        if label.startswith("FC") and "-" not in label:
+            deps.append(below(others[num % len(others)], num))
+        requires[("Furnace", num)] = [d for d in deps if d]
+    return build_prereqs.PrereqGraph(requires, table)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="선행 조건 계정 계획 벤치마크")
+    parser.add_argument("--plans", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=18)
+    args = parser.parse_args(argv)
+
+    t = time.perf_counter()
+    graph = synthetic_graph(engine.load_build_table())
+    print(f"load: {(time.perf_counter() - t) * 1000:.1f} ms, {len(graph.requires)} nodes with prerequisites")
+
+    current = {b: ("30" if "30" in levels else levels[0]) for b, levels in graph.table.levels.items()}
+    for label in ("cold", "warm"):
+        t = time.perf_counter()
+        plan = build_prereqs.plan_account({"Furnace": "FC10"}, current, graph)
+        print(f"{label}: Furnace 30 → FC10, {len(plan.order)} upgrades, {(time.perf_counter() - t) * 1000:.2f} ms")
+
+    rng = random.Random(args.seed)
+    times = []
+    for _ in range(args.plans):
+        cur = {b: levels[rng.randrange(len(levels) // 2)] for b, levels in graph.table.levels.items()}
+        goals = {b: levels[rng.randrange(len(levels) // 2, len(levels))]
+                 for b, levels in graph.table.levels.items() if rng.random() < 0.3}
+        t = time.perf_counter()
+        build_prereqs.plan_account(goals, cur, graph)
+        times.append((time.perf_counter() - t) * 1000)
+    times.sort()
+    print(f"random: {len(times)} plans, median {times[len(times) // 2]:.2f} ms, max {times[-1]:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""build_scheduler.schedule_two_queues 실행 시간과 하한 대비 품질.
+
+  - full   : 9개 건물 전체 (30-1 또는 첫 레벨 → FC10)
+  - random : 건물마다 무작위 (현재, 목표) 구간 (고정 시드)
+
+    python benchmarks/bench_build_scheduler.py --plans 200
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import calc_engine as engine  # noqa: E402
+from build_scheduler import plan_upgrades, schedule_two_queues  # noqa: E402
+
+
+def _timed(selections):
+    chains = plan_upgrades(selections)
+    t = time.perf_counter()
+    schedule = schedule_two_queues(chains)
+    return time.perf_counter() - t, chains, schedule
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="건설 대기열 일정 벤치마크")
+    parser.add_argument("--plans", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    table = engine.load_build_table()
+    _timed({"Furnace": ("FC1", "FC2")})  # numpy 등 첫 import 제외
+
+    full = {
+        b: ("30-1" if "30-1" in levels else levels[0], levels[-1])
+        for b, levels in table.levels.items()
+    }
+    secs, chains, schedule = _timed(full)
+    sequential = sum(job.seconds for jobs in chains.values() for job in jobs)
+    print(f"full: {sum(map(len, chains.values()))} upgrades, {secs * 1000:.1f} ms")
+    print(f"  1 queue {engine.secs_to_str(sequential)} → 2 queues {engine.secs_to_str(schedule.makespan)}"
+          f" (lower bound {engine.secs_to_str(schedule.lower_bound)})")
+
+    rng = random.Random(args.seed)
+    times, gaps, optimal = [], [], 0
+    for _ in range(args.plans):
+        selections = {}
+        for b, levels in table.levels.items():
+            if rng.random() < 0.6:
+                i, j = sorted(rng.sample(range(len(levels)), 2))
+                selections[b] = (levels[i], levels[j])
+        secs, _, schedule = _timed(selections)
+        times.append(secs * 1000)
+        gaps.append(schedule.makespan - schedule.lower_bound)
+        optimal += schedule.optimal
+    times.sort()
+    print(f"random: {args.plans} plans, median {times[len(times) // 2]:.1f} ms, max {times[-1]:.1f} ms")
+    print(f"  optimal (= lower bound) {optimal}/{args.plans}, max gap {max(gaps):,.0f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""프로세스 하나가 데이터 표를 쓸 수 있게 되기까지의 시간 (스냅샷 vs CSV 파싱).
+
+매 회 새 파이썬 프로세스를 띄워 calc_engine / data_snapshot import 뒤
+load_gear_table, load_packages, load_build_table, load_labeled_build_table 네 개를 부른다.
+  - snapshot : 기본 경로 → data/snapshot.bin mmap
+  - csv      : CSV 경로를 직접 넘겨 파싱 (스냅샷 이전 방식)
+
+    python benchmarks/bench_data_snapshot.py --runs 20
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import data_snapshot  # noqa: E402
+
+_CHILD = """
+import time
+import calc_engine as e, data_snapshot
+D = e.DATA_DIR
+t = time.perf_counter()
+if {csv}:
+    e.load_gear_table(D / "gear_data.csv"); e.load_packages(D / "packages.csv")
+    e.load_build_table(D / "build_numeric.csv"); e.load_labeled_build_table(D / "build_time_clean.csv")
+else:
+    e.load_gear_table(); e.load_packages(); e.load_build_table(); e.load_labeled_build_table()
+print(time.perf_counter() - t)
+"""
+
+
+def _run(csv: bool) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD.format(csv=csv)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return float(out.stdout)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="데이터 준비 시간 벤치마크")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    path = data_snapshot.compile_snapshot()
+    print(f"{path.name}: {path.stat().st_size:,} bytes")
+    print(f"{'source':<10} {'median ms':>10} {'p95 ms':>8}")
+    for name, csv in (("snapshot", False), ("csv", True)):
+        times = sorted(_run(csv) * 1000 for _ in range(args.runs))
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+        print(f"{name:<10} {statistics.median(times):>10.2f} {p95:>8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""gear_forecast 실행 시간.
+
+  - single : 연맹원 1명, 시나리오 수별 forecast (신화 T1 근처 부족량, 주 2회 이벤트)
+  - roster : 무작위 연맹원 명단 (고정 시드) 을 직렬 / 프로세스 풀로 (결과가 같은지도 확인)
+
+    python benchmarks/bench_gear_forecast.py --members 40 --workers 4
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import calc_engine as engine  # noqa: E402
+import gear_forecast  # noqa: E402
+
+INCOME = gear_forecast.Income(
+    daily={"Design": 4, "Alloy": 20000, "Polish": 120, "Amber": 0.5},
+    events=(gear_forecast.EventDrop("weekly", 2 / 7, {"Design": 20, "Alloy": 60000, "Polish": 400, "Amber": 3}),),
+)
+
+
+def _roster(n: int, seed: int):
+    rng = random.Random(seed)
+    levels = engine.load_gear_table().levels
+    roster = []
+    for i in range(n):
+        raw = {"member": f"m{i}", "Design": rng.randrange(500), "Alloy": rng.randrange(500_000)}
+        for part in engine.GEAR_PARTS:
+            cur = rng.randrange(len(levels) - 6)
+            raw[f"{part}_cur"], raw[f"{part}_tar"] = levels[cur], levels[cur + rng.randrange(1, 6)]
+        roster.append(raw)
+    return roster
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="몬테카를로 도달 예상일 벤치마크")
+    parser.add_argument("--members", type=int, default=40)
+    parser.add_argument("--scenarios", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=22)
+    args = parser.parse_args(argv)
+
+    deficit = {"Design": 300, "Alloy": 1_200_000, "Polish": 5000, "Amber": 10}
+    gear_forecast.forecast(deficit, INCOME, 100)  # numpy import
+    for n in (1_000, 10_000, args.scenarios):
+        t = time.perf_counter()
+        fc = gear_forecast.forecast(deficit, INCOME, n, seed=args.seed)
+        print(f"single: {n:>7,} scenarios × {fc.horizon} days  {(time.perf_counter() - t) * 1000:8.1f} ms  p50 {fc.days[50]}d")
+
+    roster = _roster(args.members, args.seed)
+    results = {}
+    for workers in (0, args.workers):
+        t = time.perf_counter()
+        results[workers] = list(gear_forecast.iter_forecasts(roster, INCOME, args.scenarios, workers, seed=args.seed))
+        print(f"roster: {args.members} members, workers={workers}  {time.perf_counter() - t:6.2f} s")
+    print(f"same results: {results[0] == results[args.workers]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
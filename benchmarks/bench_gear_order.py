@@ -0,0 +1,59 @@
+"""gear_order.upgrade_order 실행 시간.
+
+  - full   : 6부위 모두 Green → Legendary T3 3* — 첫 단계까지 / 전체 계획
+  - random : 부위별 무작위 현재 → 목표, 무작위 보유량 (고정 시드) — 앞 20단계 / 전체
+
+    python benchmarks/bench_gear_order.py --plans 500
+"""
+
+import argparse
+import random
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import calc_engine as engine  # noqa: E402
+from gear_order import upgrade_order  # noqa: E402
+
+
+def _ms(fn) -> float:
+    t = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t) * 1000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="업그레이드 추천 순서 벤치마크")
+    parser.add_argument("--plans", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=25)
+    args = parser.parse_args(argv)
+
+    table = engine.load_gear_table()
+    levels = table.levels
+    current = {p: levels[0] for p in engine.GEAR_PARTS}
+    first = _ms(lambda: next(upgrade_order(current, table=table)))
+    steps = []
+    full = _ms(lambda: steps.extend(upgrade_order(current, table=table)))
+    print(f"full: Green → {levels[-1]} × {len(current)} parts, first step {first:.3f} ms, "
+          f"{len(steps)} steps {full:.3f} ms")
+
+    rng = random.Random(args.seed)
+    cases = []
+    for _ in range(args.plans):
+        cur, tar = {}, {}
+        for p in engine.GEAR_PARTS:
+            i, j = sorted(rng.sample(range(len(levels)), 2))
+            cur[p], tar[p] = levels[i], levels[j]
+        owned = {k: rng.randrange(1, v + 1) for k, v in zip(engine.GEAR_RESOURCES, table.cumulative[-1]) if v}
+        cases.append((cur, tar, owned))
+    for label, n in (("first 20", 20), ("all", None)):
+        times = sorted(_ms(lambda: list(islice(upgrade_order(c, t, owned=o, table=table), n))) for c, t, o in cases)
+        print(f"random {label}: {len(times)} plans, median {times[len(times) // 2]:.3f} ms, max {times[-1]:.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
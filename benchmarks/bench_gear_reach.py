@@ -0,0 +1,62 @@
+"""gear_reach.max_reachable 실행 시간과 탐색 노드 수.
+
+  - 6부위 모두 Green 에서, 전체(Green → Legendary T3 3*) 비용의 일부만큼 보유한 경우
+  - 부위별 무작위 현재 등급 + 무작위 병종 가중치 (고정 시드)
+
+    python benchmarks/bench_gear_reach.py --plans 100
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import calc_engine as engine  # noqa: E402
+from gear_reach import max_reachable  # noqa: E402
+
+
+def _run(label, cases):
+    times, nodes = [], []
+    for current, owned, weights in cases:
+        t = time.perf_counter()
+        plan = max_reachable(current, owned, weights)
+        times.append((time.perf_counter() - t) * 1000)
+        nodes.append(plan.nodes)
+    times.sort()
+    print(f"{label}: {len(cases)} plans, median {times[len(times) // 2]:.1f} ms, max {times[-1]:.1f} ms,"
+          f" max nodes {max(nodes):,}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="보유 자원 → 최고 등급 벤치마크")
+    parser.add_argument("--plans", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    table = engine.load_gear_table()
+    levels, full = table.levels, table.cumulative[-1]
+    rng = random.Random(args.seed)
+    max_reachable({"Coat": levels[0]}, {})  # 첫 호출 제외
+
+    from_green = []
+    for _ in range(args.plans):
+        share = rng.uniform(0.05, 1.0)
+        owned = {k: int(full[j] * 6 * share * rng.uniform(0.7, 1.3)) for j, k in enumerate(engine.GEAR_RESOURCES)}
+        from_green.append(({p: levels[0] for p in engine.GEAR_PARTS}, owned, None))
+    _run("from Green", from_green)
+
+    mixed = []
+    for _ in range(args.plans):
+        current = {p: levels[rng.randrange(len(levels))] for p in engine.GEAR_PARTS}
+        owned = {k: int(full[j] * rng.uniform(0.1, 4)) for j, k in enumerate(engine.GEAR_RESOURCES)}
+        weights = {p: rng.choice([1, 1, 2, 3]) for p in engine.GEAR_PARTS}
+        mixed.append((current, owned, weights))
+    _run("mixed weighted", mixed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""package_optimizer.cheapest_packages 의 부족량 크기별 실행 시간.
+
+기준 부족량은 6부위 전체 Gold → Legendary T3 3* (연맹원 1명) 이고, --scales 배수로 늘린다.
+  - 한도 없음: usd / krw 기준 각각
+  - 한도 있음: 패키지마다 0 ~ 5 × (20 × 배수) 개 (고정 시드 무작위, krw 기준)
+    — --budget-ms 를 넘는 경우가 있으면 종료 코드 1
+
+    python benchmarks/bench_package_optimizer.py --scales 0.1 1 10 100 --repeat 3
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import calc_engine as engine  # noqa: E402
+from package_optimizer import cheapest_packages  # noqa: E402
+
+
+def _best_time(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t)
+    return best, result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="패키지 최적화 벤치마크")
+    parser.add_argument("--scales", type=float, nargs="+", default=[0.1, 1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, default=500, help="한도 있는 경우 하나의 시간 상한")
+    args = parser.parse_args(argv)
+
+    table = engine.load_gear_table()
+    base = engine.gear_needed([("Gold", table.levels[-1])] * len(engine.GEAR_PARTS), table)
+    keys = engine.load_packages().keys
+    rng = random.Random(args.seed)
+
+    over = []
+    print(f"{'scale':>7} {'case':<10} {'ms':>9} {'nodes':>7} {'cost':>14}  Alloy deficit")
+    for scale in args.scales:
+        deficit = {k: int(v * scale) for k, v in base.items()}
+        cases = [
+            ("usd", lambda: cheapest_packages(deficit, currency="usd")),
+            ("krw", lambda: cheapest_packages(deficit, currency="krw")),
+        ]
+        caps = {k: rng.randrange(0, 6) * max(1, round(20 * scale)) for k in keys}
+        cases.append(("krw+caps", lambda: cheapest_packages(deficit, caps=caps, currency="krw")))
+        for name, fn in cases:
+            try:
+                secs, plan = _best_time(fn, args.repeat)
+            except ValueError:
+                print(f"{scale:>7g} {name:<10} {'-':>9} {'-':>7} {'infeasible':>14}")
+                continue
+            print(f"{scale:>7g} {name:<10} {secs * 1000:>9.1f} {plan.nodes:>7} {plan.cost:>14,}  {deficit['Alloy']:,}")
+            if name == "krw+caps" and secs * 1000 > args.budget_ms:
+                over.append(f"{scale:g} {name} {secs * 1000:.1f} ms")
+    if over:
+        print(f"over budget ({args.budget_ms:g} ms): {', '.join(over)}")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
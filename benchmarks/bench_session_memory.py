@@ -0,0 +1,136 @@
+"""접속한 세션 하나가 서버에 남기는 메모리 (RSS 증가분 / 세션 수).
+
+  1. 앱마다 streamlit 서버를 새로 띄우고 세션 --warm 개가 --warm-interactions 번씩 상호작용해
+     import / 캐시 / 표를 데운다 (버튼 뒤에서 처음 import 하는 pandas · numpy 등이 2 에 섞이지 않도록).
+  2. 세션 --sessions 개를 하나씩 더 붙인다 (처음 실행 + 무작위 상호작용 --interactions 번, 연결 유지).
+  3. (2 뒤 RSS - 1 뒤 RSS) / 세션 수. RSS 는 잠깐 간격으로 몇 번 재서 중앙값.
+
+세션은 benchmarks/load_test.py 와 같은 웹소켓 클라이언트라 브라우저 탭과 같은 상태를 남긴다.
+--root 로 다른 체크아웃 (예: git worktree 로 꺼낸 이전 커밋) 의 앱을 재면 전후 비교가 된다.
+
+--heap: 서버를 tracemalloc 아래에서 띄워 (느림) 세션당 파이썬 힙 증가분과 그중 이 저장소 코드가
+직접 할당한 몫 (session_state 값, 스크립트 전역 등 — streamlit 위젯 내부 몫은 제외) 도 잰다.
+RSS 는 스레드별 malloc 아레나 같은 파이썬 밖 메모리가 섞여 흔들림이 크다.
+
+    python benchmarks/bench_session_memory.py --sessions 40
+    python benchmarks/bench_session_memory.py gear_calc.py --heap --sessions 15
+    git worktree add /tmp/wos-base HEAD~1 && python benchmarks/bench_session_memory.py --root /tmp/wos-base
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import signal
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+from load_test import Server, Session
+from run_benchmarks import ROOT
+from websockets.asyncio.client import connect
+
+APPS = ("gear_calc.py", "build_time_new2.py", "building_time.py", "gear_calc_en.py")
+
+# SIGUSR1 을 받으면 (gc 뒤) 파이썬 힙 전체와, 마지막 프레임이 root 아래 파일인 할당 합을 JSON 으로 쓴다
+_TRACED_SERVER = """
+import gc, json, os, signal, sys, tracemalloc
+tracemalloc.start(1)
+root, out = sys.argv.pop(1), sys.argv.pop(1)
+
+def dump(*_):
+    gc.collect()
+    snap = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(True, os.path.join(root, "*"))])
+    with open(out + ".tmp", "w") as f:
+        json.dump({"heap": tracemalloc.get_traced_memory()[0], "app": sum(s.size for s in snap.statistics("filename"))}, f)
+    os.replace(out + ".tmp", out)
+
+signal.signal(signal.SIGUSR1, dump)
+from streamlit.web import cli
+sys.argv[0] = "streamlit"
+cli.main()
+"""
+
+
+async def _rss(server: Server, samples: int = 5) -> float:
+    values = []
+    for _ in range(samples):
+        await asyncio.sleep(0.2)
+        values.append(server.rss() or 0.0)
+    return statistics.median(values)
+
+
+async def _open(server: Server, n: int, interactions: int, seed: int, timeout: float, conns: list) -> None:
+    # 하나씩 차례로 (동시에 돌 때의 일시적인 할당이 섞이지 않게)
+    for i in range(n):
+        ws = await connect(server.url, subprotocols=["streamlit"], max_size=None, open_timeout=timeout)
+        conns.append(ws)
+        session = Session(ws, random.Random(seed + i))
+        await session.rerun(timeout)
+        for _ in range(interactions):
+            session.interact()
+            await session.rerun(timeout)
+        if session.errors:
+            raise RuntimeError(f"세션 {seed + i}: 실행 중 오류 {session.errors}건")
+
+
+async def _heap(server: Server, out: Path) -> dict:
+    out.unlink(missing_ok=True)
+    server.proc.send_signal(signal.SIGUSR1)
+    while not out.exists():
+        await asyncio.sleep(0.5)
+    return json.loads(out.read_text(encoding="utf-8"))
+
+
+async def _measure(server: Server, args, heap_out: Path = None) -> dict:
+    conns: list = []
+    try:
+        await _open(server, args.warm, args.warm_interactions, args.seed, args.timeout, conns)
+        before = await _rss(server)
+        heap_before = await _heap(server, heap_out) if heap_out else None
+        await _open(server, args.sessions, args.interactions, args.seed + args.warm, args.timeout, conns)
+        after = await _rss(server)
+        heap_after = await _heap(server, heap_out) if heap_out else None
+    finally:
+        for ws in conns:
+            await ws.close()
+    result = {"before": before, "after": after, "per_session_kb": (after - before) * 1024 / args.sessions}
+    if heap_out:
+        for key in ("heap", "app"):
+            result[f"{key}_kb"] = (heap_after[key] - heap_before[key]) / 1024 / args.sessions
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="세션당 서버 메모리 벤치마크")
+    parser.add_argument("apps", nargs="*", default=list(APPS))
+    parser.add_argument("--root", type=Path, default=ROOT, help="앱을 꺼낼 체크아웃 (기본: 이 저장소)")
+    parser.add_argument("--sessions", type=int, default=40)
+    parser.add_argument("--warm", type=int, default=3)
+    parser.add_argument("--interactions", type=int, default=3)
+    parser.add_argument("--warm-interactions", type=int, default=15)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--seed", type=int, default=24)
+    parser.add_argument("--heap", action="store_true", help="tracemalloc 으로 세션당 파이썬 힙도 잰다 (느림)")
+    args = parser.parse_args(argv)
+
+    print(f"root: {args.root}")
+    for app in args.apps:
+        with tempfile.TemporaryDirectory() as tmp:
+            heap_out = Path(tmp) / "heap.json" if args.heap else None
+            launcher = ("-c", _TRACED_SERVER, str(args.root.resolve()), str(heap_out)) if args.heap else ("-m", "streamlit")
+            server = Server(app, timeout=600, root=args.root, launcher=launcher)
+            try:
+                r = asyncio.run(_measure(server, args, heap_out))
+            finally:
+                server.stop()
+        print(f"{app:<20} RSS {r['before']:7.1f} → {r['after']:7.1f} MB  "
+              f"per session {r['per_session_kb']:7.1f} KB  ({args.sessions} sessions)")
+        if args.heap:
+            print(f"{'':<20} python heap per session {r['heap_kb']:7.1f} KB  (repo code {r['app_kb']:6.1f} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
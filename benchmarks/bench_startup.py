@@ -0,0 +1,60 @@
+"""앱 콜드 스타트: pandas/numpy 를 미리 import 할 때 vs 필요할 때만 (현재).
+
+매 회 새 파이썬 프로세스에서 AppTest 로 앱 스크립트를 처음 실행하기까지 (import 포함) 를 잰다.
+  - eager : 스크립트 전에 pandas, numpy 를 import (예전처럼 앱 맨 위에서 import 하던 경우)
+  - lazy  : 그대로 실행. 첫 화면은 표가 없으므로 pandas/numpy 없이 끝나야 한다.
+
+    python benchmarks/bench_startup.py --runs 5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+APPS = ("gear_calc.py", "gear_calc_en.py", "build_time_new.py", "building_time.py")
+
+_CHILD = """
+import json, sys, time
+t = time.perf_counter()
+if {eager}:
+    import numpy, pandas
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({path!r}, default_timeout=60)
+at.run()
+assert not at.exception, [e.value for e in at.exception]
+print(json.dumps({{"ms": (time.perf_counter() - t) * 1000,
+                  "pandas": "pandas" in sys.modules, "numpy": "numpy" in sys.modules}}))
+"""
+
+
+def _run(app: str, eager: bool) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD.format(path=str(ROOT / app), eager=eager)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="앱 콜드 스타트 (pandas 즉시 vs 지연 import)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'app':<20} {'eager ms':>10} {'lazy ms':>10} {'saved':>8}  lazy imports")
+    for app in APPS:
+        eager = [_run(app, True)["ms"] for _ in range(args.runs)]
+        lazy_runs = [_run(app, False) for _ in range(args.runs)]
+        lazy = [r["ms"] for r in lazy_runs]
+        loaded = sorted({m for r in lazy_runs for m in ("pandas", "numpy") if r[m]}) or ["-"]
+        e, l = statistics.median(eager), statistics.median(lazy)
+        print(f"{app:<20} {e:>10.0f} {l:>10.0f} {(1 - l / e) * 100:>7.0f}%  {', '.join(loaded)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
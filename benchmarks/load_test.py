@@ -0,0 +1,315 @@
+"""동시 접속 부하 시험: 로컬에 띄운 streamlit 서버에 세션 N개를 붙여 무작위로 위젯을 바꾼다.
+
+    python benchmarks/load_test.py gear_calc.py --sessions 1 5 10 20
+    python benchmarks/load_test.py build_time_new2.py --sessions 10 --interactions 30 \\
+        --compare benchmarks/results/load-abc1234-build_time_new2.json
+
+  - 서버: 세션 수마다 `streamlit run <앱>` 을 새로 띄운다 (127.0.0.1, 빈 포트, 헤드리스, 사용 통계 끔).
+    네트워크 없이 돈다.
+  - 세션: 브라우저와 같은 웹소켓 (/_stcore/stream) 에 streamlit 의 protobuf 메시지를 그대로 보낸다.
+    처음 실행 뒤 화면의 위젯 (selectbox / radio / number_input / checkbox / button) 을 모아 두고,
+    한 번의 상호작용마다 값 1~2개를 무작위로 바꾸고 (버튼은 절반 확률로 누름) 다시 실행시킨다.
+    fragment 안의 위젯도 앱 전체를 다시 실행한다 (브라우저보다 보수적인 측정).
+  - 지연: 재실행 요청을 보낸 때부터 script_finished 를 받을 때까지. 예외 요소나 실행 실패는 errors 로 센다.
+  - 메모리: 서버 프로세스 RSS (/proc, 리눅스). 빈 서버 → 세션 N개 처음 실행 뒤 → 부하 중 최대.
+    세션당 = 가장 적은 / 많은 세션 수에서 처음 실행 뒤 RSS 차 / 세션 수 차 (--sessions 가 두 개 이상일 때).
+  - 부하를 거는 쪽도 같은 컴퓨터에서 돌아 CPU 를 나눠 쓴다 (코어가 적으면 지연이 더 크게 나온다).
+
+결과는 benchmarks/results/load-<커밋>-<앱>.json (--compare 로 이전 결과와 비교).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from run_benchmarks import RESULTS_DIR, ROOT, _git_commit
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.asyncio.client import connect
+
+WIDGETS = ("selectbox", "radio", "number_input", "checkbox", "button")
+FINISHED_OK = (ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class Server:
+    """streamlit run 을 자식 프로세스로 띄우고 /_stcore/health 가 응답할 때까지 기다린다."""
+
+    def __init__(self, app: str, timeout: float = 120, root: Path = ROOT, launcher=("-m", "streamlit")):
+        self.port = _free_port()
+        self.proc = subprocess.Popen(
+            [sys.executable, *launcher, "run", str(Path(root) / app),
+             "--server.headless", "true", "--server.address", "127.0.0.1", "--server.port", str(self.port),
+             "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+            cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=2) as r:
+                    if r.status == 200:
+                        break
+            except OSError:
+                pass
+            if self.proc.poll() is not None or time.monotonic() > deadline:
+                self.stop()
+                raise RuntimeError(f"streamlit 서버가 뜨지 않았습니다 ({app})")
+            time.sleep(0.2)
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}/_stcore/stream"
+
+    def rss(self) -> Optional[float]:
+        return rss_mb(self.proc.pid)
+
+    def stop(self) -> None:
+        self.proc.terminate()
+        try:
+            self.proc.wait(10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+class Session:
+    """브라우저 탭 하나: 위젯 상태를 들고 재실행을 요청한다."""
+
+    def __init__(self, ws, rng: random.Random):
+        self.ws = ws
+        self.rng = rng
+        self.widgets: Dict[str, tuple] = {}
+        self.states: Dict[str, WidgetState] = {}
+        self.errors = 0
+
+    async def rerun(self, timeout: float) -> float:
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        seen: Dict[str, tuple] = {}
+        t = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await asyncio.wait_for(self.ws.recv(), timeout))
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                name = element.WhichOneof("type")
+                if name == "exception":
+                    self.errors += 1
+                elif name in WIDGETS:
+                    proto = getattr(element, name)
+                    seen[proto.id] = (name, proto)
+            elif kind == "script_finished":
+                if fwd.script_finished not in FINISHED_OK:
+                    self.errors += 1
+                break
+        elapsed = (time.perf_counter() - t) * 1000
+        # 버튼 누름은 한 번만, 화면에서 사라진 위젯 상태는 버린다
+        self.widgets = seen
+        self.states = {
+            wid: ws for wid, ws in self.states.items()
+            if wid in seen and ws.WhichOneof("value") != "trigger_value"
+        }
+        return elapsed
+
+    def interact(self) -> None:
+        choices = [wid for wid, (name, _) in self.widgets.items() if name != "button"]
+        for wid in self.rng.sample(choices, min(len(choices), self.rng.randint(1, 2))):
+            self._change(wid)
+        buttons = [wid for wid, (name, _) in self.widgets.items() if name == "button"]
+        if buttons and self.rng.random() < 0.5:
+            self._change(self.rng.choice(buttons))
+
+    def _change(self, wid: str) -> None:
+        name, proto = self.widgets[wid]
+        ws = WidgetState(id=wid)
+        if name in ("selectbox", "radio"):
+            if not proto.options:
+                return
+            ws.string_value = self.rng.choice(list(proto.options))
+        elif name == "number_input":
+            step = proto.step or 1
+            value = (proto.min if proto.has_min else proto.default) + step * self.rng.randint(0, 20)
+            if proto.has_max:
+                value = min(value, proto.max)
+            ws.double_value = value
+        elif name == "checkbox":
+            ws.bool_value = self.rng.random() < 0.5
+        else:
+            ws.trigger_value = True
+        self.states[wid] = ws
+
+
+async def _session(url: str, seed: int, interactions: int, think: float, timeout: float,
+                   ready: asyncio.Barrier, go: asyncio.Event, out: dict) -> None:
+    rng = random.Random(seed)
+    async with connect(url, subprotocols=["streamlit"], max_size=None, open_timeout=timeout) as ws:
+        session = Session(ws, rng)
+        out["initial"].append(await session.rerun(timeout))
+        await ready.wait()
+        await go.wait()
+        for _ in range(interactions):
+            await asyncio.sleep(rng.uniform(0, think))
+            session.interact()
+            out["rerun"].append(await session.rerun(timeout))
+        out["errors"] += session.errors
+
+
+async def _drive(server: Server, n: int, args) -> dict:
+    out = {"initial": [], "rerun": [], "errors": 0}
+    ready, go = asyncio.Barrier(n + 1), asyncio.Event()
+    tasks = [
+        asyncio.create_task(_session(server.url, args.seed * 1000 + i, args.interactions, args.think,
+                                     args.timeout, ready, go, out))
+        for i in range(n)
+    ]
+    waiting = asyncio.ensure_future(ready.wait())
+    # 세션이 모두 처음 실행을 마칠 때까지 (중간에 실패한 세션이 있으면 바로 알린다)
+    done, _ = await asyncio.wait([waiting, *tasks], return_when=asyncio.FIRST_COMPLETED)
+    if waiting not in done:
+        for task in done:
+            task.result()
+    await waiting
+    out["rss_connected"] = server.rss()
+    peak = out["rss_connected"] or 0.0
+    go.set()
+    t = time.perf_counter()
+    while not all(task.done() for task in tasks):
+        await asyncio.sleep(0.2)
+        peak = max(peak, server.rss() or 0.0)
+    for task in tasks:
+        task.result()
+    out["wall_s"] = time.perf_counter() - t
+    out["rss_peak"] = peak or None
+    return out
+
+
+def percentiles(samples_ms: List[float]) -> dict:
+    samples_ms = sorted(samples_ms)
+    if not samples_ms:
+        return {"n": 0}
+
+    def pick(q: float) -> float:
+        return round(samples_ms[min(len(samples_ms) - 1, int(len(samples_ms) * q))], 2)
+
+    return {"n": len(samples_ms), "p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99),
+            "max_ms": round(samples_ms[-1], 2)}
+
+
+def run_level(app: str, n: int, args) -> dict:
+    server = Server(app)
+    try:
+        idle = server.rss()
+        result = asyncio.run(_drive(server, n, args))
+    finally:
+        server.stop()
+    return {
+        "sessions": n,
+        "initial": percentiles(result["initial"]),
+        "rerun": percentiles(result["rerun"]),
+        "throughput_rps": round(len(result["rerun"]) / result["wall_s"], 2) if result["wall_s"] else None,
+        "errors": result["errors"],
+        "rss_idle_mb": idle and round(idle, 1),
+        "rss_connected_mb": result["rss_connected"] and round(result["rss_connected"], 1),
+        "rss_peak_mb": result["rss_peak"] and round(result["rss_peak"], 1),
+    }
+
+
+def per_session_mb(levels: List[dict]) -> Optional[float]:
+    """가장 작은 / 큰 세션 수의 처음 실행 뒤 RSS 차 / 세션 수 차."""
+    points = [(lv["sessions"], lv["rss_connected_mb"]) for lv in levels if lv["rss_connected_mb"]]
+    if len(points) < 2 or points[0][0] == points[-1][0]:
+        return None
+    (n0, m0), (n1, m1) = points[0], points[-1]
+    return round((m1 - m0) / (n1 - n0), 2)
+
+
+def compare(current: dict, previous: dict) -> None:
+    before = {lv["sessions"]: lv for lv in previous.get("levels", [])}
+    print(f"{'sessions':>8} {'metric':<10} {'before':>10} {'after':>10} {'change':>8}")
+    for lv in current["levels"]:
+        prev = before.get(lv["sessions"])
+        for metric, value in (("p50_ms", lv["rerun"].get("p50_ms")), ("p95_ms", lv["rerun"].get("p95_ms")),
+                              ("p99_ms", lv["rerun"].get("p99_ms")), ("rss_peak", lv["rss_peak_mb"])):
+            old = (prev["rss_peak_mb"] if metric == "rss_peak" else prev["rerun"].get(metric)) if prev else None
+            if value is None or not old:
+                after = f"{value:.1f}" if value is not None else "-"
+                print(f"{lv['sessions']:>8} {metric:<10} {'-':>10} {after:>10}")
+                continue
+            print(f"{lv['sessions']:>8} {metric:<10} {old:>10.1f} {value:>10.1f} {(value / old - 1) * 100:>+7.1f}%")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="streamlit 앱 동시 접속 부하 시험")
+    parser.add_argument("app", help="앱 스크립트 (예: gear_calc.py, build_time_new2.py)")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--interactions", type=int, default=20, help="세션당 재실행 횟수")
+    parser.add_argument("--think", type=float, default=0.5, help="상호작용 사이 최대 대기 (초, 균등 분포)")
+    parser.add_argument("--timeout", type=float, default=120, help="재실행 하나의 최대 대기 (초)")
+    parser.add_argument("--seed", type=int, default=23)
+    parser.add_argument("-o", "--output", help=f"결과 JSON (기본: {RESULTS_DIR.name}/load-<커밋>-<앱>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    args = parser.parse_args(argv)
+
+    levels = []
+    for n in sorted(set(args.sessions)):
+        level = run_level(args.app, n, args)
+        levels.append(level)
+        r = level["rerun"]
+        print(f"{n:>4} sessions  rerun p50 {r.get('p50_ms', 0):>8.1f}  p95 {r.get('p95_ms', 0):>8.1f}  "
+              f"p99 {r.get('p99_ms', 0):>8.1f} ms  {level['throughput_rps']} rps  "
+              f"RSS {level['rss_connected_mb']} → peak {level['rss_peak_mb']} MB  errors {level['errors']}")
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "app": args.app,
+        "config": {"interactions": args.interactions, "think_s": args.think, "seed": args.seed},
+        "levels": levels,
+        "per_session_mb": per_session_mb(levels),
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"load-{commit or 'local'}-{Path(args.app).stem}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"per session ≈ {report['per_session_mb']} MB")
+    print(f"→ {output}")
+    if args.compare:
+        compare(report, json.loads(Path(args.compare).read_text(encoding="utf-8")))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
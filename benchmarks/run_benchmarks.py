@@ -0,0 +1,212 @@
+"""성능 측정 모음 → JSON (커밋 간 회귀 비교용).
+
+측정 항목
+  - engine.gear_range_cost   : 6부위 무작위 (현재, 목표) 필요 자원 합계 (gear_data.csv)
+  - engine.build_range_total : 9개 건물 무작위 구간 건설 시간 합 (build_numeric.csv)
+  - engine.package_totals    : 무작위 패키지 구매 수량 → 자원 합계
+  - engine.package_totals_batch : 같은 수량 전체를 PackageMatrix.totals_batch 한 번으로 (시나리오당 ms)
+  - startup.<앱>             : 새 프로세스에서 AppTest 로 앱 스크립트를 처음 실행하기까지 (import 포함)
+  - rerun.<앱>               : 같은 세션에서 위젯 값을 바꿔 다시 실행하는 시간 (AppTest, headless)
+
+    python benchmarks/run_benchmarks.py                       # benchmarks/results/<커밋>.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/abc1234.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+sys.path.insert(0, str(ROOT))
+
+import calc_engine as engine  # noqa: E402
+
+APPS = ("gear_calc.py", "gear_calc_en.py", "build_time_new.py", "build_time_new2.py", "building_time.py")
+
+
+def _summary(samples_ms):
+    samples_ms = sorted(samples_ms)
+    return {
+        "n": len(samples_ms),
+        "median_ms": round(statistics.median(samples_ms), 4),
+        "p95_ms": round(samples_ms[min(len(samples_ms) - 1, int(len(samples_ms) * 0.95))], 4),
+        "min_ms": round(samples_ms[0], 4),
+    }
+
+
+def _per_call(fn, inputs, repeat: int):
+    """inputs 전체를 한 번 도는 시간을 repeat 번 재서 호출당 ms 로."""
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        for x in inputs:
+            fn(x)
+        samples.append((time.perf_counter() - t) * 1000 / len(inputs))
+    return _summary(samples)
+
+
+def _per_scenario(fn, inputs, repeat: int):
+    """inputs 전체를 fn 한 번으로 계산하는 시간을 repeat 번 재서 입력 하나당 ms 로."""
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn(inputs)
+        samples.append((time.perf_counter() - t) * 1000 / len(inputs))
+    return _summary(samples)
+
+
+# --- 엔진 ---
+
+def bench_engine(rng: random.Random, queries: int, repeat: int):
+    gear = engine.load_gear_table()
+    plans = []
+    for _ in range(queries):
+        plan = []
+        for _ in engine.GEAR_PARTS:
+            i, j = sorted(rng.sample(range(len(gear.levels)), 2))
+            plan.append((gear.levels[i], gear.levels[j]))
+        plans.append(plan)
+
+    build = engine.load_build_table()
+    ranges = []
+    for _ in range(queries):
+        picked = []
+        for b, levels in build.levels.items():
+            i, j = sorted(rng.sample(range(len(levels)), 2))
+            picked.append((b, levels[i], levels[j]))
+        ranges.append(picked)
+
+    packages = engine.load_packages()
+    counts = [{k: rng.randrange(0, 5) for k in packages.keys} for _ in range(queries)]
+
+    return {
+        "engine.gear_range_cost": _per_call(lambda p: engine.gear_needed(p, gear), plans, repeat),
+        "engine.build_range_total": _per_call(
+            lambda rs: [build.range_total(b, s, e) for b, s, e in rs], ranges, repeat
+        ),
+        "engine.package_totals": _per_call(lambda c: engine.package_totals(c, packages), counts, repeat),
+        "engine.package_totals_batch": _per_scenario(packages.totals_batch, counts, repeat),
+    }
+
+
+# --- 앱 ---
+
+_STARTUP_CHILD = """
+import time
+t = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({path!r}, default_timeout=60)
+at.run()
+assert not at.exception, [e.value for e in at.exception]
+print((time.perf_counter() - t) * 1000)
+"""
+
+
+def bench_startup(runs: int):
+    results = {}
+    for app in APPS:
+        samples = []
+        for _ in range(runs):
+            out = subprocess.run(
+                [sys.executable, "-c", _STARTUP_CHILD.format(path=str(ROOT / app))],
+                cwd=ROOT, capture_output=True, text=True, check=True,
+            )
+            samples.append(float(out.stdout.strip().splitlines()[-1]))
+        results[f"startup.{app}"] = _summary(samples)
+    return results
+
+
+def _gear_rerun(at, i: int):
+    levels = list(engine.load_gear_table().levels)
+    at.selectbox(key="Coat_tar").set_value(levels[(i * 7) % len(levels)])
+    at.button[0].click()
+
+
+def _build_rerun(at, i: int):
+    levels = list(engine.load_build_table().levels["Furnace"])
+    at.selectbox(key="Furnace_end").set_value(levels[(i * 7) % len(levels)])
+    at.button[0].click()
+
+
+def bench_rerun(runs: int):
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    for app, change in (("gear_calc.py", _gear_rerun), ("build_time_new.py", _build_rerun)):
+        at = AppTest.from_file(str(ROOT / app), default_timeout=60)
+        at.run()
+        samples = []
+        for i in range(runs):
+            change(at, i)
+            t = time.perf_counter()
+            at.run()
+            samples.append((time.perf_counter() - t) * 1000)
+            assert not at.exception, [e.value for e in at.exception]
+        results[f"rerun.{app}"] = _summary(samples)
+    return results
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(current, previous):
+    print(f"{'benchmark':<34} {'before':>10} {'after':>10} {'change':>8}")
+    for name, cur in current["results"].items():
+        prev = previous.get("results", {}).get(name)
+        if not prev:
+            print(f"{name:<34} {'-':>10} {cur['median_ms']:>10.3f}")
+            continue
+        change = (cur["median_ms"] / prev["median_ms"] - 1) * 100 if prev["median_ms"] else 0.0
+        print(f"{name:<34} {prev['median_ms']:>10.3f} {cur['median_ms']:>10.3f} {change:>+7.1f}%")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="WOS 계산기 벤치마크 모음")
+    parser.add_argument("-o", "--output", help=f"결과 JSON (기본: {RESULTS_DIR.name}/<커밋>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--startup-runs", type=int, default=3)
+    parser.add_argument("--rerun-runs", type=int, default=20)
+    parser.add_argument("--skip-apps", action="store_true", help="엔진 측정만 (streamlit 불필요)")
+    parser.add_argument("--seed", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    commit = _git_commit()
+    results = bench_engine(random.Random(args.seed), args.queries, args.repeat)
+    if not args.skip_apps:
+        results.update(bench_startup(args.startup_runs))
+        results.update(bench_rerun(args.rerun_runs))
+    report = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    for name, r in results.items():
+        print(f"{name:<34} median {r['median_ms']:>10.3f} ms  p95 {r['p95_ms']:>10.3f} ms")
+    print(f"→ {output}")
+    if args.compare:
+        compare(report, json.loads(Path(args.compare).read_text(encoding="utf-8")))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
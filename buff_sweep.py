@@ -0,0 +1,59 @@
+"""건설 시간 앱 (build_time_new.py, build_time_new2.py) 이 같이 쓰는 버프 what-if 그래프."""
+
+import streamlit as st
+
+import calc_engine as engine
+import perf_debug
+
+
+def checkbox() -> bool:
+    return st.checkbox("📈 버프 what-if 그래프도 보기 (속도 0–300% × 모든 버프 조합)", key="buff_sweep")
+
+
+def render(total, cs, boost, vp, hyena, hyena_options):
+    """📈 같은 계획을 버프 격자 전체 (속도 0–300% × 하이에나 × 중상주의 × VP) 로 한 번에 계산해 그린다."""
+    import altair as alt
+    import numpy as np
+
+    speeds = np.arange(0, 300.5, 0.5)
+    grid = engine.adjusted_build_time_grid(total, speeds / 100, np.array(hyena_options) / 100)
+    ox = ("O", "X")
+    labels = [
+        f"중상주의 {ox[a]} · VP {ox[b]} · 하이에나 {h}%"
+        for a in range(2) for b in range(2) for h in hyena_options
+    ]
+    heat = perf_debug.dataframe({
+        "건설 속도 (%)": np.tile(speeds, len(labels)),
+        "버프": np.repeat(labels, len(speeds)),
+        "일": grid.reshape(-1) / 86400,
+    })
+    now = alt.Chart(perf_debug.dataframe({"건설 속도 (%)": [cs * 100]})).mark_rule(color="red").encode(x="건설 속도 (%):Q")
+    st.altair_chart(
+        alt.Chart(heat).mark_rect().encode(
+            x=alt.X("건설 속도 (%):Q").bin(maxbins=150),
+            y=alt.Y("버프:N", sort=labels, title=None),
+            color=alt.Color("mean(일):Q", title="일", scale=alt.Scale(scheme="viridis", reverse=True)),
+            tooltip=["버프", alt.Tooltip("건설 속도 (%):Q", bin=True), alt.Tooltip("mean(일):Q", format=".1f")],
+        ) + now,
+        use_container_width=True,
+    )
+
+    # +1% 당 줄어드는 시간 (0.5% 간격이라 두 칸 차이) — 지금 중상주의/VP 기준, 하이에나 단계별
+    mine = grid[0 if boost else 1, 0 if vp else 1]
+    saved = (mine[:, :-2] - mine[:, 2:]) / 3600
+    marginal = perf_debug.dataframe({
+        "건설 속도 (%)": np.tile(speeds[:-2], len(hyena_options)),
+        "하이에나": np.repeat([f"{h}%" for h in hyena_options], len(speeds) - 2),
+        "+1% 당 절약 (시간)": saved.reshape(-1),
+    })
+    st.altair_chart(
+        alt.Chart(marginal).mark_line().encode(
+            x="건설 속도 (%):Q",
+            y="+1% 당 절약 (시간):Q",
+            color=alt.Color("하이에나:N", sort=[f"{h}%" for h in hyena_options]),
+        ) + now,
+        use_container_width=True,
+    )
+    k = min(int(round(cs * 200)), len(speeds) - 3)
+    h = hyena_options.index(round(hyena * 100)) if round(hyena * 100) in hyena_options else 0
+    st.caption(f"지금 속도 {cs * 100:.1f}% 에서 +1% 올리면 약 {saved[h, k]:.1f}시간 줄어듭니다.")
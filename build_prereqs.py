@@ -0,0 +1,168 @@
+"""건물 선행 조건 그래프 → 계정 전체 건설 계획.
+
+    from build_prereqs import plan_account
+    plan = plan_account({"Furnace": "FC8"}, {"Furnace": "FC5", "Embassy": "FC5", ...})
+    plan.levels, plan.added, plan.order, plan.total_seconds
+
+data/build_prereqs.csv (Building, level, Requires, required_level) 한 줄은
+"Building 을 level 로 올리려면 Requires 가 required_level 이상이어야 한다" 이다.
+같은 건물의 이전 레벨은 적지 않는다 (레벨은 순서대로만 오른다).
+표에는 게임에서 확인한 조건만 넣는다. 지금은 확인된 조건이 없어 머리줄만 있고, 앱은 표가 비어 있으면
+선행 조건 옵션을 끈다. 조건을 확인하는 대로 CSV 에 줄만 더하면 된다.
+
+    Furnace,FC1,Embassy,30-4
+
+  - 노드 (건물, numerical) 의 닫힘 = 그 레벨까지 가는 데 건물마다 필요한 최소 numerical.
+    닫힘은 바로 앞 레벨과 선행 조건 노드들의 닫힘의 원소별 최댓값이라, 그래프에 메모이즈해
+    두면 세션이 바뀌어도 노드마다 한 번만 계산한다 (30 → FC10 전체도 노드 수 ~600).
+  - 순서는 Kahn 위상 정렬 (같이 할 수 있는 것 중 numerical 이 낮은 것부터).
+  - 시간은 build_numeric.csv 누적표의 구간 차.
+"""
+
+import csv
+import heapq
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import calc_engine as engine
+from build_scheduler import Upgrade
+
+Node = Tuple[str, int]
+
+
+class PrereqGraph:
+    """(건물, numerical) → 바로 필요한 (건물, numerical) 목록과 노드별 닫힘 메모."""
+
+    def __init__(self, requires: Mapping[Node, Sequence[Node]], table: engine.BuildTable):
+        self.table = table
+        self.buildings: Tuple[str, ...] = tuple(table.levels)
+        self.position = {b: i for i, b in enumerate(self.buildings)}
+        self.nums = {b: sorted(table.totals[b]) for b in self.buildings}
+        self.requires = {node: tuple(deps) for node, deps in requires.items()}
+        self._closure: Dict[Node, Tuple[int, ...]] = {}
+
+    def previous(self, building: str, num: int) -> Optional[int]:
+        nums = self.nums[building]
+        i = bisect_left(nums, num)
+        return nums[i - 1] if i > 0 else None
+
+    def deps(self, node: Node) -> Tuple[Node, ...]:
+        prev = self.previous(*node)
+        own = ((node[0], prev),) if prev is not None else ()
+        return own + self.requires.get(node, ())
+
+    def closure(self, building: str, num: int) -> Tuple[int, ...]:
+        """(building, num) 까지 가려면 건물마다 최소 몇 numerical 이어야 하는지 (buildings 순서, 0 = 무관)."""
+        memo = self._closure
+        stack: List[Node] = [(building, num)]
+        visiting = set()
+        while stack:
+            node = stack[-1]
+            if node in memo:
+                stack.pop()
+                continue
+            deps = self.deps(node)
+            missing = [d for d in deps if d not in memo]
+            if missing and node not in visiting:
+                visiting.add(node)
+                for d in missing:
+                    if d in visiting:
+                        raise ValueError(f"선행 조건이 순환합니다: {node} → {d}")
+                stack.extend(missing)
+                continue
+            acc = [0] * len(self.buildings)
+            acc[self.position[node[0]]] = node[1]
+            for d in deps:
+                acc = [max(a, x) for a, x in zip(acc, memo[d])]
+            memo[node] = tuple(acc)
+            visiting.discard(node)
+            stack.pop()
+        return memo[(building, num)]
+
+
+def load_prereq_graph(path: Optional[Path] = None, table: Optional[engine.BuildTable] = None) -> PrereqGraph:
+    """data/build_prereqs.csv + build_numeric 표 (기본: 현재 표). 표마다 한 번 만들고 닫힘 메모도 공유한다."""
+    return _prereq_graph(path or engine.DATA_DIR / "build_prereqs.csv", table or engine.load_build_table())
+
+
+@engine.table_cache(maxsize=4)
+def _prereq_graph(path: Path, table: engine.BuildTable) -> PrereqGraph:
+    requires: Dict[Node, List[Node]] = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for r in csv.DictReader(f):
+            try:
+                node = (r["Building"], table.level_to_num[r["Building"]][r["level"]])
+                dep = (r["Requires"], table.level_to_num[r["Requires"]][r["required_level"]])
+            except KeyError as e:
+                raise ValueError(f"build_prereqs.csv: 표에 없는 건물/레벨 {e} ({r})") from None
+            requires.setdefault(node, []).append(dep)
+    return PrereqGraph(requires, table)
+
+
+@dataclass
+class AccountPlan:
+    # 건물 → (현재, 목표) 라벨 (선행 조건 때문에 올려야 하는 건물 포함)
+    levels: Dict[str, Tuple[str, str]]
+    # 그중 선행 조건 때문에 목표가 생기거나 높아진 건물 → 원래 목표 (없으면 현재)
+    added: Dict[str, str]
+    # 선행 조건을 지키는 레벨업 순서
+    order: List[Upgrade] = field(default_factory=list)
+    total_seconds: float = 0
+    per_building: Dict[str, float] = field(default_factory=dict)
+
+
+def plan_account(
+    goals: Mapping[str, str],
+    current: Mapping[str, str],
+    graph: Optional[PrereqGraph] = None,
+) -> AccountPlan:
+    """goals: 건물 → 목표 레벨, current: 건물 → 현재 레벨 (없는 건물은 첫 레벨로 본다)."""
+    graph = graph or load_prereq_graph()
+    table = graph.table
+    cur = [
+        table.level_to_num[b][current[b]] if b in current else graph.nums[b][0]
+        for b in graph.buildings
+    ]
+    need = list(cur)
+    asked = {}
+    for b, label in goals.items():
+        num = table.level_to_num[b][label]
+        asked[b] = num
+        need = [max(a, x) for a, x in zip(need, graph.closure(b, num))]
+
+    # 위상 정렬: 올려야 하는 노드와, 아직 채워지지 않은 선행 조건 사이의 간선만
+    upgrades = [
+        (b, n) for i, b in enumerate(graph.buildings) for n in graph.nums[b] if cur[i] < n <= need[i]
+    ]
+    pending = set(upgrades)
+    indegree: Dict[Node, int] = {}
+    children: Dict[Node, List[Node]] = {node: [] for node in upgrades}
+    for node in upgrades:
+        deps = [d for d in graph.deps(node) if d in pending]
+        indegree[node] = len(deps)
+        for d in deps:
+            children[d].append(node)
+    ready = [(n, graph.position[b], b) for (b, n), deg in indegree.items() if deg == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        n, _, b = heapq.heappop(ready)
+        order.append(Upgrade(b, table.levels[b][graph.nums[b].index(n)], table.totals[b][n]))
+        for child in children[(b, n)]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                heapq.heappush(ready, (child[1], graph.position[child[0]], child[0]))
+
+    levels, added, per_building = {}, {}, {}
+    for i, b in enumerate(graph.buildings):
+        if need[i] <= cur[i]:
+            continue
+        labels = table.levels[b]
+        nums = graph.nums[b]
+        levels[b] = (labels[nums.index(cur[i])], labels[nums.index(need[i])])
+        per_building[b] = table.range_total_between(b, cur[i], need[i])
+        if need[i] > asked.get(b, 0):
+            added[b] = labels[nums.index(max(asked.get(b, cur[i]), cur[i]))]
+    return AccountPlan(levels, added, order, sum(per_building.values()), per_building)
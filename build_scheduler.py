@@ -0,0 +1,198 @@
+"""건설 대기열 2개 일정 (전체 완료 시각 최소화).
+
+같은 건물의 레벨업은 순서대로, 한 번에 하나씩만 진행된다 (건물 = 체인). 서로 다른 건물은
+두 대기열에서 동시에 진행할 수 있고, 레벨업 하나는 시작하면 끝날 때까지 한 대기열을 쓴다.
+
+    from build_scheduler import plan_upgrades, schedule_two_queues
+    chains = plan_upgrades({"Furnace": ("FC5", "FC8"), "Embassy": ("FC7-2", "FC9")})
+    schedule = schedule_two_queues(chains)
+    schedule.makespan, schedule.timeline
+
+풀이
+  - 하한 LB = max(가장 긴 체인, ⌈전체 합 / 2⌉).
+  - 가장 긴 체인이 나머지 합 이상이면 그 체인만 한 대기열에, 나머지를 다른 대기열에 두면 LB.
+  - 아니면 체인을 통째로 두 대기열에 나누는 경우와, 체인 하나를 k 번째 레벨에서 잘라 앞부분은
+    대기열 1 맨 앞, 뒷부분은 대기열 2 맨 뒤에 두는 경우를 모두 본다. 나머지 체인들의 부분합을
+    정렬해 두고 (체인, k) 마다 이분 탐색으로 가장 좋은 부분합을 고른다.
+    체인 수(건물 수) n 에 대해 O(2^n · n + n · 레벨 수 · n) 이라 전체 계정 계획도 수 ms 안에 끝난다.
+  - 결과가 LB 와 같으면 최적이 증명된 것이다 (Schedule.optimal).
+"""
+
+import math
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import calc_engine as engine
+
+
+@dataclass(frozen=True)
+class Upgrade:
+    building: str
+    level: str
+    seconds: float
+
+
+@dataclass(frozen=True)
+class ScheduledUpgrade:
+    queue: int
+    building: str
+    level: str
+    start: float
+    end: float
+
+
+@dataclass
+class Schedule:
+    makespan: float
+    lower_bound: float
+    timeline: List[ScheduledUpgrade] = field(default_factory=list)
+
+    @property
+    def optimal(self) -> bool:
+        return self.makespan <= self.lower_bound
+
+    def scaled(self, factor: float) -> "Schedule":
+        """버프 적용 (건설 시간은 Total 에 비례하므로 모든 시각에 같은 배율을 곱한다)."""
+        return Schedule(
+            self.makespan * factor,
+            self.lower_bound * factor,
+            [
+                ScheduledUpgrade(e.queue, e.building, e.level, e.start * factor, e.end * factor)
+                for e in self.timeline
+            ],
+        )
+
+
+def plan_upgrades(
+    selections: Mapping[str, Tuple[str, str]], table: Optional[engine.BuildTable] = None
+) -> Dict[str, List[Upgrade]]:
+    """건물 → (현재, 목표) 를 건물별 레벨업 목록으로 (현재 다음 레벨부터 목표까지)."""
+    table = table or engine.load_build_table()
+    chains = {}
+    for b, (start, end) in selections.items():
+        rows = table.range_rows(b, start, end)
+        if rows:
+            chains[b] = [Upgrade(b, label, seconds) for label, seconds in rows]
+    return chains
+
+
+def _run(queue: int, jobs: Sequence[Upgrade], start: float, out: List[ScheduledUpgrade]) -> float:
+    t = start
+    for job in jobs:
+        out.append(ScheduledUpgrade(queue, job.building, job.level, t, t + job.seconds))
+        t += job.seconds
+    return t
+
+
+def _subset_sums(lengths: Sequence[float]) -> List[Tuple[float, int]]:
+    """체인 부분집합의 (길이 합, 비트마스크), 합 기준 정렬 — 같은 합은 하나만 남긴다."""
+    sums = {0: 0}
+    for i, length in enumerate(lengths):
+        for s, mask in list(sums.items()):
+            sums.setdefault(s + length, mask | (1 << i))
+    return sorted(sums.items())
+
+
+def _crossing(values: Sequence[float], increasing, decreasing) -> List[int]:
+    """increasing(v) - decreasing(v) 가 values 순서대로 증가할 때 두 값이 만나는 경계의 양쪽 인덱스."""
+    lo, hi = 0, len(values)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if increasing(values[mid]) >= decreasing(values[mid]):
+            hi = mid
+        else:
+            lo = mid + 1
+    return [i for i in (lo - 1, lo) if 0 <= i < len(values)]
+
+
+def schedule_two_queues(chains: Mapping[str, Sequence[Upgrade]]) -> Schedule:
+    names = [b for b, jobs in chains.items() if jobs]
+    if not names:
+        return Schedule(0, 0)
+    lengths = [sum(job.seconds for job in chains[b]) for b in names]
+    prefixes = [[0] + list(accumulate(job.seconds for job in chains[b])) for b in names]
+    total = sum(lengths)
+    longest = max(range(len(names)), key=lambda i: lengths[i])
+    integral = all(float(job.seconds).is_integer() for b in names for job in chains[b])
+    lower_bound = max(lengths[longest], math.ceil(total / 2) if integral else total / 2)
+
+    # 후보 일정: 체인 c 를 kc 번째 레벨에서, 체인 d 를 kd 번째 레벨에서 자른다 (d 는 없어도 됨).
+    #   대기열 1: c 앞부분 → 나머지 체인 중 mask → d 뒷부분 (d 앞부분이 끝난 뒤)
+    #   대기열 2: d 앞부분 → 나머지 체인 중 mask 밖 → c 뒷부분 (c 앞부분이 끝난 뒤)
+    # best = (완료 시각, c, kc, d, kd, mask)
+    best: Tuple[float, int, int, Optional[int], int, int] = (float("inf"), 0, 0, None, 0, 0)
+
+    def others_sums(*excluded: int) -> Tuple[List[int], List[Tuple[float, int]]]:
+        others = [i for i in range(len(names)) if i not in excluded]
+        return others, _subset_sums([lengths[i] for i in others])
+
+    def global_mask(others: List[int], mask: int) -> int:
+        return sum(1 << i for j, i in enumerate(others) if mask >> j & 1)
+
+    # 1단계: 체인 하나만 자르는 경우 (kc = 0 이면 자르지 않고 통째로 나누는 경우)
+    for c in range(len(names)):
+        others, sums = others_sums(c)
+        xs = [x for x, _ in sums]
+        rest = total - lengths[c]
+        for k in range(len(chains[names[c]])):
+            p, s = prefixes[c][k], lengths[c] - prefixes[c][k]
+            # 완료 시각 max(p + x, max(rest - x, p) + s): 첫 항은 x 에 증가, 둘째 항은 감소
+            for idx in _crossing(xs, lambda x: p + x, lambda x: max(rest - x, p) + s):
+                makespan = max(p + xs[idx], max(rest - xs[idx], p) + s)
+                if makespan < best[0]:
+                    best = (makespan, c, k, None, 0, global_mask(others, sums[idx][1]))
+        if best[0] <= lower_bound:
+            break
+
+    # 2단계: 두 체인을 서로 엇갈리게 자르는 경우. z = x + pc - pd 로 두면 완료 시각은
+    #   max(L_d + max(z, 0), L_c + max(rest - z, 0))
+    # 이고 두 항이 만나는 z_c 는 식으로 구할 수 있다. (pc - pd) 값들을 정렬해 두고 부분합 x 마다
+    # z_c - x 양옆의 값만 본다 (numpy, 이 단계에서만 import).
+    if best[0] > lower_bound and len(names) > 1:
+        import numpy as np
+
+        for c in range(len(names)):
+            for d in range(len(names)):
+                if c == d:
+                    continue
+                others, sums = others_sums(c, d)
+                rest = total - lengths[c] - lengths[d]
+                lc, ld = lengths[c], lengths[d]
+                z_c = (rest + lc - ld) / 2
+                if z_c < 0:
+                    z_c = rest + lc - ld
+                elif z_c > rest:
+                    z_c = lc - ld
+                ds, first = np.unique(np.subtract.outer(prefixes[c], prefixes[d]).ravel(), return_index=True)
+                xs = np.array([x for x, _ in sums], dtype=float)
+                pos = np.searchsorted(ds, z_c - xs)
+                cand = np.clip(np.stack([pos - 1, pos]), 0, len(ds) - 1)
+                z = xs + ds[cand]
+                spans = np.maximum(ld + np.maximum(z, 0), lc + np.maximum(rest - z, 0))
+                row, col = np.unravel_index(int(np.argmin(spans)), spans.shape)
+                if spans[row, col] < best[0]:
+                    kc, kd = divmod(int(first[cand[row, col]]), len(prefixes[d]))
+                    best = (float(spans[row, col]), c, kc, d, kd, global_mask(others, sums[col][1]))
+                if best[0] <= lower_bound:
+                    break
+            if best[0] <= lower_bound:
+                break
+
+    makespan, c, kc, d, kd, mask = best
+    timeline: List[ScheduledUpgrade] = []
+    jobs_c = chains[names[c]]
+    jobs_d = chains[names[d]] if d is not None else []
+    t1 = c_ready = _run(1, jobs_c[:kc], 0, timeline)
+    t2 = d_ready = _run(2, jobs_d[:kd], 0, timeline)
+    for i, b in enumerate(names):
+        if i in (c, d):
+            continue
+        if mask >> i & 1:
+            t1 = _run(1, chains[b], t1, timeline)
+        else:
+            t2 = _run(2, chains[b], t2, timeline)
+    _run(1, jobs_d[kd:], max(t1, d_ready), timeline)
+    _run(2, jobs_c[kc:], max(t2, c_ready), timeline)
+    timeline.sort(key=lambda e: (e.start, e.queue))
+    return Schedule(makespan, lower_bound, timeline)
@@ -1,63 +1,77 @@
 import streamlit as st
-import pandas as pd
+
+import buff_sweep
+import calc_engine as engine
+import data_watch
+import perf_debug
+import result_cache
+import ui_labels
+from build_prereqs import load_prereq_graph, plan_account
+from build_scheduler import Upgrade, plan_upgrades, schedule_two_queues
+from speedup_solver import SPEEDUP_MINUTES, allocate_speedups
 
 # 📱 모바일 최적화를 위한 layout 설정
 st.set_page_config(page_title="건설 가속 계산기", layout="wide")
 
-# 🔁 FC 레벨 매핑
-fc_map = {
-    1: "1", 2: "2", 3: "3", 4: "4", 5: "5", 6: "6", 7: "7", 8: "8",
-    9: "9", 10: "10", 11: "11", 12: "12", 13: "13", 14: "14", 15: "15", 16: "16",
-    17: "17", 18: "18", 19: "19", 20: "20", 21: "21", 22: "22", 23: "23", 24: "24",
-    25: "25", 26: "26", 27: "27", 28: "28", 29: "29", 30: "30", 31: "30-1", 32: "30-2",
-    33: "30-3", 34: "30-4",
-    35: "FC1", 36: "FC1-1", 37: "FC1-2", 38: "FC1-3", 39: "FC1-4",
-    40: "FC2", 41: "FC2-1", 42: "FC2-2", 43: "FC2-3", 44: "FC2-4",
-    45: "FC3", 46: "FC3-1", 47: "FC3-2", 48: "FC3-3", 49: "FC3-4",
-    50: "FC4", 51: "FC4-1", 52: "FC4-2", 53: "FC4-3", 54: "FC4-4",
-    55: "FC5", 56: "FC5-1", 57: "FC5-2", 58: "FC5-3", 59: "FC5-4",
-    60: "FC6", 61: "FC6-1", 62: "FC6-2", 63: "FC6-3", 64: "FC6-4",
-    65: "FC7", 66: "FC7-1", 67: "FC7-2", 68: "FC7-3", 69: "FC7-4",
-    70: "FC8", 71: "FC8-1", 72: "FC8-2", 73: "FC8-3", 74: "FC8-4",
-    75: "FC9", 76: "FC9-1", 77: "FC9-2", 78: "FC9-3", 79: "FC9-4",
-    80: "FC10"
-}
-
-# 영어 → 한글 병기 이름
-building_labels = {
-    "Furnace": "Furnace (용광로)",
-    "Embassy": "Embassy (대사관)",
-    "Command Center": "Command Center (지휘부)",
-    "Infantry Camp": "Infantry Camp (방패병영)",
-    "Lancer Camp": "Lancer Camp (창병병영)",
-    "Marksman Camp": "Marksman Camp (궁병병영)",
-    "War Academy": "War Academy (전쟁아카데미)",
-    "Infirmary": "Infirmary (의무실)",
-    "Research Center": "Research Center (연구소)"
-}
-ordered_buildings = list(building_labels.keys())
-
-@st.cache_data
-def load_data():
-    df = pd.read_csv("data/build_numeric.csv")
-    df = df[df["Building"].isin(ordered_buildings)]
-    df["fc_level"] = df["numerical"].map(fc_map)
-    return df.dropna(subset=["fc_level"])
-
-df = load_data()
-
-level_dict = {
-    b: df[df["Building"] == b][["fc_level", "numerical"]]
-    .drop_duplicates()
-    .sort_values("numerical")
-    .reset_index(drop=True)
-    for b in ordered_buildings if b in df["Building"].unique()
-}
+# 🐞 구간별 시간 측정 (WOS_DEBUG=1 또는 ?debug=1 일 때만)
+prof = perf_debug.start("build_time_new")
+
+# 영어 → 한글 병기 이름 (프로세스 공용, 읽기 전용)
+building_labels = ui_labels.BUILDING_LABELS
+ordered_buildings = tuple(building_labels)
+
+# 건물별 레벨 목록 / 누적 건설 시간 (현재 표를 실행마다 한 번 받는다, 데이터 파일이 바뀌면 data_watch 가 교체)
+data_watch.start()
+build_table = engine.load_build_table()
+# 레벨 목록은 표의 튜플을 그대로 선택지로 쓴다 (세션마다 복사하지 않음)
+level_lists = {b: build_table.levels[b] for b in ordered_buildings if b in build_table.levels}
+prof.mark("load")
+
+
+def compute_plan(selected_levels, cs, boost, vp, hyena):
+    """(순수 합계, 건물별 합계, 버프 적용 시간, 대기열 2개 일정) — 세션 간 캐시 대상."""
+    per_building_result = {
+        b: build_table.range_total(b, start_fc, end_fc) for b, (start_fc, end_fc) in selected_levels.items()
+    }
+    total = sum(per_building_result.values())
+    adjusted = engine.adjusted_build_time(total, cs, boost, vp, hyena)
+    # 👷 건설 대기열 2개 기준 (같은 건물은 순서대로, 다른 건물끼리는 동시에 진행)
+    speed_factor = engine.adjusted_build_time(1, cs, boost, vp, hyena)
+    schedule = schedule_two_queues(plan_upgrades(selected_levels, build_table)).scaled(speed_factor)
+    return total, per_building_result, adjusted, schedule
+
+
+HYENA_OPTIONS = (0, 5, 7, 9, 12, 15)
+
+
+def option_index(options, value, default):
+    return options.index(value) if value in options else default
+
+
+# 🔗 공유 링크(?plan=...)로 열면 그 계획으로 입력을 채우고 바로 계산한다 (세션당 처음 한 번만 읽음)
+plan_cache = result_cache.shared("build_time_new", maxsize=512, ttl=6 * 3600)
+if "shared_plan" not in st.session_state:
+    # 잘리거나 손으로 고친 링크도 있으니 표에 있는 건물 / 레벨과 선택지에 있는 값만 받는다
+    shared_plan = result_cache.sanitize_plan(result_cache.decode_plan(st.query_params.get("plan", "")), {
+        "levels": result_cache.record({b: result_cache.pair(levels) for b, levels in level_lists.items()}),
+        "current": result_cache.record({b: result_cache.one_of(levels) for b, levels in level_lists.items()}),
+        "prereqs": result_cache.flag,
+        "cs": result_cache.amount,
+        "boost": result_cache.one_of(["Yes", "No"]),
+        "vp": result_cache.one_of(["Yes", "No"]),
+        "hyena": result_cache.one_of(HYENA_OPTIONS),
+    })
+    st.session_state["shared_plan"] = shared_plan
+    st.session_state["auto_submit"] = bool(shared_plan)
+shared_plan = st.session_state["shared_plan"]
+shared_levels = shared_plan.get("levels", {})
+shared_current = shared_plan.get("current", {})
 
 st.title("🏗️ 건설 가속 계산기")
 st.caption("목표 구간만 계산됩니다. 건물별로 현재와 목표 레벨을 선택하세요.")
 
 selected_levels = {}
+current_levels = {}
 
 with st.container():
     st.markdown("### 🎯 건설 목표")
@@ -68,24 +82,56 @@ with st.container():
             if i + j >= len(ordered_buildings):
                 continue
             b = ordered_buildings[i + j]
-            if b not in level_dict:
+            if b not in level_lists:
                 continue
-            lv_df = level_dict[b]
-            level_list = lv_df["fc_level"].tolist()
+            level_list = level_lists[b]
             default_idx = next((k for k, v in enumerate(level_list) if "FC7" in v), 0)
+            shared_start, shared_end = shared_levels.get(b, (shared_current.get(b), shared_current.get(b)))
             with cols[j]:
                 st.markdown(f"**🏗️ {building_labels[b]}**")
-                start = st.selectbox("현재(Current)", level_list, index=default_idx, key=f"{b}_start")
-                end = st.selectbox("목표(Target)", level_list, index=default_idx, key=f"{b}_end")
+                start = st.selectbox(
+                    "현재(Current)", level_list, index=option_index(level_list, shared_start, default_idx),
+                    key=f"{b}_start",
+                )
+                end = st.selectbox(
+                    "목표(Target)", level_list, index=option_index(level_list, shared_end, default_idx),
+                    key=f"{b}_end",
+                )
+                current_levels[b] = start
                 if start != end:
                     selected_levels[b] = (start, end)
 
+    # 🔗 용광로 등의 선행 조건 (data/build_prereqs.csv) 으로 다른 건물 레벨까지 채운다.
+    # 표에는 게임에서 확인한 조건만 넣는다 — 비어 있으면 옵션을 끈다.
+    prereq_graph = load_prereq_graph(table=build_table)
+    with_prereqs = st.checkbox(
+        "🔗 선행 조건 포함 (목표에 필요한 다른 건물 레벨업 자동 추가)",
+        value=bool(shared_plan.get("prereqs")) and bool(prereq_graph.requires), key="with_prereqs",
+        disabled=not prereq_graph.requires,
+        help="data/build_prereqs.csv 에 적힌 조건만 따릅니다." if prereq_graph.requires
+        else "아직 게임에서 확인한 선행 조건이 없습니다 (data/build_prereqs.csv 가 비어 있음).",
+    )
+
 with st.container():
     st.markdown("### 🧪 버프 입력")
-    cs = st.number_input("기본 건설 속도(Your Constr Speed) (%)", value=85.0) / 100
-    boost = st.selectbox("중상주의 (Double Time)", ["Yes", "No"], index=0)
-    vp = st.selectbox("부집행관 (VP)", ["Yes", "No"], index=0)
-    hyena = st.selectbox("하이에나 보너스(Pet Skill) (%)", [0, 5, 7, 9, 12, 15], index=5) / 100
+    cs = st.number_input("기본 건설 속도(Your Constr Speed) (%)", value=float(shared_plan.get("cs", 85.0))) / 100
+    boost = st.selectbox("중상주의 (Double Time)", ["Yes", "No"], index=option_index(["Yes", "No"], shared_plan.get("boost"), 0))
+    vp = st.selectbox("부집행관 (VP)", ["Yes", "No"], index=option_index(["Yes", "No"], shared_plan.get("vp"), 0))
+    hyena = st.selectbox(
+        "하이에나 보너스(Pet Skill) (%)", HYENA_OPTIONS, index=option_index(HYENA_OPTIONS, shared_plan.get("hyena"), 5)
+    ) / 100
+    show_sweep = buff_sweep.checkbox()
+
+with st.expander("⏩ 보유 가속 아이템 (선택)"):
+    st.caption("입력하면 업그레이드마다 낭비(초과분)가 가장 적게 가속 아이템을 배분합니다.")
+    speedup_stock = {}
+    for pool, pool_label in (("construction", "건설 가속"), ("general", "일반 가속")):
+        st.markdown(f"**{pool_label}**")
+        cols = st.columns(len(SPEEDUP_MINUTES))
+        speedup_stock[pool] = {
+            name: cols[i].number_input(name, min_value=0, value=0, step=1, key=f"{pool}_{name}")
+            for i, name in enumerate(SPEEDUP_MINUTES)
+        }
 
 with st.expander("📘 내 기본 건설 속도 확인 방법 가이드"):
     st.markdown("""
@@ -95,37 +141,109 @@ with st.expander("📘 내 기본 건설 속도 확인 방법 가이드"):
     ℹ️ 참고: **집행관 버프**가 적용되어 있을 경우 이 수치에 포함되어 표시됩니다.
     """)
 
-submitted = st.button("🧮 계산하기")
+submitted = st.button("🧮 계산하기") or st.session_state.pop("auto_submit", False)
+prof.mark("widgets")
 
 if submitted:
-    def secs_to_str(secs):
-        d = int(secs // 86400)
-        h = int((secs % 86400) // 3600)
-        m = int((secs % 3600) // 60)
-        s = int(secs % 60)
-        return f"{d}d {h}:{m:02}:{s:02}"
-
     if not selected_levels:
         st.warning("⚠️ 최소 한 건물이라도 구간을 선택해주세요.")
     else:
-        total = 0
-        per_building_result = {}
-        for b, (start_fc, end_fc) in selected_levels.items():
-            lv_df = level_dict[b]
-            end_num = lv_df[lv_df["fc_level"] == end_fc]["numerical"].values[0]
-            start_num = lv_df[lv_df["fc_level"] == start_fc]["numerical"].values[0]
-            sub_df = df[(df["Building"] == b) & (df["numerical"] > start_num) & (df["numerical"] <= end_num)]
-            subtotal = sub_df["Total"].sum()
-            total += subtotal
-            per_building_result[b] = subtotal
-
-        boost_bonus = 0.2 if boost == "Yes" else 0
-        vp_bonus = 0.1 if vp == "Yes" else 0
-        speed_total = 1 + cs + vp_bonus + hyena
-        adjusted = (total / speed_total) * (1 - boost_bonus)
+        # 🔗 정규화한 계획 = 캐시 키 = 공유 링크
+        plan_fields = {
+            "levels": selected_levels,
+            "cs": round(cs * 100, 4),
+            "boost": boost,
+            "vp": vp,
+            "hyena": round(hyena * 100),
+        }
+        account = None
+        if with_prereqs:
+            # 선행 조건은 선택하지 않은 건물의 현재 레벨에도 달려 있다
+            plan_fields.update(prereqs=True, current=current_levels)
+            account = plan_account({b: end for b, (_, end) in selected_levels.items()}, current_levels, prereq_graph)
+            selected_levels = account.levels
+        plan_key = result_cache.encode_plan(plan_fields)
+        st.query_params["plan"] = plan_key
+        total, per_building_result, adjusted, schedule = plan_cache.get_or_compute(
+            plan_key, lambda: compute_plan(selected_levels, cs, boost == "Yes", vp == "Yes", hyena)
+        )
+        prof.note("cache", plan_cache.stats())
+        prof.mark("calculate")
 
         st.markdown("### ✅ 최종 건설 시간")
-        st.success(f"⚡ **Adjusted Time:** {secs_to_str(adjusted)}")
+        st.success(f"⚡ **Adjusted Time:** {engine.secs_to_str(adjusted)}")
+        st.success(f"👷 **대기열 2개 동시 진행 시:** {engine.secs_to_str(schedule.makespan)}")
+        if account is not None:
+            if account.added:
+                st.info("🔗 선행 조건으로 추가된 레벨업:  \n" + "  \n".join(
+                    f"- {building_labels[b]}: {account.levels[b][0]} → {account.levels[b][1]}" for b in account.added
+                ))
+            with st.expander(f"🔗 선행 조건 순서 ({len(account.order)}단계)"):
+                st.caption("대기열 일정은 건물 간 선행 순서를 따지지 않은 값이라, 실제로는 이 순서를 지켜야 합니다.")
+                st.dataframe(
+                    [
+                        {
+                            "순서": k + 1,
+                            "건물": building_labels[u.building],
+                            "레벨": u.level,
+                            "건설 시간": engine.secs_to_str(u.seconds),
+                        }
+                        for k, u in enumerate(account.order)
+                    ],
+                    use_container_width=True,
+                    hide_index=True,
+                )
+        with st.expander("🗓️ 대기열별 일정"):
+            st.dataframe(
+                [
+                    {
+                        "대기열": e.queue,
+                        "건물": building_labels[e.building],
+                        "레벨": e.level,
+                        "시작": engine.secs_to_str(e.start),
+                        "완료": engine.secs_to_str(e.end),
+                    }
+                    for e in schedule.timeline
+                ],
+                use_container_width=True,
+                hide_index=True,
+            )
+        prof.mark("schedule")
+
+        # ⏩ 가속 아이템 배분 (대기열 일정의 시작 순서대로 한 업그레이드씩 완료)
+        if any(v > 0 for stock in speedup_stock.values() for v in stock.values()):
+            speedup_plan = allocate_speedups(
+                [Upgrade(e.building, e.level, e.end - e.start) for e in schedule.timeline],
+                speedup_stock["construction"],
+                speedup_stock["general"],
+            )
+            st.markdown("### ⏩ 가속 아이템 배분")
+            st.info(
+                f"✅ 완료 가능: {speedup_plan.completed} / {len(speedup_plan.uses)} 업그레이드  \n"
+                f"🗑️ 초과(낭비): {engine.secs_to_str(speedup_plan.total_overshoot)}"
+            )
+
+            def items_str(used):
+                return ", ".join(f"{k}×{used[k]}" for k in SPEEDUP_MINUTES if used.get(k))
+
+            with st.expander("📋 업그레이드별 배분"):
+                st.dataframe(
+                    [
+                        {
+                            "건물": building_labels[u.building],
+                            "레벨": u.level,
+                            "건설 시간": engine.secs_to_str(u.seconds),
+                            "건설 가속": items_str(u.construction),
+                            "일반 가속": items_str(u.general),
+                            "초과": engine.secs_to_str(u.overshoot),
+                            "남은 시간": engine.secs_to_str(u.remaining),
+                        }
+                        for u in speedup_plan.uses
+                    ],
+                    use_container_width=True,
+                    hide_index=True,
+                )
+            prof.mark("speedups")
 
         with st.expander("📋 입력 요약"):
             st.markdown(
@@ -140,11 +258,17 @@ if submitted:
             for b, (start_fc, end_fc) in selected_levels.items():
                 st.markdown(f"- {building_labels[b]}: {start_fc} → {end_fc}")
 
+        if show_sweep:
+            st.markdown("### 📈 버프 what-if")
+            buff_sweep.render(total, cs, boost == "Yes", vp == "Yes", hyena, HYENA_OPTIONS)
+            prof.mark("sweep")
+
         with st.expander("⏱️ Unboosted Time (참고용)"):
-            st.info(f"🕒 총합: {secs_to_str(total)}")
+            st.info(f"🕒 총합: {engine.secs_to_str(total)}")
             for b in ordered_buildings:
                 if b in per_building_result:
-                    st.markdown(f"- **{building_labels[b]}**: {secs_to_str(per_building_result[b])}")
+                    st.markdown(f"- **{building_labels[b]}**: {engine.secs_to_str(per_building_result[b])}")
 
 st.markdown("---")
 st.markdown("<div style='text-align:center; color: gray;'>🍋 Made with 💚 by <b>Lime</b></div>", unsafe_allow_html=True)
+prof.finish()
@@ -1,30 +1,19 @@
 import streamlit as st
-import pandas as pd
 import os
 
+import calc_engine as engine
+import data_watch
+
 # --- 페이지 설정 ---
 st.set_page_config(page_title="건설 가속 계산기", layout="centered")
 
-# --- 데이터 로딩 ---
-@st.cache_data
-def load_data():
-    path = "data/build_time_clean.csv"
-    return pd.read_csv(path, encoding="cp949")
-
-df = load_data()
-
 # 🔧 포함할 건물만 필터링
 target_buildings = ["Furnace", "Command Center", "Embassy"]
-df = df[df["Building"].isin(target_buildings)]
 
-# --- 레벨 매핑 딕셔너리 구성 ---
-level_dict = {
-    b: df[df["Building"] == b][["level", "numerical"]]
-    .drop_duplicates()
-    .sort_values("numerical")
-    .reset_index(drop=True)
-    for b in target_buildings
-}
+# --- 데이터 로딩 (현재 표를 실행마다 한 번 받는다, 데이터 파일이 바뀌면 data_watch 가 교체) ---
+data_watch.start()
+build_table = engine.load_labeled_build_table()
+levels = engine.load_level_registry()
 
 # --- UI 시작 ---
 st.title("🏗️ 건설 가속 계산기")
@@ -43,9 +32,8 @@ selected_levels = {}
 
 with st.form("build_form"):
     for b in target_buildings:
-        levels_df = level_dict[b]
-        level_list = levels_df["level"].astype(str).tolist()
-        default_idx = levels_df[levels_df["level"] == "FC7"].index[0] if "FC7" in levels_df["level"].values else 0
+        level_list = build_table.levels[b]
+        default_idx = level_list.index("FC7") if "FC7" in level_list else 0
 
         st.markdown(f"**🏛 {b}**")
         col1, col2 = st.columns(2)
@@ -73,36 +61,26 @@ if submitted:
     if not selected_levels:
         st.warning("⚠️ 최소 하나 이상의 건물에서 레벨 구간을 선택해주세요.")
     else:
-        def secs_to_str(secs):
-            d = int(secs // 86400)
-            h = int((secs % 86400) // 3600)
-            m = int((secs % 3600) // 60)
-            s = int(secs % 60)
-            return f"{d}d {h}:{m:02}:{s:02}"
+        import pandas as pd  # 표를 그릴 때만 (시작 시간 단축)
+
+        secs_to_str = engine.secs_to_str
 
         total_secs = 0
         st.markdown("---")
         st.subheader("📤 결과")
 
         for b, (start_label, end_label) in selected_levels.items():
-            levels_df = level_dict[b]
-            start_num = levels_df[levels_df["level"].astype(str) == str(start_label)]["numerical"].values[0]
-            end_num = levels_df[levels_df["level"].astype(str) == str(end_label)]["numerical"].values[0]
-
-            sub_df = df[
-                (df["Building"] == b) &
-                (df["numerical"] >= min(start_num, end_num)) &
-                (df["numerical"] <= max(start_num, end_num))
-            ].copy()
-
-            subtotal = sub_df["Total"].sum()
+            subtotal = build_table.span_total(b, start_label, end_label)
             total_secs += subtotal
 
-            sub_df["초"] = sub_df["Total"].astype(int)
-            sub_df["시간"] = sub_df["초"].apply(secs_to_str)
+            rows = build_table.span_rows(b, start_label, end_label)
+            sub_df = pd.DataFrame({
+                "level": levels.categorical(label for label, _ in rows),
+                "시간": [secs_to_str(int(t)) for _, t in rows],
+            })
 
             st.markdown(f"#### 🏛 {b}")
-            st.dataframe(sub_df[["level", "시간"]].set_index("level"), use_container_width=True)
+            st.dataframe(sub_df.set_index("level"), use_container_width=True)
             st.markdown(f"🔹 해당 구간 소요 시간: `{secs_to_str(subtotal)}`")
 
         # 최종 Adjusted 시간
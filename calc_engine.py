@@ -0,0 +1,493 @@
+"""WOS 계산 엔진 (Streamlit / pandas 없이 import 가능).
+
+영주 장비 부족 자원, 패키지 자원 합산, 건설 시간(버프 적용)을 계산한다.
+Streamlit 앱과 배치 작업/봇이 같은 계산 로직을 공유하기 위한 모듈이다.
+기본 경로의 표는 data/snapshot.bin (data_snapshot) 에서 복사 없이 읽는다 (data_watch 가 바꿔 끼울 수 있다).
+load_* 는 기본/캐시 경로, read_* 는 캐시 없이 CSV 를 새로 읽는다.
+"""
+
+import csv
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+
+GEAR_RESOURCES: Tuple[str, ...] = ("Design", "Alloy", "Polish", "Amber")
+GEAR_PARTS: Tuple[str, ...] = ("Coat", "Pants", "Ring", "Cudgel", "Hat", "Watch")
+
+BUILDINGS: Tuple[str, ...] = (
+    "Furnace", "Embassy", "Command Center", "Infantry Camp", "Lancer Camp",
+    "Marksman Camp", "War Academy", "Infirmary", "Research Center",
+)
+
+
+def _snapshot():
+    """현재 data/snapshot.bin (data_snapshot 참고). 쓸 수 없는 환경이면 None → CSV 를 직접 읽는다.
+
+    data_watch 가 새 스냅샷으로 바꿔 끼우면 다음 호출부터 새 표가 나온다. 이미 받아 간 표는 그대로다.
+    """
+    try:
+        import data_snapshot
+
+        return data_snapshot.load()
+    except OSError:
+        return None
+
+
+# 표 객체나 CSV 파일을 키로 쓰는 메모들 — data_watch 가 표를 바꿔 끼울 때 clear_table_caches() 로
+# 함께 비워 예전 표가 캐시에 남지 않게 한다 (다른 모듈의 메모도 table_cache 로 등록).
+_table_caches: List[Callable] = []
+
+
+def table_cache(maxsize: Optional[int] = 4096):
+    """lru_cache + clear_table_caches() 대상으로 등록."""
+    def wrap(fn):
+        cached = lru_cache(maxsize=maxsize)(fn)
+        _table_caches.append(cached)
+        return cached
+
+    return wrap
+
+
+def clear_table_caches() -> None:
+    for cached in _table_caches:
+        cached.cache_clear()
+
+
+def _stamp(path: Path) -> Tuple[Tuple[str, int, int], ...]:
+    """파일 (폴더면 그 안의 CSV 들) 의 (이름, mtime, 크기). 없으면 빈 튜플 — 읽을 때 오류가 난다."""
+    try:
+        paths = sorted(path.glob("*.csv")) if path.is_dir() else [path]
+        return tuple((p.name, st.st_mtime_ns, st.st_size) for p in paths for st in [p.stat()])
+    except OSError:
+        return ()
+
+
+def _from_csv(reader, path: Path, *args):
+    """경로를 준 CSV (또는 스냅샷을 쓸 수 없을 때의 기본 경로) 는 파일이 바뀌기 전까지 한 번만 읽는다."""
+    return _read_csv(reader, path, _stamp(path), *args)
+
+
+@table_cache(maxsize=32)
+def _read_csv(reader, path: Path, stamp, *args):
+    return reader(path, *args)
+
+
+# --- 레벨 서수 (등급 / 건물 레벨 라벨 ↔ 정수) ---
+
+@dataclass(frozen=True, eq=False)
+class LevelRegistry:
+    """장비 등급과 건물 레벨 라벨의 조밀한 정수 서수 (0부터, 낮은 → 높은 순).
+
+    데이터 파일에서 한 번 만든다 (gear_data.csv 의 Level, build_time_clean.csv 의 level/numerical).
+    fc_numerical[i] 는 i번 건물 레벨의 numerical 이다. 라벨 앞뒤 공백은 무시한다.
+    """
+
+    gear: Tuple[str, ...]
+    fc: Tuple[str, ...]
+    fc_numerical: Tuple[int, ...]
+    fc_by_numerical: Dict[int, str]
+
+    def categorical(self, labels: Iterable[str], kind: str = "fc"):
+        """라벨 목록 → 순서 있는 pandas Categorical (범주 = 전체 레벨, 정렬/비교가 서수로 된다)."""
+        import pandas as pd
+
+        return pd.Categorical(
+            [label.strip() for label in labels],
+            categories=self.fc if kind == "fc" else self.gear,
+            ordered=True,
+        )
+
+
+def level_registry_from_rows(
+    gear_levels: Sequence[str], fc_rows: Iterable[Tuple[str, int]]
+) -> LevelRegistry:
+    """장비 등급 목록 + (건물 레벨 라벨, numerical) 행 → LevelRegistry.
+
+    numerical 마다 가장 많이 쓰인 라벨을 고른다 (건물 하나가 라벨을 잘못 적은 행이 있다).
+    """
+    counts: Dict[int, Counter] = {}
+    for label, num in fc_rows:
+        counts.setdefault(num, Counter())[label.strip()] += 1
+    nums = tuple(sorted(counts))
+    fc = tuple(counts[n].most_common(1)[0][0] for n in nums)
+    gear = tuple(gear_levels)
+    return LevelRegistry(
+        gear=gear,
+        fc=fc,
+        fc_numerical=nums,
+        fc_by_numerical=dict(zip(nums, fc)),
+    )
+
+
+def load_level_registry(data_dir: Optional[Path] = None) -> LevelRegistry:
+    """data_dir 의 데이터 파일에서 만든 레벨 서수표 (기본 경로는 스냅샷에서)."""
+    if data_dir is None and (snapshot := _snapshot()) is not None:
+        return snapshot.level_registry()
+    return _from_csv(read_level_registry, Path(data_dir or DATA_DIR))
+
+
+def read_level_registry(data_dir: Path) -> LevelRegistry:
+    with open(data_dir / "gear_data.csv", newline="", encoding="utf-8") as f:
+        gear_levels = [r["Level"] for r in csv.DictReader(f)]
+    with open(data_dir / "build_time_clean.csv", newline="", encoding="cp949") as f:
+        fc_rows = [(r["level"], int(r["numerical"])) for r in csv.DictReader(f)]
+    return level_registry_from_rows(gear_levels, fc_rows)
+
+
+# --- 영주 장비 ---
+
+@dataclass(frozen=True, eq=False)
+class GearTable:
+    """등급 순서와 등급별 누적 자원표.
+
+    cumulative[i] 는 0번 등급부터 i번 등급까지의 (Design, Alloy, Polish, Amber) 합이라
+    현재 → 목표 비용은 cumulative[목표] - cumulative[현재] 이다.
+    """
+
+    levels: Tuple[str, ...]
+    index: Dict[str, int]
+    cumulative: Tuple[Tuple[int, ...], ...]
+
+    def range_cost(self, cur: str, tar: str) -> Tuple[int, ...]:
+        return self.range_cost_between(self.index[cur], self.index[tar])
+
+    def range_cost_between(self, i1: int, i2: int) -> Tuple[int, ...]:
+        """등급 서수 i1 → i2 비용."""
+        if i1 >= i2:
+            return (0,) * len(GEAR_RESOURCES)
+        row_cur, row_tar = self.cumulative[i1], self.cumulative[i2]
+        return tuple(t - c for t, c in zip(row_tar, row_cur))
+
+
+@dataclass(frozen=True)
+class ResourceSummary:
+    resource: str
+    needed: int
+    owned: int
+
+    @property
+    def deficit(self) -> int:
+        return max(0, self.needed - self.owned)
+
+
+def load_gear_table(path: Optional[Path] = None) -> GearTable:
+    if path is None and (snapshot := _snapshot()) is not None:
+        return snapshot.gear_table()
+    return _from_csv(read_gear_table, path or DATA_DIR / "gear_data.csv")
+
+
+def read_gear_table(path: Path) -> GearTable:
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    levels = tuple(r["Level"] for r in rows)
+    running = [0] * len(GEAR_RESOURCES)
+    cumulative = []
+    for r in rows:
+        running = [acc + int(r[k]) for acc, k in zip(running, GEAR_RESOURCES)]
+        cumulative.append(tuple(running))
+    return GearTable(levels, {lv: i for i, lv in enumerate(levels)}, tuple(cumulative))
+
+
+def gear_needed(
+    plan: Iterable[Tuple[str, str]], table: Optional[GearTable] = None
+) -> Dict[str, int]:
+    """부위별 (현재, 목표) 등급 목록에 필요한 자원 합계."""
+    table = table or load_gear_table()
+    total = [0] * len(GEAR_RESOURCES)
+    for cur, tar in plan:
+        for j, v in enumerate(table.range_cost(cur, tar)):
+            total[j] += v
+    return dict(zip(GEAR_RESOURCES, total))
+
+
+def gear_deficit(
+    plan: Iterable[Tuple[str, str]],
+    owned: Mapping[str, int],
+    table: Optional[GearTable] = None,
+) -> List[ResourceSummary]:
+    """필요량 / 보유량 / 부족량 요약 (자원 순서: GEAR_RESOURCES)."""
+    needed = gear_needed(plan, table)
+    return [ResourceSummary(k, needed[k], owned.get(k, 0)) for k in GEAR_RESOURCES]
+
+
+# --- 패키지 ---
+
+# packages.csv 의 자원 이름 → 장비 자원 이름.
+# 패키지의 DesignPlans 는 게임의 설계도면 (영문 "Design Plans") 이라 보유 설계도면에 더한다.
+# 처음 버전의 gear_calc 는 이 값을 모아 두기만 하고 보유량에 더하지 않았다 (설계도면 부족량이 더 크게 나왔다).
+PACKAGE_RESOURCE_ALIASES: Dict[str, str] = {"DesignPlans": "Design"}
+
+# 패키지 원화 가격 (인게임 표기 기준)
+PRICE_KRW: Dict[str, int] = {"$5": 7500, "$10": 15000, "$20": 30000, "$50": 79000, "$100": 149000}
+
+
+def package_price(key: str, currency: str = "usd") -> int:
+    """패키지 가격 — "usd" 는 센트, "krw" 는 원 단위 정수."""
+    price = key.rsplit("_", 1)[1]
+    if currency == "krw":
+        return PRICE_KRW[price]
+    return round(float(price.lstrip("$")) * 100)
+
+
+@dataclass(frozen=True, eq=False)
+class PackageMatrix:
+    """(Category × Package) × 자원 밀집 행렬.
+
+    keys[i] 는 "Category_$price", rows[i] 는 GEAR_RESOURCES 순서의 자원량이라
+    구매 수량 벡터 c 에 대한 자원 합계는 c · rows 한 번이다.
+    """
+
+    keys: Tuple[str, ...]
+    index: Dict[str, int]
+    rows: Tuple[Tuple[int, ...], ...]
+
+    def count_vector(self, counts: Mapping[str, int]) -> List[int]:
+        vec = [0] * len(self.keys)
+        for key, count in counts.items():
+            if key in self.index:
+                vec[self.index[key]] = count
+        return vec
+
+    def totals(self, counts: Mapping[str, int]) -> Dict[str, int]:
+        totals = [0] * len(GEAR_RESOURCES)
+        for c, row in zip(self.count_vector(counts), self.rows):
+            if c > 0:
+                for j, v in enumerate(row):
+                    totals[j] += v * c
+        return dict(zip(GEAR_RESOURCES, totals))
+
+    def totals_batch(self, scenarios):
+        """여러 구매 시나리오를 한 번에 계산 (numpy, 결과: 시나리오 × GEAR_RESOURCES).
+
+        scenarios 는 {패키지 키: 수량} 목록 또는 (시나리오 × keys) 2차원 배열. 음수 수량은 ValueError.
+        """
+        import numpy as np
+
+        if len(scenarios) and isinstance(scenarios[0], Mapping):
+            scenarios = [self.count_vector(s) for s in scenarios]
+        counts = np.asarray(scenarios, dtype=np.int64).reshape(-1, len(self.keys))
+        if (counts < 0).any():
+            row, col = np.argwhere(counts < 0)[0]
+            raise ValueError(f"시나리오 {row}: {self.keys[col]} 구매 수량이 음수입니다 ({counts[row, col]})")
+        return counts @ np.asarray(self.rows, dtype=np.int64)
+
+
+def load_packages(path: Optional[Path] = None) -> PackageMatrix:
+    if path is None and (snapshot := _snapshot()) is not None:
+        return snapshot.packages()
+    return _from_csv(read_packages, path or DATA_DIR / "packages.csv")
+
+
+def read_packages(path: Path) -> PackageMatrix:
+    contents: Dict[str, List[int]] = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for r in csv.DictReader(f):
+            if not r.get("Category"):
+                continue
+            row = contents.setdefault(f"{r['Category']}_{r['Package']}", [0] * len(GEAR_RESOURCES))
+            res = PACKAGE_RESOURCE_ALIASES.get(r["Resource"], r["Resource"])
+            if res in GEAR_RESOURCES:
+                row[GEAR_RESOURCES.index(res)] += int(r["Amount"])
+    keys = tuple(contents)
+    return PackageMatrix(keys, {k: i for i, k in enumerate(keys)}, tuple(tuple(contents[k]) for k in keys))
+
+
+def package_totals(
+    counts: Mapping[str, int], packages: Optional[PackageMatrix] = None
+) -> Dict[str, int]:
+    """패키지 구매 수량 → 자원별 합계 (GEAR_RESOURCES 순서)."""
+    return (packages or load_packages()).totals(counts)
+
+
+# --- 화면 단위 증분 계산 (표 객체별 메모이즈, 표를 안 주면 현재 기본 표) ---
+
+def part_cost(cur: str, tar: str, table: Optional[GearTable] = None) -> Tuple[int, ...]:
+    """부위 하나의 현재 → 목표 비용 (GEAR_RESOURCES 순서)."""
+    return _part_cost(table or load_gear_table(), cur, tar)
+
+
+@table_cache(maxsize=4096)
+def _part_cost(table: GearTable, cur: str, tar: str) -> Tuple[int, ...]:
+    return table.range_cost(cur, tar)
+
+
+def package_contribution(key: str, count: int, packages: Optional[PackageMatrix] = None) -> Tuple[int, ...]:
+    """패키지 하나를 count 개 샀을 때의 자원 (GEAR_RESOURCES 순서, 없는 패키지는 0)."""
+    return _package_contribution(packages or load_packages(), key, count)
+
+
+@table_cache(maxsize=4096)
+def _package_contribution(packages: PackageMatrix, key: str, count: int) -> Tuple[int, ...]:
+    if key not in packages.index or count <= 0:
+        return (0,) * len(GEAR_RESOURCES)
+    return tuple(v * count for v in packages.rows[packages.index[key]])
+
+
+def sum_resources(parts: Iterable[Tuple[int, ...]]) -> Dict[str, int]:
+    """자원 튜플들의 합 → {자원: 양}."""
+    total = [0] * len(GEAR_RESOURCES)
+    for part in parts:
+        for j, v in enumerate(part):
+            total[j] += v
+    return dict(zip(GEAR_RESOURCES, total))
+
+
+# --- 건설 시간 ---
+
+@dataclass(frozen=True, eq=False)
+class BuildTable:
+    """건물별 레벨 목록과 numerical 기준 누적 건설 시간(초).
+
+    cumulative[b][n] 은 numerical n 까지의 Total 누적합이다.
+    """
+
+    levels: Dict[str, Tuple[str, ...]]
+    level_to_num: Dict[str, Dict[str, int]]
+    totals: Dict[str, Dict[int, float]]
+    cumulative: Dict[str, Tuple[float, ...]]
+
+    def range_total(self, building: str, start: str, end: str) -> float:
+        """start 다음 레벨부터 end 까지의 건설 시간 (start >= end 이면 0)."""
+        nums = self.level_to_num[building]
+        return self.range_total_between(building, nums[start], nums[end])
+
+    def range_total_between(self, building: str, lo: int, hi: int) -> float:
+        """numerical lo 다음부터 hi 까지의 건설 시간."""
+        if lo >= hi:
+            return 0
+        cum = self.cumulative[building]
+        return cum[hi] - cum[lo]
+
+    def range_rows(self, building: str, start: str, end: str) -> List[Tuple[str, float]]:
+        """range_total 구간의 (레벨 라벨, Total) 목록 (numerical 순)."""
+        lo, hi = self.level_to_num[building][start], self.level_to_num[building][end]
+        totals = self.totals[building]
+        return [
+            (label, totals[n])
+            for label, n in zip(self.levels[building], sorted(totals)) if lo < n <= hi
+        ]
+
+    def span_total(self, building: str, a: str, b: str) -> float:
+        """a, b 두 레벨을 모두 포함하는 구간의 건설 시간 (순서 무관)."""
+        n1, n2 = self.level_to_num[building][a], self.level_to_num[building][b]
+        lo, hi = min(n1, n2), max(n1, n2)
+        cum = self.cumulative[building]
+        return cum[hi] - (cum[lo - 1] if lo > 0 else 0)
+
+    def span_rows(self, building: str, a: str, b: str) -> List[Tuple[str, float]]:
+        """span_total 구간의 (레벨 라벨, Total) 목록."""
+        n1, n2 = self.level_to_num[building][a], self.level_to_num[building][b]
+        lo, hi = min(n1, n2), max(n1, n2)
+        nums = self.level_to_num[building]
+        return [
+            (label, self.totals[building][nums[label]])
+            for label in self.levels[building] if lo <= nums[label] <= hi
+        ]
+
+
+def build_table_from_rows(
+    rows: Iterable[Tuple[str, str, int, float]], buildings: Iterable[str] = BUILDINGS
+) -> BuildTable:
+    """(건물, 레벨 라벨, numerical, Total) 행 → BuildTable."""
+    per_building: Dict[str, Dict[int, Tuple[str, float]]] = {b: {} for b in buildings}
+    for b, label, num, total in rows:
+        if b in per_building and num not in per_building[b]:
+            per_building[b][num] = (label, total)
+    levels, level_to_num, totals, cumulative = {}, {}, {}, {}
+    for b, by_num in per_building.items():
+        if not by_num:
+            continue
+        nums = sorted(by_num)
+        levels[b] = tuple(by_num[n][0] for n in nums)
+        level_to_num[b] = {by_num[n][0]: n for n in nums}
+        totals[b] = {n: by_num[n][1] for n in nums}
+        cum, running = [], 0
+        for n in range(nums[-1] + 1):
+            running += by_num[n][1] if n in by_num else 0
+            cum.append(running)
+        cumulative[b] = tuple(cum)
+    return BuildTable(levels, level_to_num, totals, cumulative)
+
+
+def _number(value: str):
+    f = float(value)
+    return int(f) if f.is_integer() else f
+
+
+def load_build_table(path: Optional[Path] = None) -> BuildTable:
+    """data/build_numeric.csv (레벨 라벨은 같은 폴더의 LevelRegistry 로 부여)."""
+    if path is None and (snapshot := _snapshot()) is not None:
+        return snapshot.build_table("build")
+    return _from_csv(read_build_table, path or DATA_DIR / "build_numeric.csv")
+
+
+def read_build_table(path: Path, registry: Optional[LevelRegistry] = None) -> BuildTable:
+    labels = (registry or load_level_registry(Path(path).parent)).fc_by_numerical
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = [
+            (r["Building"], labels[int(r["numerical"])], int(r["numerical"]), _number(r["Total"]))
+            for r in csv.DictReader(f) if int(r["numerical"]) in labels
+        ]
+    return build_table_from_rows(rows)
+
+
+def load_labeled_build_table(path: Optional[Path] = None, encoding: str = "cp949") -> BuildTable:
+    """level 열이 포함된 CSV (예: data/build_time_clean.csv)."""
+    if path is None and encoding == "cp949" and (snapshot := _snapshot()) is not None:
+        return snapshot.build_table("labeled_build")
+    return _from_csv(read_labeled_build_table, path or DATA_DIR / "build_time_clean.csv", encoding)
+
+
+def read_labeled_build_table(path: Path, encoding: str = "cp949") -> BuildTable:
+    with open(path, newline="", encoding=encoding) as f:
+        rows = [
+            (r["Building"], r["level"], int(r["numerical"]), _number(r["Total"]))
+            for r in csv.DictReader(f)
+        ]
+    return build_table_from_rows(rows)
+
+
+# 건설 시간 버프 (비율): 중상주의 (Double Time) 는 시간을 줄이고, VP 는 건설 속도에 더한다
+DOUBLE_TIME_BONUS = 0.2
+VP_BONUS = 0.1
+
+
+def adjusted_build_time(
+    total: float,
+    construction_speed: float,
+    double_time: bool = True,
+    vp: bool = True,
+    hyena: float = 0.0,
+) -> float:
+    """버프 적용 건설 시간 (속도/보너스는 비율, 예: 85% → 0.85)."""
+    boost_bonus = DOUBLE_TIME_BONUS if double_time else 0
+    vp_bonus = VP_BONUS if vp else 0
+    speed_total = 1 + construction_speed + vp_bonus + hyena
+    return (total / speed_total) * (1 - boost_bonus)
+
+
+def adjusted_build_time_grid(total: float, speeds, hyenas):
+    """adjusted_build_time 를 버프 격자 전체에 한 번에 (numpy, 결과: Double Time × VP × hyena × speed).
+
+    speeds, hyenas 는 비율 배열. 첫 두 축은 (켜짐, 꺼짐) 순서다.
+    """
+    import numpy as np
+
+    speeds = np.asarray(speeds, dtype=float)
+    hyenas = np.asarray(hyenas, dtype=float)
+    boost = np.array([DOUBLE_TIME_BONUS, 0.0])[:, None, None, None]
+    vp = np.array([VP_BONUS, 0.0])[None, :, None, None]
+    speed_total = 1 + speeds[None, None, None, :] + vp + hyenas[None, None, :, None]
+    return total / speed_total * (1 - boost)
+
+
+def secs_to_str(secs: float) -> str:
+    d = int(secs // 86400)
+    h = int((secs % 86400) // 3600)
+    m = int((secs % 3600) // 60)
+    s = int(secs % 60)
+    return f"{d}d {h}:{m:02}:{s:02}"
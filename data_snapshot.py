@@ -0,0 +1,274 @@
+"""data/*.csv → 바이너리 스냅샷 (data/snapshot.bin).
+
+형식 (네이티브 바이트 순서)
+  b"WOSSNAP1" | u32 매니페스트 길이 | 매니페스트 JSON | 0 패딩 (8 바이트 정렬) | int64 배열들
+  - 매니페스트: 원본 CSV 별 blake2b 체크섬, 문자열 표 (등급 / 패키지 키 / 레벨 라벨 / 레벨 서수표),
+    배열별 (offset, 길이). 등급·레벨은 문자열 표의 순번(정수 코드)으로 배열을 가리킨다.
+  - 배열: 등급별 누적 장비 자원, 패키지 × 자원 행렬, 건물별 numerical / Total / 누적 건설 시간.
+
+load() 는 파일을 읽기 전용 mmap 으로 열고 배열을 복사 없이 memoryview 로 꺼낸다.
+원본 CSV 의 체크섬이 매니페스트와 다르면 다시 컴파일한다. 같은 파일을 mmap 하는 워커
+프로세스들은 OS 페이지 캐시의 한 사본을 함께 읽는다. 데이터 폴더에 쓸 수 없으면 (읽기 전용 배포)
+파일 대신 프로세스 메모리에 같은 스냅샷을 만든다 — 교체도 같은 경로라 핫 리로드가 그대로 동작한다.
+refresh() 는 원본이 바뀌었으면 새 스냅샷을 만들어 표까지 미리 꺼낸 뒤 현재 스냅샷을 한 번에
+바꾼다 (data_watch). 예전 스냅샷의 mmap 은 닫지 않으므로 이미 받아 간 표는 계속 쓸 수 있다.
+
+    python data_snapshot.py        # 강제로 다시 컴파일
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import calc_engine as engine
+
+MAGIC = b"WOSSNAP1"
+VERSION = 2
+SNAPSHOT_NAME = "snapshot.bin"
+
+# 스냅샷 이름 → 원본 CSV
+SOURCES: Dict[str, str] = {
+    "gear": "gear_data.csv",
+    "packages": "packages.csv",
+    "build": "build_numeric.csv",
+    "labeled_build": "build_time_clean.csv",
+}
+
+
+def checksum(path: Path) -> str:
+    return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+
+
+def _source_checksums(data_dir: Path) -> Dict[str, str]:
+    return {name: checksum(data_dir / name) for name in SOURCES.values()}
+
+
+# --- 컴파일 ---
+
+class _Writer:
+    """int64 배열을 이어 붙이며 매니페스트용 (offset, 길이) 를 기록한다."""
+
+    def __init__(self):
+        self.arrays: Dict[str, Tuple[int, int]] = {}
+        self._chunks: List[bytes] = []
+        self._offset = 0
+
+    def add(self, name: str, values) -> None:
+        data = array("q", values).tobytes()
+        self.arrays[name] = (self._offset, len(data) // 8)
+        self._chunks.append(data)
+        self._offset += len(data)
+
+    def payload(self) -> bytes:
+        return b"".join(self._chunks)
+
+
+def _add_build_table(writer: _Writer, prefix: str, table: engine.BuildTable) -> Dict[str, List[str]]:
+    labels = {}
+    for b, levels in table.levels.items():
+        labels[b] = list(levels)
+        # levels[b][i] 는 i 번째로 작은 numerical 의 라벨 (CSV 에 같은 라벨이 두 번 나오는 건물도 있다)
+        nums = sorted(table.totals[b])
+        writer.add(f"{prefix}/{b}/numerical", nums)
+        writer.add(f"{prefix}/{b}/total", [int(table.totals[b][n]) for n in nums])
+        writer.add(f"{prefix}/{b}/cumulative", [int(v) for v in table.cumulative[b]])
+    return labels
+
+
+def compile_snapshot(data_dir: Path = engine.DATA_DIR, out: Optional[Path] = None) -> Path:
+    """원본 CSV 를 읽어 스냅샷을 쓴다 (임시 파일에 쓴 뒤 os.replace 로 교체)."""
+    data_dir = Path(data_dir)
+    return _write(compile_bytes(data_dir), Path(out or data_dir / SNAPSHOT_NAME))
+
+
+def compile_bytes(data_dir: Path = engine.DATA_DIR) -> bytes:
+    """원본 CSV → 스냅샷 파일 내용."""
+    data_dir = Path(data_dir)
+    # 경로별 캐시를 거치지 않고 매번 CSV 를 새로 읽는다
+    registry = engine.read_level_registry(data_dir)
+    gear = engine.read_gear_table(data_dir / SOURCES["gear"])
+    packages = engine.read_packages(data_dir / SOURCES["packages"])
+    build = engine.read_build_table(data_dir / SOURCES["build"], registry)
+    labeled = engine.read_labeled_build_table(data_dir / SOURCES["labeled_build"])
+
+    writer = _Writer()
+    writer.add("gear/cumulative", [v for row in gear.cumulative for v in row])
+    writer.add("packages/rows", [v for row in packages.rows for v in row])
+    manifest = {
+        "version": VERSION,
+        "byteorder": sys.byteorder,
+        "sources": _source_checksums(data_dir),
+        "gear": {"levels": list(gear.levels)},
+        "packages": {"keys": list(packages.keys)},
+        "build": _add_build_table(writer, "build", build),
+        "labeled_build": _add_build_table(writer, "labeled_build", labeled),
+        "levels": {"gear": list(registry.gear), "fc": list(registry.fc), "fc_numerical": list(registry.fc_numerical)},
+    }
+    manifest["arrays"] = writer.arrays
+    header = json.dumps(manifest, ensure_ascii=False).encode("utf-8")
+    padding = -(len(MAGIC) + 4 + len(header)) % 8
+    return MAGIC + struct.pack("<I", len(header)) + header + b"\0" * padding + writer.payload()
+
+
+def _write(data: bytes, out: Path) -> Path:
+    import tempfile
+
+    fd, tmp = tempfile.mkstemp(dir=out.parent, prefix=".snapshot-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, out)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return out
+
+
+# --- 읽기 ---
+
+class Snapshot:
+    """mmap 한 스냅샷. 배열은 memoryview 라 engine 테이블들도 복사 없이 같은 메모리를 가리킨다."""
+
+    def __init__(self, path: Path, data: Optional[bytes] = None):
+        """path 를 mmap 한다. data 를 주면 파일 대신 그 바이트를 쓴다 (쓸 수 없는 폴더 — 프로세스 메모리에만)."""
+        if data is None:
+            with open(path, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mm = data
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path}: 스냅샷 형식이 아닙니다")
+        (size,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.manifest = json.loads(bytes(self._mm[start:start + size]).decode("utf-8"))
+        base = start + size + (-(start + size) % 8)
+        self._data = memoryview(self._mm)[base:].cast("q")
+        # 꺼낸 표는 스냅샷마다 한 번만 만든다 (같은 스냅샷 = 같은 표 객체)
+        self._tables: Dict[str, object] = {}
+
+    def array(self, name: str) -> memoryview:
+        offset, length = self.manifest["arrays"][name]
+        return self._data[offset // 8:offset // 8 + length]
+
+    def _rows(self, name: str, width: int) -> Tuple[memoryview, ...]:
+        flat = self.array(name)
+        return tuple(flat[i:i + width] for i in range(0, len(flat), width))
+
+    def _memo(self, name: str, build):
+        table = self._tables.get(name)
+        if table is None:
+            table = self._tables.setdefault(name, build())
+        return table
+
+    def warm(self) -> "Snapshot":
+        """표를 모두 미리 꺼낸다 (바꿔 끼우기 전에 — 교체 직후 첫 실행이 만들지 않도록)."""
+        self.gear_table(), self.packages(), self.level_registry()
+        self.build_table("build"), self.build_table("labeled_build")
+        return self
+
+    def gear_table(self) -> engine.GearTable:
+        return self._memo("gear", self._gear_table)
+
+    def packages(self) -> engine.PackageMatrix:
+        return self._memo("packages", self._packages)
+
+    def level_registry(self) -> engine.LevelRegistry:
+        return self._memo("levels", self._level_registry)
+
+    def build_table(self, name: str = "build") -> engine.BuildTable:
+        """name: "build" (build_numeric.csv) 또는 "labeled_build" (build_time_clean.csv)."""
+        return self._memo(name, lambda: self._build_table(name))
+
+    def _gear_table(self) -> engine.GearTable:
+        levels = tuple(self.manifest["gear"]["levels"])
+        cumulative = self._rows("gear/cumulative", len(engine.GEAR_RESOURCES))
+        return engine.GearTable(levels, {lv: i for i, lv in enumerate(levels)}, cumulative)
+
+    def _packages(self) -> engine.PackageMatrix:
+        keys = tuple(self.manifest["packages"]["keys"])
+        rows = self._rows("packages/rows", len(engine.GEAR_RESOURCES))
+        return engine.PackageMatrix(keys, {k: i for i, k in enumerate(keys)}, rows)
+
+    def _level_registry(self) -> engine.LevelRegistry:
+        levels = self.manifest["levels"]
+        return engine.level_registry_from_rows(levels["gear"], zip(levels["fc"], levels["fc_numerical"]))
+
+    def _build_table(self, name: str) -> engine.BuildTable:
+        levels, level_to_num, totals, cumulative = {}, {}, {}, {}
+        for b, labels in self.manifest[name].items():
+            nums = self.array(f"{name}/{b}/numerical")
+            levels[b] = tuple(labels)
+            level_to_num[b] = dict(zip(labels, nums))
+            totals[b] = dict(zip(nums, self.array(f"{name}/{b}/total")))
+            cumulative[b] = self.array(f"{name}/{b}/cumulative")
+        return engine.BuildTable(levels, level_to_num, totals, cumulative)
+
+
+def is_current(snapshot: Snapshot, data_dir: Path) -> bool:
+    m = snapshot.manifest
+    return (
+        m.get("version") == VERSION
+        and m.get("byteorder") == sys.byteorder
+        and m.get("sources") == _source_checksums(data_dir)
+    )
+
+
+def _open(data_dir: Path) -> Snapshot:
+    path = data_dir / SNAPSHOT_NAME
+    try:
+        snapshot = Snapshot(path)
+        if is_current(snapshot, data_dir):
+            return snapshot
+    except (OSError, ValueError, struct.error):
+        pass
+    data = compile_bytes(data_dir)  # CSV 를 읽지 못하면 그대로 올린다
+    try:
+        return Snapshot(_write(data, path))
+    except OSError:
+        # 읽기 전용 데이터 폴더: 파일 없이 이 프로세스 메모리의 스냅샷을 쓴다 (교체도 같은 방식)
+        return Snapshot(path, data)
+
+
+# 폴더 → 현재 스냅샷 (교체는 참조 하나를 바꾸는 것이라 읽는 쪽은 잠그지 않는다)
+_current: Dict[Path, Snapshot] = {}
+_lock = threading.Lock()
+
+
+def load(data_dir: Path = engine.DATA_DIR) -> Snapshot:
+    """현재 스냅샷. 처음이면 연다 — 없거나, 깨졌거나, 원본 CSV 가 바뀌었으면 다시 컴파일한다."""
+    data_dir = Path(data_dir)
+    snapshot = _current.get(data_dir)
+    if snapshot is None:
+        with _lock:
+            snapshot = _current.get(data_dir)
+            if snapshot is None:
+                snapshot = _current[data_dir] = _open(data_dir)
+    return snapshot
+
+
+def refresh(data_dir: Path = engine.DATA_DIR) -> Optional[Snapshot]:
+    """원본 CSV 가 바뀌었으면 새 스냅샷으로 바꾸고 돌려준다 (그대로면 None).
+
+    새 스냅샷은 표까지 다 만든 뒤에 끼우므로, 읽는 쪽은 예전 것 아니면 완성된 새 것만 본다.
+    CSV 가 깨졌으면 예외를 그대로 올리고 현재 스냅샷은 바꾸지 않는다.
+    """
+    data_dir = Path(data_dir)
+    with _lock:
+        old = _current.get(data_dir)
+        if old is not None and is_current(old, data_dir):
+            return None
+        new = _open(data_dir).warm()
+        _current[data_dir] = new
+        return new
+
+
+if __name__ == "__main__":
+    path = compile_snapshot()
+    print(f"{path} ({path.stat().st_size:,} bytes)")
@@ -0,0 +1,194 @@
+"""데이터 파일이 바뀌면 프로세스를 재시작하지 않고 표를 바꿔 끼운다.
+
+    import data_watch
+    data_watch.start()                 # 프로세스당 스레드 하나 (여러 번 불러도 같음)
+    data_watch.on_swap(cache.clear)    # 교체 뒤 따로 비울 것이 있으면
+
+  - 감시: WATCHED (data_snapshot.SOURCES 의 CSV + build_prereqs.csv) 를 interval 초마다 os.stat 으로만 본다
+    (기본 5초, 환경 변수 WOS_DATA_POLL). 바뀌면 다음 확인에서도 그대로일 때 (저장이 끝난 뒤) 다시 만든다.
+  - 교체: data_snapshot.refresh 가 새 스냅샷을 컴파일하고 표를 모두 꺼낸 다음 참조 하나만 바꾼다.
+    실행(rerun) 은 시작할 때 받아 간 표를 끝까지 쓰고, 다음 실행부터 새 표를 본다.
+  - 교체 뒤 (스냅샷 밖의 build_prereqs.csv 만 바뀐 때도) 표를 키로 쓰는 메모 (engine.clear_table_caches),
+    result_cache 의 공유 캐시, on_swap 콜백을 차례로 비운다 — 예전 표가 캐시에 남지 않는다.
+  - 새 CSV 를 읽다 실패하면 (편집 중 등) 예전 표를 유지하고 경고만 남긴 뒤 다음 변경을 기다린다.
+  - 표를 바꿀 때 .streamlit/secrets.toml 의 [gear_data] csv 가 data/gear_data.csv 와 다르면 경고한다
+    (프로세스를 띄울 때마다 경고하지는 않는다 — 지금 상태는 --check 로).
+
+    python data_watch.py --check          # 지금 한 번 확인 (secrets 차이 포함)
+    python data_watch.py --sync-secrets   # secrets.toml 의 [gear_data] 를 data/gear_data.csv 로 맞춘다
+"""
+
+import argparse
+import csv
+import io
+import logging
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import calc_engine as engine
+import data_snapshot
+import result_cache
+
+log = logging.getLogger("data_watch")
+
+SECRETS_PATH = Path(__file__).resolve().parent / ".streamlit" / "secrets.toml"
+
+_callbacks: List[Callable[[], None]] = []
+_watcher: Optional["DataWatcher"] = None
+_watcher_lock = threading.Lock()
+
+
+def on_swap(callback: Callable[[], None]) -> None:
+    """표를 바꿔 끼운 뒤 부를 함수 (예: 직접 만든 ResultCache.clear)."""
+    if callback not in _callbacks:
+        _callbacks.append(callback)
+
+
+# 감시하는 파일: 스냅샷 원본 + 스냅샷에 넣지 않는 선행 조건 표 (build_prereqs)
+WATCHED: Tuple[str, ...] = (*data_snapshot.SOURCES.values(), "build_prereqs.csv")
+
+
+def _stat(data_dir: Path) -> Dict[str, Tuple[int, int]]:
+    out = {}
+    for name in WATCHED:
+        try:
+            st = os.stat(data_dir / name)
+            out[name] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            out[name] = (0, 0)
+    return out
+
+
+def swap_if_changed(data_dir: Path = engine.DATA_DIR, changed: Iterable[str] = ()) -> bool:
+    """원본이 바뀌었으면 새 표로 바꾸고 캐시를 비운다. 바꿨으면 True.
+
+    changed: 바뀐 파일 이름 (DataWatcher 가 넘긴다) — 스냅샷 밖의 파일이 있으면 스냅샷이 그대로여도 비운다.
+    """
+    try:
+        snapshot = data_snapshot.refresh(data_dir)
+    except (OSError, ValueError, KeyError) as e:
+        log.warning("데이터 파일을 읽지 못해 예전 표를 유지합니다: %s", e)
+        return False
+    if snapshot is None and not set(changed) - set(data_snapshot.SOURCES.values()):
+        return False
+    engine.clear_table_caches()
+    result_cache.clear_all()
+    for callback in list(_callbacks):
+        callback()
+    log.info("데이터 표를 교체했습니다 (%s)", data_dir)
+    check_secrets(data_dir)
+    return True
+
+
+class DataWatcher(threading.Thread):
+    def __init__(self, data_dir: Path = engine.DATA_DIR, interval: float = 5.0):
+        super().__init__(name="data_watch", daemon=True)
+        self.data_dir = Path(data_dir)
+        self.interval = interval
+        self.swaps = 0
+        self._stop_event = threading.Event()
+        # 기준은 스레드가 돌기 전에 잡는다 (시작 직후의 변경도 놓치지 않도록)
+        self._seen = _stat(self.data_dir)
+
+    def run(self) -> None:
+        seen, pending = self._seen, None
+        while not self._stop_event.wait(self.interval):
+            now = _stat(self.data_dir)
+            if now == seen:
+                pending = None
+                continue
+            if now != pending:
+                # 저장 중일 수 있으니 다음 확인까지 그대로인지 본다
+                pending = now
+                continue
+            if swap_if_changed(self.data_dir, [name for name in now if now[name] != seen.get(name)]):
+                self.swaps += 1
+            seen, pending = now, None
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+def start(data_dir: Path = engine.DATA_DIR, interval: Optional[float] = None) -> DataWatcher:
+    """감시 스레드를 (처음 한 번만) 띄운다."""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None or not _watcher.is_alive():
+            interval = interval if interval is not None else float(os.environ.get("WOS_DATA_POLL", 5))
+            _watcher = DataWatcher(data_dir, interval)
+            _watcher.start()
+        return _watcher
+
+
+# --- .streamlit/secrets.toml 의 [gear_data] 사본 ---
+
+_SECRETS_CSV = re.compile(r'(\[gear_data\][^\[]*?csv\s*=\s*""")(.*?)(""")', re.S)
+
+
+def secrets_drift(data_dir: Path = engine.DATA_DIR, path: Path = SECRETS_PATH) -> List[str]:
+    """secrets.toml 의 gear_data 와 data/gear_data.csv 가 다른 등급 (사본이 없으면 빈 목록)."""
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError:
+        return []
+    match = _SECRETS_CSV.search(text)
+    if not match:
+        return []
+    copy = {r["Level"]: r for r in csv.DictReader(io.StringIO(match.group(2).strip()))}
+    with open(data_dir / "gear_data.csv", newline="", encoding="utf-8") as f:
+        source = {r["Level"]: r for r in csv.DictReader(f)}
+    return [lv for lv in dict.fromkeys([*source, *copy]) if source.get(lv) != copy.get(lv)]
+
+
+def check_secrets(data_dir: Path = engine.DATA_DIR) -> None:
+    try:
+        drift = secrets_drift(data_dir)
+    except (OSError, KeyError, csv.Error):
+        return
+    if drift:
+        log.warning(
+            "secrets.toml 의 [gear_data] 가 data/gear_data.csv 와 다릅니다 (%s). "
+            "python data_watch.py --sync-secrets 로 맞추세요.", ", ".join(drift[:5]) + (" ..." if len(drift) > 5 else "")
+        )
+
+
+def sync_secrets(data_dir: Path = engine.DATA_DIR, path: Path = SECRETS_PATH) -> bool:
+    """secrets.toml 의 [gear_data] csv 를 data/gear_data.csv 내용으로 바꾼다. 바꿨으면 True."""
+    text = path.read_text(encoding="utf-8")
+    match = _SECRETS_CSV.search(text)
+    if not match:
+        raise ValueError(f"{path}: [gear_data] csv 가 없습니다")
+    source = (data_dir / "gear_data.csv").read_text(encoding="utf-8").strip()
+    if match.group(2).strip() == source:
+        return False
+    path.write_text(text[:match.start(2)] + source + "\n" + text[match.end(2):], encoding="utf-8")
+    return True
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="데이터 파일 변경 확인 / secrets 동기화")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--check", action="store_true", help="스냅샷이 최신인지와 secrets 차이를 확인 (바꾸지 않음)")
+    group.add_argument("--sync-secrets", action="store_true")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    if args.sync_secrets:
+        print("updated" if sync_secrets() else "already in sync")
+        return 0
+    try:
+        current = data_snapshot.is_current(data_snapshot.Snapshot(engine.DATA_DIR / data_snapshot.SNAPSHOT_NAME), engine.DATA_DIR)
+    except (OSError, ValueError):
+        current = False
+    print("snapshot up to date" if current else "snapshot stale (rebuilt on next load)")
+    drift = secrets_drift()
+    print(f"secrets.toml [gear_data]: {'differs at ' + ', '.join(drift) if drift else 'in sync'}")
+    return 1 if drift else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,149 +1,166 @@
 import streamlit as st
-import pandas as pd
-
-# CSV 데이터 로딩
-gear_df = pd.read_csv("data/gear_data.csv")
-gear_levels = gear_df["Level"].tolist()
-packages_df = pd.read_csv("data/packages.csv")
-
-# 기어 자원 사전 생성
-resource_dict = {
-    row["Level"]: {
-        "Alloy": row["Alloy"],
-        "Polish": row["Polish"],
-        "Design": row["Design"],
-        "Amber": row["Amber"]
-    } for _, row in gear_df.iterrows()
-}
-
-# 등급 한국어 매핑
-level_labels = {
-    "Green": "고급", "Green 1*": "고급 1성",
-    "Blue": "레어", "Blue 1*": "레어 1성", "Blue 2*": "레어 2성", "Blue 3*": "레어 3성",
-    "Purple": "에픽", "Purple 1*": "에픽 1성", "Purple 2*": "에픽 2성", "Purple 3*": "에픽 3성",
-    "Purple T1": "에픽 T1", "Purple T1 1*": "에픽 T1 1성", "Purple T1 2*": "에픽 T1 2성", "Purple T1 3*": "에픽 T1 3성",
-    "Gold": "레전드", "Gold 1*": "레전드 1성", "Gold 2*": "레전드 2성", "Gold 3*": "레전드 3성",
-    "Gold T1": "레전드 T1", "Gold T1 1*": "레전드 T1 1성", "Gold T1 2*": "레전드 T1 2성", "Gold T1 3*": "레전드 T1 3성",
-    "Gold T2": "레전드 T2", "Gold T2 1*": "레전드 T2 1성", "Gold T2 2*": "레전드 T2 2성", "Gold T2 3*": "레전드 T2 3성",
-    "Legendary": "신화", "Legendary 1*": "신화 1성", "Legendary 2*": "신화 2성", "Legendary 3*": "신화 3성",
-    "Legendary T1": "신화 T1", "Legendary T1 1*": "신화 T1 1성", "Legendary T1 2*": "신화 T1 2성", "Legendary T1 3*": "신화 T1 3성",
-    "Legendary T2": "신화 T2", "Legendary T2 1*": "신화 T2 1성", "Legendary T2 2*": "신화 T2 2성", "Legendary T2 3*": "신화 T2 3성",
-    "Legendary T3": "신화 T3", "Legendary T3 1*": "신화 T3 1성", "Legendary T3 2*": "신화 T3 2성", "Legendary T3 3*": "신화 T3 3성",
-}
-
-# 병종별 부위 매핑
-gear_groups = {
-    "방패병": ["Coat", "Pants"],
-    "궁병": ["Ring", "Cudgel"],
-    "창병": ["Hat", "Watch"]
-}
-
-gear_parts_kor = {
-    "Hat": "모자",
-    "Coat": "상의",
-    "Ring": "반지",
-    "Watch": "시계",
-    "Pants": "하의",
-    "Cudgel": "지팡이"
-}
+
+import calc_engine as engine
+import data_watch
+import perf_debug
+import result_cache
+import ui_labels
+from gear_reach import max_reachable
+
+# 🐞 구간별 시간 측정 (WOS_DEBUG=1 또는 ?debug=1 일 때만)
+prof = perf_debug.start("gear_calc")
+
+# 데이터 로딩 (현재 표를 실행마다 한 번 받아 끝까지 쓴다 — 데이터 파일이 바뀌면 data_watch 가 교체)
+data_watch.start()
+gear_table = engine.load_gear_table()
+packages = engine.load_packages()
+gear_levels = gear_table.levels
+level_index = gear_table.index
+prof.mark("load")
+
+# 등급 / 부위 / 병종 한국어 이름표 (프로세스 공용, 읽기 전용)
+level_labels = ui_labels.GEAR_LEVELS_KO
+gear_groups = ui_labels.GEAR_GROUPS_KO
+gear_parts_kor = ui_labels.GEAR_PARTS_KO
 
 st.title("영주 장비 자원 계산기")
 
-user_inputs = {}
-st.subheader("각 부위의 현재 / 목표 등급")
-
-for unit_type, parts in gear_groups.items():
-    st.markdown(f"#### {unit_type}")
-    for part in parts:
-        part_label = gear_parts_kor[part]
-        cols = st.columns(2)
-        with cols[0]:
-            cur = st.selectbox(
-                f"{part_label} - 현재 등급",
-                options=gear_levels,
-                index=gear_levels.index("Gold"),
-                key=f"{part}_cur",
-                format_func=lambda x: level_labels.get(x, x)
-            )
-        with cols[1]:
-            tar = st.selectbox(
-                f"{part_label} - 목표 등급",
-                options=gear_levels,
-                index=gear_levels.index("Gold"),
-                key=f"{part}_tar",
-                format_func=lambda x: level_labels.get(x, x)
-            )
-        user_inputs[part_label] = (cur, tar)
+# 🔗 공유 링크(?plan=...)로 열면 그 계획으로 입력을 채우고 바로 계산한다 (세션당 처음 한 번만 읽음)
+result_store = result_cache.shared("gear_calc", maxsize=512, ttl=6 * 3600)
+if "shared_plan" not in st.session_state:
+    # 잘리거나 손으로 고친 링크도 있으니 표에 있는 등급 / 자원 / 패키지와 0 이상 수량만 받는다
+    package_keys = [f"{name}_{price}" for name in (*ui_labels.ARTISAN_TYPES, "DawnMarket") for price in ui_labels.PACKAGE_PRICES]
+    shared_plan = result_cache.sanitize_plan(result_cache.decode_plan(st.query_params.get("plan", "")), {
+        "gear": result_cache.record({part: result_cache.pair(gear_levels) for part in engine.GEAR_PARTS}),
+        "owned": result_cache.record({k: result_cache.count for k in engine.GEAR_RESOURCES}),
+        "packages": result_cache.record({k: result_cache.count for k in package_keys}),
+    })
+    st.session_state["shared_plan"] = shared_plan
+    st.session_state["auto_submit"] = bool(shared_plan)
+shared_plan = st.session_state["shared_plan"]
+
+
+def shared_index(part, which):
+    level = shared_plan.get("gear", {}).get(part, [None, None])[which]
+    return level_index.get(level, level_index["Gold"])
+
+# 🧩 입력 영역은 fragment 로 나눠, 위젯을 바꾸면 그 영역만 다시 실행된다.
+# session_state 에는 영역마다 입력(부위별 등급 / 보유량 / 패키지 수량)만 두고, 비용·패키지 자원은
+# 필요할 때 calc_engine 의 메모이즈 (프로세스 공용) 에서 꺼내 합친다 — 세션당 메모리는 입력 크기만큼.
+
+
+@st.fragment
+def gear_inputs():
+    st.subheader("각 부위의 현재 / 목표 등급")
+    levels = {}
+    for unit_type, parts in gear_groups.items():
+        st.markdown(f"#### {unit_type}")
+        for part in parts:
+            part_label = gear_parts_kor[part]
+            cols = st.columns(2)
+            with cols[0]:
+                cur = st.selectbox(
+                    f"{part_label} - 현재 등급",
+                    options=gear_levels,
+                    index=shared_index(part, 0),
+                    key=f"{part}_cur",
+                    format_func=ui_labels.gear_level_ko
+                )
+            with cols[1]:
+                tar = st.selectbox(
+                    f"{part_label} - 목표 등급",
+                    options=gear_levels,
+                    index=shared_index(part, 1),
+                    key=f"{part}_tar",
+                    format_func=ui_labels.gear_level_ko
+                )
+            levels[part] = (cur, tar)
+    st.session_state["gear_plan"] = levels
+
+
+@st.fragment
+def owned_inputs():
+    st.markdown("---")
+    st.subheader("보유 자원 입력")
+    res_cols = st.columns(4)
+    owned = shared_plan.get("owned", {})
+    st.session_state["owned"] = {
+        "Design": res_cols[0].number_input("설계도면", min_value=0, value=int(owned.get("Design", 0))),
+        "Alloy": res_cols[1].number_input("합금", min_value=0, value=int(owned.get("Alloy", 0))),
+        "Polish": res_cols[2].number_input("윤활제", min_value=0, value=int(owned.get("Polish", 0))),
+        "Amber": res_cols[3].number_input("앰버", min_value=0, value=int(owned.get("Amber", 0))),
+    }
 
-st.markdown("---")
-st.subheader("보유 자원 입력")
-res_cols = st.columns(4)
-user_owned = {
-    "Design": res_cols[0].number_input("설계도면", min_value=0, value=0),
-    "Alloy": res_cols[1].number_input("합금", min_value=0, value=0),
-    "Polish": res_cols[2].number_input("윤활제", min_value=0, value=0),
-    "Amber": res_cols[3].number_input("앰버", min_value=0, value=0),
-}
 
 # 패키지 관련 전역 변수
-price_list = ["$5", "$10", "$20", "$50", "$100"]
-price_kor = {"$5": "7,500원", "$10": "15,000원", "$20": "30,000원", "$50": "79,000원", "$100": "149,000원"}
-artisan_types = ["Sublime", "Exquisite", "Classic"]
-package_counts = {}
-package_resources = {"Design": 0, "Alloy": 0, "Polish": 0, "Amber": 0, "Plans": 0, "DesignPlans": 0}
-
-# ✅ 패키지 수량 입력만 (상세보기 제거됨)
-with st.expander("선택사항: 패키지 구매 입력", expanded=False):
-    st.caption("⚠️ PACKAGES 데이터는 업데이트가 필요한 예시입니다. 실제 구매 구성을 확인해 주세요!")
-    st.markdown("### 📦 장인 패키지")
-    for artisan in artisan_types:
-        st.markdown(f"**{artisan}**")
-        cols = st.columns(len(price_list))
+price_list = ui_labels.PACKAGE_PRICES
+price_kor = ui_labels.PACKAGE_PRICES_KRW
+artisan_types = ui_labels.ARTISAN_TYPES
+
+
+@st.fragment
+def package_inputs():
+    package_counts = {}
+    shared_counts = shared_plan.get("packages", {})
+    # ✅ 패키지 수량 입력만 (상세보기 제거됨)
+    with st.expander("선택사항: 패키지 구매 입력", expanded=False):
+        st.caption("⚠️ PACKAGES 데이터는 업데이트가 필요한 예시입니다. 실제 구매 구성을 확인해 주세요!")
+        st.caption("📐 패키지의 설계도면(DesignPlans)은 보유 설계도면에 더해 부족량을 계산합니다.")
+        st.markdown("### 📦 장인 패키지")
+        for artisan in artisan_types:
+            st.markdown(f"**{artisan}**")
+            cols = st.columns(len(price_list))
+            for i, price in enumerate(price_list):
+                key = f"{artisan}_{price}"
+                label = f"{price} ({price_kor[price]})"
+                count = cols[i].number_input(
+                    label=label, min_value=0, value=int(shared_counts.get(key, 0)), step=1, key=key
+                )
+                package_counts[key] = count
+
+        st.markdown("### 🌙 새벽시장")
+        dawn_cols = st.columns(len(price_list))
         for i, price in enumerate(price_list):
-            key = f"{artisan}_{price}"
+            key = f"DawnMarket_{price}"
             label = f"{price} ({price_kor[price]})"
-            count = cols[i].number_input(label=label, min_value=0, value=0, step=1, key=key)
+            count = dawn_cols[i].number_input(
+                label=label, min_value=0, value=int(shared_counts.get(key, 0)), step=1, key=key
+            )
             package_counts[key] = count
+    st.session_state["package_counts"] = {k: c for k, c in package_counts.items() if c > 0}
 
-    st.markdown("### 🌙 새벽시장")
-    dawn_cols = st.columns(len(price_list))
-    for i, price in enumerate(price_list):
-        key = f"DawnMarket_{price}"
-        label = f"{price} ({price_kor[price]})"
-        count = dawn_cols[i].number_input(label=label, min_value=0, value=0, step=1, key=key)
-        package_counts[key] = count
-
-# 패키지 자원 계산
-for key, count in package_counts.items():
-    if count > 0:
-        category, price = key.split("_")
-        pkg_rows = packages_df[(packages_df["Category"] == category) & (packages_df["Package"] == price)]
-        for _, row in pkg_rows.iterrows():
-            res = row["Resource"]
-            if res not in package_resources:
-                package_resources[res] = 0
-            package_resources[res] += row["Amount"] * count
-
-# 총 보유 자원 계산
-total_owned = {
-    k: user_owned.get(k, 0) + package_resources.get(k, 0)
-    for k in user_owned
-}
-
-if st.button("부족 자원 계산"):
-    total_needed = {k: 0 for k in user_owned}
-
-    for part, (cur, tar) in user_inputs.items():
-        i1 = gear_levels.index(cur)
-        i2 = gear_levels.index(tar)
-        if i1 >= i2:
-            continue
-        for level in gear_levels[i1+1:i2+1]:
-            for k in total_needed:
-                total_needed[k] += resource_dict.get(level, {}).get(k, 0)
 
-    st.markdown("---")
-    st.subheader("자원 요약")
+def needed_resources():
+    """부위별 필요 자원 합."""
+    return engine.sum_resources(
+        engine.part_cost(cur, tar, gear_table) for cur, tar in st.session_state["gear_plan"].values()
+    )
+
+
+def package_resources():
+    """구매한 패키지 자원 합 (DesignPlans 는 설계도면으로 합산)."""
+    return engine.sum_resources(
+        engine.package_contribution(key, count, packages) for key, count in st.session_state["package_counts"].items()
+    )
+
+
+gear_inputs()
+prof.mark("gear_widgets")
+owned_inputs()
+package_inputs()
+prof.mark("package_widgets")
+
+
+def compute_result():
+    """(자원 요약 행, 최저가 패키지 조합 또는 None) — 세션 간 캐시 대상."""
+    # 총 필요 / 보유 자원 (각 fragment 가 남긴 입력으로)
+    total_needed = needed_resources()
+    user_owned = st.session_state["owned"]
+    from_packages = package_resources()
+    total_owned = {
+        k: user_owned.get(k, 0) + from_packages.get(k, 0)
+        for k in user_owned
+    }
 
     result_data = []
     for k in user_owned:
@@ -154,8 +171,177 @@ if st.button("부족 자원 계산"):
             "부족량": max(0, total_needed[k] - total_owned.get(k, 0))
         })
 
-    result_df = pd.DataFrame(result_data)
+    # 💰 부족량을 채우는 최저가 패키지 조합 (원화 기준)
+    deficit = {row["자원"]: row["부족량"] for row in result_data}
+    plan = None
+    if any(deficit[k] > 0 for k in ("Design", "Alloy", "Polish")):
+        # numpy 를 쓰는 최적화기는 처음 필요할 때 import
+        from package_optimizer import cheapest_packages
+
+        plan = cheapest_packages(deficit, currency="krw", packages=packages)
+    return result_data, plan
+
+
+if st.button("부족 자원 계산") or st.session_state.pop("auto_submit", False):
+    # 🔗 정규화한 입력 = 캐시 키 = 공유 링크
+    plan_key = result_cache.encode_plan({
+        "gear": st.session_state["gear_plan"],
+        "owned": st.session_state["owned"],
+        "packages": st.session_state["package_counts"],
+    })
+    st.query_params["plan"] = plan_key
+    result_data, plan = result_store.get_or_compute(plan_key, compute_result)
+    prof.note("cache", result_store.stats())
+    prof.mark("calculate")
+
+    st.markdown("---")
+    st.subheader("자원 요약")
+
+    # pandas 는 표를 그릴 때만 읽는다 (perf_debug.dataframe, 시작 시간 단축 — 디버그 패널의 구간별 생성 횟수에 잡힌다)
+    result_df = perf_debug.dataframe(result_data)
     st.dataframe(result_df, use_container_width=True)
+    prof.mark("summary")
+
+    if plan is not None:
+        with st.expander("💰 부족량을 채우는 최저가 패키지 조합", expanded=False):
+            plan_df = perf_debug.dataframe([
+                {"패키지": key, "수량": count, "금액": f"{engine.package_price(key, 'krw') * count:,}원"}
+                for key, count in plan.counts.items()
+            ])
+            st.dataframe(plan_df, use_container_width=True)
+            st.markdown(f"**총 {plan.cost:,}원**")
+            if plan.uncovered:
+                st.caption("⚠️ 패키지로 얻을 수 없는 자원: " + ", ".join(f"{k} {v:,}" for k, v in plan.uncovered.items()))
+        prof.mark("optimizer")
+
+
+# 🎯 역방향: 보유 자원(패키지 포함)으로 부위별로 어디까지 올릴 수 있는지
+@st.fragment
+def reach_section():
+    with st.expander("🎯 보유 자원으로 갈 수 있는 최고 등급", expanded=False):
+        st.caption("현재 등급에서 보유 자원(패키지 포함)을 넘지 않게, 병종 가중치 × 올린 단계 수 합이 가장 큰 목표 등급을 찾습니다.")
+        cols = st.columns(len(gear_groups))
+        unit_weight = {
+            unit_type: cols[i].number_input(f"{unit_type} 가중치", min_value=1, max_value=5, value=1, key=f"reach_w_{unit_type}")
+            for i, unit_type in enumerate(gear_groups)
+        }
+        if not st.button("최고 등급 찾기", key="reach_run"):
+            return
+        owned = st.session_state["owned"]
+        from_packages = package_resources()
+        reach = max_reachable(
+            {part: cur for part, (cur, _) in st.session_state["gear_plan"].items()},
+            {k: owned.get(k, 0) + from_packages.get(k, 0) for k in owned},
+            weights={part: unit_weight[u] for u, parts in gear_groups.items() for part in parts},
+            table=gear_table,
+        )
+        st.dataframe(
+            [
+                {
+                    "부위": gear_parts_kor[part],
+                    "현재": level_labels.get(cur, cur),
+                    "도달 가능": level_labels.get(reach.targets[part], reach.targets[part]),
+                    "단계": reach.steps[part],
+                }
+                for part, (cur, _) in st.session_state["gear_plan"].items()
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+        st.caption("남는 자원: " + ", ".join(f"{k} {v:,}" for k, v in reach.leftover.items()))
+
+
+reach_section()
+
+
+# 🪜 현재 → 목표 등급 안에서 가중 자원 비용이 싼 단계부터 (생성기라 보여줄 만큼만 계산)
+@st.fragment
+def order_section():
+    with st.expander("🪜 업그레이드 추천 순서", expanded=False):
+        st.caption("모자란 자원일수록 비싸게 (가중치 = 1 / 보유량, 보유량이 없으면 1 / 전체 필요량) 쳐서, 단계당 비용이 가장 싼 부위부터 한 단계씩 보여 줍니다.")
+        count = st.number_input("보여줄 단계 수", min_value=1, max_value=300, value=20, key="order_count")
+        if not st.button("순서 보기", key="order_run"):
+            return
+        from itertools import islice
+
+        from gear_order import upgrade_order
+
+        plan = st.session_state["gear_plan"]
+        owned = st.session_state["owned"]
+        from_packages = package_resources()
+        steps = upgrade_order(
+            {part: cur for part, (cur, _) in plan.items()},
+            {part: tar for part, (_, tar) in plan.items()},
+            owned={k: owned.get(k, 0) + from_packages.get(k, 0) for k in owned},
+            table=gear_table,
+        )
+        names = {"Design": "설계도면", "Alloy": "합금", "Polish": "윤활제", "Amber": "앰버"}
+        rows = [
+            {
+                "순서": n,
+                "부위": gear_parts_kor[s.part],
+                "단계": f"{level_labels.get(s.level_from, s.level_from)} → {level_labels.get(s.level_to, s.level_to)}",
+                **{names[k]: v for k, v in zip(engine.GEAR_RESOURCES, s.cost)},
+                "보유량 안": "✅" if s.within_budget else "❌",
+            }
+            for n, s in enumerate(islice(steps, count), 1)
+        ]
+        if not rows:
+            st.info("목표 등급이 현재 등급보다 높은 부위가 없습니다.")
+            return
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+
+
+order_section()
+
+
+# 📅 부족량을 일일 수입 + 이벤트 드롭으로 채우기까지 (몬테카를로)
+@st.fragment
+def forecast_section():
+    with st.expander("📅 목표 도달 예상일", expanded=False):
+        st.caption("하루 수입과 이벤트 드롭(열릴 확률 · 평균 드롭, 드롭량은 매번 다름)으로 시나리오 2만 개를 돌려 부족량을 다 채우는 날을 추정합니다.")
+        names = {"Design": "설계도면", "Alloy": "합금", "Polish": "윤활제", "Amber": "앰버"}
+        st.markdown("**하루 수입**")
+        cols = st.columns(4)
+        daily = {k: cols[i].number_input(name, min_value=0, value=0, key=f"fc_daily_{k}") for i, (k, name) in enumerate(names.items())}
+        st.markdown("**이벤트 드롭**")
+        per_week = st.number_input("주당 이벤트 횟수", min_value=0.0, max_value=7.0, value=2.0, step=0.5, key="fc_events")
+        cols = st.columns(4)
+        drops = {k: cols[i].number_input(f"{name} (회당 평균)", min_value=0, value=0, key=f"fc_drop_{k}") for i, (k, name) in enumerate(names.items())}
+        if not st.button("예상일 계산", key="fc_run"):
+            return
+        from gear_forecast import EventDrop, Income, forecast
+
+        needed = needed_resources()
+        owned = st.session_state["owned"]
+        from_packages = package_resources()
+        deficit = {k: max(0, needed[k] - owned.get(k, 0) - from_packages.get(k, 0)) for k in names}
+        income = Income(daily, (EventDrop("이벤트", per_week / 7, drops),))
+        # 같은 입력이면 같은 답 (시드 고정)
+        fc = forecast(deficit, income, seed=0)
+        never = "도달 불가" if fc.no_income else f"{fc.horizon}일 넘음"
+        st.dataframe(
+            [
+                {
+                    "확률": f"{p}%",
+                    "일수": f"{fc.days[p]}일" if fc.days[p] is not None else never,
+                    "날짜": fc.date(p).isoformat() if fc.days[p] is not None else "-",
+                }
+                for p in fc.days
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+        if fc.no_income:
+            st.caption("⚠️ 수입이 없는 자원이 모자라 도달하지 못합니다: " + ", ".join(names[k] for k in fc.no_income))
+        elif fc.within < 1:
+            st.caption(f"⚠️ {fc.horizon}일 안에 끝나는 시나리오 {fc.within:.0%}")
+        if fc.bottleneck:
+            st.caption("마지막까지 모자란 자원: " + ", ".join(f"{names[k]} {v:.0%}" for k, v in sorted(fc.bottleneck.items(), key=lambda kv: -kv[1])))
+
+
+forecast_section()
 
 st.markdown("---")
 st.markdown("<div style='text-align:center; color: gray;'>🍋 Made with 💚 by <b>Lime</b></div>", unsafe_allow_html=True)
+prof.finish()
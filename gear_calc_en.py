@@ -1,39 +1,18 @@
 import streamlit as st
-import pandas as pd
-from io import StringIO
-
-# Load CSV data
-df = pd.read_csv("data/gear_data.csv")
-gear_levels = df["Level"].tolist()
 
-# Resource dictionary
-resource_dict = {
-    row["Level"]: {
-        "Alloy": row["Alloy"],
-        "Polish": row["Polish"],
-        "Design": row["Design"],
-        "Amber": row["Amber"]
-    } for _, row in df.iterrows()
-}
+import calc_engine as engine
+import data_watch
+import ui_labels
+from io import StringIO
 
-# English labels (optional)
-level_labels = {level: level for level in gear_levels}
+# Load data (current tables, taken once per run; data_watch swaps them when the CSVs change)
+data_watch.start()
+gear_table = engine.load_gear_table()
+gear_levels = gear_table.levels
+level_index = gear_table.index
 
-# Group gear parts by unit type
-gear_groups = {
-    "Infantry": ["Coat", "Pants"],
-    "Marksman": ["Ring", "Cudgel"],
-    "Lancer": ["Hat", "Watch"]
-}
-
-gear_parts_eng = {
-    "Hat": "Hat",
-    "Coat": "Coat",
-    "Ring": "Ring",
-    "Watch": "Watch",
-    "Pants": "Pants",
-    "Cudgel": "Cudgel"
-}
+# Group gear parts by unit type (shared, read-only)
+gear_groups = ui_labels.GEAR_GROUPS_EN
 
 st.title("Chief Gear Resource Calculator")
 
@@ -44,22 +23,20 @@ st.subheader("Current / Target Level for Each Gear")
 for unit_type, parts in gear_groups.items():
     st.markdown(f"#### {unit_type}")
     for part in parts:
-        part_label = gear_parts_eng[part]
+        part_label = part
         cols = st.columns(2)
         with cols[0]:
             cur = st.selectbox(
                 f"{part_label} - Current",
                 options=gear_levels,
-                format_func=lambda x: level_labels.get(x, x),
-                index=gear_levels.index("Gold"),
+                index=level_index["Gold"],
                 key=f"{part}_cur"
             )
         with cols[1]:
             tar = st.selectbox(
                 f"{part_label} - Target",
                 options=gear_levels,
-                format_func=lambda x: level_labels.get(x, x),
-                index=gear_levels.index("Gold"),
+                index=level_index["Gold"],
                 key=f"{part}_tar"
             )
         user_inputs[part_label] = (cur, tar)
@@ -75,16 +52,7 @@ user_owned = {
 }
 
 if st.button("Calculate Deficit"):
-    total_needed = {k: 0 for k in user_owned}
-
-    for part, (cur, tar) in user_inputs.items():
-        i1 = gear_levels.index(cur)
-        i2 = gear_levels.index(tar)
-        if i1 >= i2:
-            continue
-        for level in gear_levels[i1+1:i2+1]:
-            for k in total_needed:
-                total_needed[k] += resource_dict.get(level, {}).get(k, 0)
+    total_needed = engine.gear_needed(user_inputs.values(), gear_table)
 
     st.markdown("---")
     st.subheader("Resource Summary")
@@ -98,6 +66,8 @@ if st.button("Calculate Deficit"):
             "Deficit": max(0, total_needed[k] - user_owned.get(k, 0))
         })
 
+    import pandas as pd  # only when a table is rendered
+
     result_df = pd.DataFrame(result_data)
     st.dataframe(result_df, use_container_width=True)
 
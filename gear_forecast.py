@@ -0,0 +1,308 @@
+"""부족 자원을 일일 수입 + 이벤트 드롭으로 채우기까지 걸리는 날짜 예측 (몬테카를로).
+
+    from gear_forecast import Income, EventDrop, forecast
+    income = Income(daily={"Alloy": 20000, "Polish": 120, "Design": 4},
+                    events=(EventDrop("주간 이벤트", chance=2 / 7, drops={"Alloy": 60000, "Design": 20}),))
+    fc = forecast({"Design": 300, "Alloy": 1_200_000, "Polish": 5000, "Amber": 0}, income)
+    fc.days[50], fc.date(90), fc.bottleneck
+
+모델
+  - 매일 daily 만큼 고정 수입.
+  - 이벤트마다 하루에 chance 확률로 열리고, 열리면 drops × 행운 배수를 준다. 행운 배수는 평균 1,
+    변동계수 spread 인 감마 분포이며 한 번 열린 이벤트의 자원들에는 같은 배수를 쓴다.
+  - 완료일 = 네 자원이 모두 부족량 이상 모인 첫날 (1 = 내일 수입까지 받은 날).
+
+계산
+  - (일, 시나리오) 배열 하나로 수입을 만들고 일 축 누적합 → 부족량 이상인 첫 행(argmax). 일마다 도는
+    파이썬 반복은 없다 (반복은 이벤트 / 자원 / 시나리오 묶음 단위뿐).
+  - 기간은 기대 수입으로 끝나는 날의 3배 + 14일 (최대 MAX_DAYS). 그 안에 못 끝나는 시나리오는
+    완료일이 inf 이고 백분위가 그쪽에 걸리면 None.
+  - 모자란 자원 중 수입이 없는 것 (no_income) 이 있으면 기간과 상관없이 도달 불가다. 명단 출력에서는
+    unreachable = true 로 "기간 안에 못 끝남" (within_horizon 0) 과 구분한다.
+  - 배열 크기가 CELLS 를 넘지 않게 시나리오를 나눠 돌린다 (기간이 길어도 메모리 일정).
+
+연맹원 명단 (batch_deficit 와 같은 입력 + 선택 열 Design_daily ... Amber_daily)
+
+    python gear_forecast.py roster.csv --income income.json -o forecast.csv --scenarios 20000
+    python gear_forecast.py roster.csv --daily Alloy=20000 Polish=120 Design=4 --workers 4
+
+  income.json = {"daily": {"Alloy": 20000, ...},
+                 "events": [{"name": "...", "chance": 0.3, "drops": {"Alloy": 60000}, "spread": 0.5}]}
+"""
+
+import argparse
+import json
+import math
+import sys
+from dataclasses import dataclass, field, replace
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, TextIO, Tuple
+
+import calc_engine as engine
+from batch_deficit import member_deficit
+from roster_io import chunks, default_workers, detect_format, map_chunks, open_streams, read_profiles, write_rows
+
+PERCENTILES: Tuple[int, ...] = (10, 50, 90)
+MAX_DAYS = 3650
+# 한 번에 만드는 (일 × 시나리오) 배열의 최대 칸 수 (float64 8 바이트 → 32 MB)
+CELLS = 4_000_000
+# 이 크기 이상의 명단 파일은 프로세스 풀로 처리. 연맹원 1명 ≈ 200 바이트, 1명 계산 ≈ 0.65 초 (시나리오 2만 개,
+# 5천 개면 0.26 초), 풀 시작 ≈ 0.1 초 (fork) 라 10명 (≈ 2 KB) 이면 풀이 이긴다. 1명이 수 μs 인
+# batch_deficit 의 기준 (20 MB) 보다 훨씬 작다.
+POOL_THRESHOLD_BYTES = 2_000
+
+
+@dataclass(frozen=True)
+class EventDrop:
+    name: str
+    # 하루에 이 이벤트가 열릴 확률
+    chance: float
+    # 열렸을 때 평균 드롭 (자원별)
+    drops: Mapping[str, float] = field(default_factory=dict)
+    # 드롭량 변동계수 (0 이면 항상 평균)
+    spread: float = 0.5
+
+
+@dataclass(frozen=True)
+class Income:
+    daily: Mapping[str, float] = field(default_factory=dict)
+    events: Tuple[EventDrop, ...] = ()
+
+    def expected(self, resource: str) -> float:
+        """하루 평균 수입."""
+        return self.daily.get(resource, 0) + sum(e.chance * e.drops.get(resource, 0) for e in self.events)
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "Income":
+        events = tuple(
+            EventDrop(e.get("name", ""), float(e["chance"]), dict(e.get("drops", {})), float(e.get("spread", 0.5)))
+            for e in data.get("events", ())
+        )
+        return cls(dict(data.get("daily", {})), events)
+
+
+@dataclass
+class Forecast:
+    # 백분위 → 완료까지 일수 (기간 안에 못 끝나면 None)
+    days: Dict[int, Optional[int]]
+    start: date
+    horizon: int
+    # 기간 안에 끝나는 시나리오 비율
+    within: float
+    # 자원별로 마지막에 채워진 (완료일을 정한) 시나리오 비율
+    bottleneck: Dict[str, float]
+    scenarios: int
+    # 모자라지만 수입이 없는 자원 — 있으면 기간을 늘려도 끝나지 않는다 (도달 불가)
+    no_income: Tuple[str, ...] = ()
+
+    def date(self, percentile: int) -> Optional[date]:
+        d = self.days.get(percentile)
+        return None if d is None else self.start + timedelta(days=d)
+
+
+def _horizon(deficit: Mapping[str, float], income: Income, max_days: int) -> int:
+    days = 1
+    for r, need in deficit.items():
+        rate = income.expected(r)
+        if need > 0 and rate > 0:
+            days = max(days, math.ceil(need / rate))
+    return min(max_days, 3 * days + 14)
+
+
+def simulate(
+    deficit: Mapping[str, float],
+    income: Income,
+    scenarios: int = 20_000,
+    horizon: Optional[int] = None,
+    seed=None,
+):
+    """시나리오별 (완료일, 마지막에 채워진 자원 인덱스) 배열. 완료일은 float (못 끝나면 inf)."""
+    # numpy 는 예측할 때만 (앱 시작 시간 단축)
+    import numpy as np
+
+    resources = list(engine.GEAR_RESOURCES)
+    horizon = horizon or _horizon(deficit, income, MAX_DAYS)
+    rng = np.random.default_rng(seed)
+    finish = np.zeros(scenarios)
+    which = np.zeros(scenarios, dtype=np.int8)
+    active = [(i, r, float(deficit[r])) for i, r in enumerate(resources) if deficit.get(r, 0) > 0]
+
+    block = max(1, min(scenarios, CELLS // horizon))
+    for lo in range(0, scenarios, block):
+        n = min(block, scenarios - lo)
+        # 이벤트별 (일, 시나리오) 행운 배수 (닫힌 날은 0)
+        luck = []
+        for e in income.events:
+            if e.chance <= 0 or not any(e.drops.get(r, 0) for _, r, _ in active):
+                luck.append(None)
+                continue
+            f = rng.gamma(1 / e.spread ** 2, e.spread ** 2, (horizon, n)) if e.spread > 0 else np.ones((horizon, n))
+            f *= rng.random((horizon, n)) < e.chance
+            luck.append(f)
+
+        out, top = finish[lo:lo + n], which[lo:lo + n]
+        gain = np.empty((horizon, n))
+        for i, r, need in active:
+            gain.fill(income.daily.get(r, 0))
+            for e, f in zip(income.events, luck):
+                if f is not None and e.drops.get(r, 0):
+                    gain += f * e.drops[r]
+            np.cumsum(gain, axis=0, out=gain)
+            # 수입은 음수가 없어 누적합이 줄지 않는다 → 마지막 날에 못 채웠으면 기간 안에는 못 채운다
+            reached = gain >= need
+            first = reached.argmax(axis=0) + 1.0
+            first[~reached[-1]] = np.inf
+            later = first > out
+            top[later] = i
+            np.maximum(out, first, out=out)
+    return finish, which
+
+
+def forecast(
+    deficit: Mapping[str, float],
+    income: Income,
+    scenarios: int = 20_000,
+    start: Optional[date] = None,
+    seed=None,
+    percentiles: Sequence[int] = PERCENTILES,
+    max_days: int = MAX_DAYS,
+) -> Forecast:
+    import numpy as np
+
+    horizon = _horizon(deficit, income, max_days)
+    finish, which = simulate(deficit, income, scenarios, horizon, seed)
+    values = np.percentile(finish, list(percentiles), method="higher")
+    counts = np.bincount(which[np.isfinite(finish) & (finish > 0)], minlength=len(engine.GEAR_RESOURCES))
+    done = counts.sum()
+    return Forecast(
+        days={p: (int(v) if np.isfinite(v) else None) for p, v in zip(percentiles, values)},
+        start=start or date.today(),
+        horizon=horizon,
+        within=float(np.isfinite(finish).mean()),
+        bottleneck={r: float(c / done) for r, c in zip(engine.GEAR_RESOURCES, counts) if done and c},
+        scenarios=scenarios,
+        no_income=tuple(r for r, need in deficit.items() if need > 0 and income.expected(r) <= 0),
+    )
+
+
+# --- 연맹원 명단 ---
+
+def member_income(raw: dict, income: Income) -> Income:
+    """명단의 Design_daily ... 열 (또는 {"daily": {...}}) 이 있으면 공통 일일 수입을 그 값으로 바꾼다."""
+    src = raw.get("daily") or {k: raw.get(f"{k}_daily") for k in engine.GEAR_RESOURCES}
+    own = {k: float(v) for k, v in src.items() if v not in (None, "")}
+    return replace(income, daily={**income.daily, **own}) if own else income
+
+
+def member_forecast(
+    raw: dict, income: Income, scenarios: int = 20_000, seed=None, start: Optional[date] = None
+) -> dict:
+    row = member_deficit(raw)
+    if "error" in row:
+        return row
+    try:
+        fc = forecast({k: row[f"{k}_deficit"] for k in engine.GEAR_RESOURCES},
+                      member_income(raw, income), scenarios, start, seed)
+    except (ValueError, TypeError) as e:
+        return {"member": row["member"], "error": f"{type(e).__name__}: {e}"}
+    result = {"member": row["member"]}
+    for p in fc.days:
+        d = fc.date(p)
+        result[f"p{p}_days"] = fc.days[p]
+        result[f"p{p}_date"] = d.isoformat() if d else None
+    result["within_horizon"] = round(fc.within, 4)
+    # within_horizon 0 과 구분: 수입이 없는 자원이 모자라 언제까지도 못 끝나는 경우
+    result["unreachable"] = bool(fc.no_income)
+    result["no_income"] = ",".join(fc.no_income) or None
+    result["bottleneck"] = max(fc.bottleneck, key=fc.bottleneck.get) if fc.bottleneck else None
+    return result
+
+
+def _forecast_chunk(chunk: List[dict], offset: int, income: Income, scenarios: int, seed, start) -> List[dict]:
+    # 연맹원마다 (seed, 입력 순번) 으로 난수를 나눠 프로세스 수와 상관없이 결과가 같다
+    return [
+        member_forecast(raw, income, scenarios, None if seed is None else [seed, offset + i], start)
+        for i, raw in enumerate(chunk)
+    ]
+
+
+def iter_forecasts(
+    profiles: Iterable[dict],
+    income: Income,
+    scenarios: int = 20_000,
+    workers: int = 0,
+    chunk_size: int = 16,
+    seed=0,
+    start: Optional[date] = None,
+) -> Iterator[dict]:
+    """입력 순서대로 결과를 내보낸다 (workers > 0 이면 프로세스 풀, roster_io.map_chunks)."""
+    start = start or date.today()
+    jobs = (
+        (chunk, offset, income, scenarios, seed, start) for offset, chunk in _offset_chunks(profiles, chunk_size)
+    )
+    return map_chunks(_forecast_chunk, jobs, workers)
+
+
+def _offset_chunks(profiles: Iterable[dict], size: int) -> Iterator[Tuple[int, List[dict]]]:
+    offset = 0
+    for chunk in chunks(profiles, size):
+        yield offset, chunk
+        offset += len(chunk)
+
+
+FIELDS: List[str] = ["member"] + [f"p{p}_{col}" for p in PERCENTILES for col in ("days", "date")] + [
+    "within_horizon", "unreachable", "no_income", "bottleneck", "error"
+]
+
+
+def write_results(results: Iterable[dict], out: TextIO, fmt: str) -> int:
+    return write_rows(results, out, fmt, FIELDS)
+
+
+def _parse_daily(items: Sequence[str]) -> Dict[str, float]:
+    daily = {}
+    for item in items:
+        key, _, value = item.partition("=")
+        if key not in engine.GEAR_RESOURCES or not value:
+            raise SystemExit(f"--daily: '{item}' (형식: {'|'.join(engine.GEAR_RESOURCES)}=수량)")
+        daily[key] = float(value)
+    return daily
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="연맹원 명단 목표 도달 예상일 (몬테카를로)")
+    parser.add_argument("input", help="명단 파일 (.csv / .jsonl, '-' = stdin)")
+    parser.add_argument("-o", "--output", default="-", help="결과 파일 (.csv / .jsonl, 기본: stdout)")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"])
+    parser.add_argument("--output-format", choices=["csv", "jsonl"])
+    parser.add_argument("--income", help="공통 수입 모델 JSON (daily / events)")
+    parser.add_argument("--daily", nargs="*", default=[], help="공통 일일 수입 덮어쓰기, 예: Alloy=20000 Polish=120")
+    parser.add_argument("--scenarios", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start", type=date.fromisoformat, help="시작 날짜 (기본: 오늘)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help=f"프로세스 수 (기본: {POOL_THRESHOLD_BYTES:,} 바이트 이상이고 CPU 가 2개 이상이면 CPU 수, 아니면 0)")
+    parser.add_argument("--chunk-size", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    data = {}
+    if args.income:
+        with open(args.income, encoding="utf-8") as f:
+            data = json.load(f)
+    income = Income.from_dict(data)
+    income = replace(income, daily={**income.daily, **_parse_daily(args.daily)})
+
+    in_fmt = args.input_format or detect_format(args.input)
+    out_fmt = args.output_format or ("jsonl" if args.output == "-" else detect_format(args.output))
+    workers = args.workers if args.workers is not None else default_workers(args.input, POOL_THRESHOLD_BYTES)
+
+    with open_streams(args.input, args.output) as (fin, fout):
+        results = iter_forecasts(read_profiles(fin, in_fmt), income, args.scenarios, workers,
+                                 args.chunk_size, args.seed, args.start)
+        n = write_results(results, fout, out_fmt)
+    print(f"{n} members forecast", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
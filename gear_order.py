@@ -0,0 +1,114 @@
+"""가중 자원 비용이 가장 싼 순서로 부위별 등급을 한 단계씩 올리는 계획 (생성기).
+
+    from gear_order import upgrade_order
+    for step in upgrade_order({"Coat": "Green", "Hat": "Blue"}, {"Coat": "Legendary T3 3*", "Hat": "Gold"}):
+        step.part, step.level_from, step.level_to, step.cost, step.total, step.within_budget
+
+  - 한 단계의 가중 비용 = Σ 자원 가중치 × 그 단계의 자원. 자원 가중치를 안 주면 owned 가 있으면
+    1 / 보유량 (모자란 자원일수록 비싸다), 없으면 1 / 표 전체 (Green → 끝) 필요량.
+  - 부위마다 "지금 등급에서 단계당 평균 가중 비용이 가장 작은 끝" 까지를 한 묶음으로 본다 (남은 단계
+    누적 비용의 아래쪽 볼록 껍질의 첫 조각). 비싼 한 단계 뒤에 싼 단계들이 이어지면 같은 묶음이라
+    비싼 단계 때문에 뒤로 밀리지 않는다.
+  - 우선순위 큐 (heapq) 에는 부위마다 다음 묶음 하나만 둔다. 단계당 평균 비용 / 부위 가중치가 가장
+    작은 묶음을 꺼내 그 단계들을 차례로 내보내고 그 부위의 다음 묶음을 넣는다. 그래서 계획을 앞에서부터
+    어디서 자르든 같은 가중 비용으로 올린 (부위 가중치 × 단계 수) 가 분수 배낭 기준 최대다.
+  - 생성기라 첫 단계는 부위별 첫 묶음만 계산하고 바로 나온다 (UI 는 앞 몇 단계만 꺼내 보여 줄 수 있다).
+"""
+
+import heapq
+from dataclasses import dataclass
+from typing import Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import calc_engine as engine
+
+
+@dataclass(frozen=True)
+class UpgradeStep:
+    part: str
+    level_from: str
+    level_to: str
+    # 이 단계의 자원 (GEAR_RESOURCES 순서)
+    cost: Tuple[int, ...]
+    # 이 단계의 가중 비용
+    weighted: float
+    # 이 단계가 속한 묶음의 단계당 평균 가중 비용 / 부위 가중치 (큐 우선순위)
+    rate: float
+    # 첫 단계부터 이 단계까지 자원 합
+    total: Tuple[int, ...]
+    # owned 를 줬을 때 total 이 보유량 안인지 (없으면 항상 True)
+    within_budget: bool = True
+
+
+def default_resource_weights(
+    owned: Optional[Mapping[str, int]] = None, table: Optional[engine.GearTable] = None
+) -> Tuple[float, ...]:
+    """자원 가중치 (GEAR_RESOURCES 순서): 1 / 보유량, 보유량이 없으면 1 / 표 전체 필요량."""
+    table = table or engine.load_gear_table()
+    full = table.cumulative[-1]
+    if owned and any(owned.get(k, 0) > 0 for k in engine.GEAR_RESOURCES):
+        return tuple(1.0 / max(int(owned.get(k, 0)), 1) for k in engine.GEAR_RESOURCES)
+    return tuple(1.0 / f if f else 0.0 for f in full)
+
+
+def _next_block(weighted_cum: Sequence[float], i: int, top: int) -> Tuple[int, float]:
+    """i 에서 단계당 평균 가중 비용이 가장 작은 끝 j (같으면 가까운 쪽) 와 그 평균."""
+    base = weighted_cum[i]
+    best_j, best_rate = i + 1, weighted_cum[i + 1] - base
+    for j in range(i + 2, top + 1):
+        rate = (weighted_cum[j] - base) / (j - i)
+        if rate < best_rate:
+            best_j, best_rate = j, rate
+    return best_j, best_rate
+
+
+def upgrade_order(
+    current: Mapping[str, str],
+    targets: Optional[Mapping[str, str]] = None,
+    resource_weights: Optional[Mapping[str, float]] = None,
+    part_weights: Optional[Mapping[str, float]] = None,
+    owned: Optional[Mapping[str, int]] = None,
+    table: Optional[engine.GearTable] = None,
+) -> Iterator[UpgradeStep]:
+    """current: 부위 → 현재 등급, targets: 부위 → 목표 등급 (기본: 표의 마지막 등급),
+    resource_weights: 자원 → 가중치 (기본: default_resource_weights), part_weights: 부위 → 한 단계의 가치 (기본 1),
+    owned: 자원 → 보유량 (within_budget 판단과 기본 가중치에 쓴다)."""
+    table = table or engine.load_gear_table()
+    cum = table.cumulative
+    last = len(cum) - 1
+    if resource_weights is None:
+        rw = default_resource_weights(owned, table)
+    else:
+        rw = tuple(float(resource_weights.get(k, 0)) for k in engine.GEAR_RESOURCES)
+    part_weights = part_weights or {}
+    budget = tuple(int(owned.get(k, 0)) for k in engine.GEAR_RESOURCES) if owned is not None else None
+    # 등급별 누적 가중 비용 (모든 부위가 같은 표를 쓴다)
+    weighted_cum = [sum(w * x for w, x in zip(rw, row)) for row in cum]
+
+    heap: List[tuple] = []
+    tops = {}
+    for order, part in enumerate(current):
+        start = table.index[current[part]]
+        tops[part] = table.index[targets[part]] if targets and part in targets else last
+        weight = part_weights.get(part, 1)
+        if weight <= 0:
+            raise ValueError(f"{part}: part weight must be positive")
+        if start < tops[part]:
+            end, rate = _next_block(weighted_cum, start, tops[part])
+            # (우선순위, 입력 순서, 부위, 시작, 끝) — 같은 우선순위면 입력 순서대로
+            heapq.heappush(heap, (rate / weight, order, part, start, end))
+
+    total = [0] * len(engine.GEAR_RESOURCES)
+    within = True
+    while heap:
+        rate, order, part, start, end = heapq.heappop(heap)
+        for i in range(start, end):
+            cost = table.range_cost_between(i, i + 1)
+            total = [t + c for t, c in zip(total, cost)]
+            within = within and (budget is None or all(t <= b for t, b in zip(total, budget)))
+            yield UpgradeStep(
+                part, table.levels[i], table.levels[i + 1], cost,
+                weighted_cum[i + 1] - weighted_cum[i], rate, tuple(total), within,
+            )
+        if end < tops[part]:
+            nxt, block_rate = _next_block(weighted_cum, end, tops[part])
+            heapq.heappush(heap, (block_rate / part_weights.get(part, 1), order, part, end, nxt))
@@ -0,0 +1,219 @@
+"""보유 자원으로 갈 수 있는 최고 등급 (장비 계산의 역방향).
+
+    from gear_reach import max_reachable
+    plan = max_reachable({"Coat": "Gold", "Hat": "Blue"}, {"Design": 900, "Alloy": 300000, ...})
+    plan.targets, plan.steps, plan.leftover
+
+부위마다 현재 등급 c 에서 목표 t ≥ c 를 골라 Σ 가중치 × (t - c) 를 최대화한다. 단, 네 자원
+(Design/Alloy/Polish/Amber) 모두 비용 합이 보유량 이하여야 한다 (다차원 배낭).
+
+  - 부위 하나의 비용은 누적표 차 cumulative[t] - cumulative[c] 이고, 누적표는 등급 순으로
+    줄지 않으므로 "남은 자원으로 이 부위만 올릴 때의 최고 등급" 은 이분 탐색 한 번이다.
+  - 분기 한정: 가중치 큰 부위부터 높은 목표 → 낮은 목표 순으로 정한다. 마지막 부위는 분기 없이
+    이분 탐색으로 정하고, 시작·한도·가중치가 같은 부위끼리는 목표가 줄어드는 순서만 본다.
+  - 상한 두 가지 중 작은 것으로 가지를 친다.
+      · 남은 부위를 각자 따로 최대로 올린 값의 합
+      · 자원을 방향 d (보유량으로 정규화한 자원 부분집합) 로 묶은 한 가지 자원에 대한 LP 완화.
+        부위별 (비용, 가치) 위쪽 볼록 껍질 조각을 가치/비용 순으로 담는 분수 배낭이며, d 방향
+        라그랑주 쌍대의 최솟값과 같다. 남은 부위와 시작 등급은 깊이마다 고정이라 조각 정렬은
+        미리 해 두고 노드마다 이분 탐색만 한다.
+    가중치가 모두 정수면 상한을 내림한다.
+  - 첫 해는 "남은 자원 대비 가장 싼 다음 단계" 를 하나씩 올리는 탐욕해.
+"""
+
+import math
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import calc_engine as engine
+
+
+@dataclass
+class ReachPlan:
+    targets: Dict[str, str]
+    steps: Dict[str, int]
+    value: float
+    cost: Dict[str, int]
+    leftover: Dict[str, int]
+    # 탐색한 노드 수 (벤치마크용)
+    nodes: int = 0
+
+
+def _highest(cum: Sequence[Sequence[int]], c: int, hi: int, budget: Sequence[int]) -> int:
+    """c 에서 budget 으로 갈 수 있는 가장 높은 등급 인덱스 (hi 이하)."""
+    base = cum[c]
+    lo = c
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if all(t - b <= r for t, b, r in zip(cum[mid], base, budget)):
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _hull_segments(points: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """(비용, 가치) 점들 (비용 오름차순, 첫 점은 (0, 0)) 의 위쪽 볼록 껍질 → (Δ비용, Δ가치) 조각."""
+    hull: List[Tuple[float, float]] = []
+    for c, g in points:
+        if hull and c <= hull[-1][0]:
+            # 비용이 같은데 가치가 더 큰 점이 뒤에 오면 앞 점을 대신한다 (시작점도)
+            if g <= hull[-1][1]:
+                continue
+            hull.pop()
+        while len(hull) >= 2:
+            (c1, g1), (c2, g2) = hull[-2], hull[-1]
+            if (g2 - g1) * (c - c1) <= (g - g1) * (c2 - c1):
+                hull.pop()
+            else:
+                break
+        hull.append((c, g))
+    # 비용 0 인 단계로 올라간 가치도 조각이 되도록 (0, 0) 에서부터 잰다
+    return [(c2 - c1, g2 - g1) for (c1, g1), (c2, g2) in zip([(0, 0)] + hull, hull) if g2 > g1]
+
+
+class _DirectionBound:
+    """방향 d 로 묶은 자원 하나에 대한 LP 완화 상한 (남은 부위 집합 하나에 대해)."""
+
+    def __init__(self, direction: Sequence[float], segments: List[Tuple[float, float]]):
+        self.direction = direction
+        segments = list(segments)
+        segments.sort(key=lambda s: -s[1] / s[0] if s[0] > 0 else -math.inf)
+        self.segments = segments
+        self.cost = list(accumulate(c for c, _ in segments))
+        self.value = list(accumulate(g for _, g in segments))
+
+    def bound(self, budget: Sequence[int]) -> float:
+        capacity = sum(a * b for a, b in zip(self.direction, budget)) * (1 + 1e-12)
+        i = bisect_right(self.cost, capacity)
+        if i == len(self.cost):
+            return self.value[-1] if self.value else 0.0
+        taken = self.value[i - 1] if i else 0.0
+        spent = self.cost[i - 1] if i else 0.0
+        cost, value = self.segments[i]
+        return taken + value * (capacity - spent) / cost
+
+
+def _greedy(cum, start, top, w, budget) -> List[int]:
+    """첫 해: 남은 자원 대비 비용이 가장 싼 다음 단계를 하나씩 올린다."""
+    chosen, budget = list(start), list(budget)
+    while True:
+        pick, pick_score = -1, math.inf
+        for i, t in enumerate(chosen):
+            if t >= top[i]:
+                continue
+            step = [x - y for x, y in zip(cum[t + 1], cum[t])]
+            if any(m > r for m, r in zip(step, budget)):
+                continue
+            score = sum(m / max(r, 1) for m, r in zip(step, budget)) / w[i]
+            if score < pick_score:
+                pick, pick_score = i, score
+        if pick < 0:
+            return chosen
+        t = chosen[pick]
+        budget = [r - (x - y) for r, x, y in zip(budget, cum[t + 1], cum[t])]
+        chosen[pick] = t + 1
+
+
+def max_reachable(
+    current: Mapping[str, str],
+    owned: Mapping[str, int],
+    weights: Optional[Mapping[str, float]] = None,
+    limits: Optional[Mapping[str, str]] = None,
+    table: Optional[engine.GearTable] = None,
+) -> ReachPlan:
+    """current: 부위 → 현재 등급, owned: 자원 → 보유량 (패키지 포함),
+    weights: 부위 → 한 단계의 가치 (기본 1), limits: 부위 → 올릴 수 있는 최고 등급 (기본 끝)."""
+    table = table or engine.load_gear_table()
+    cum = [tuple(row) for row in table.cumulative]
+    weights = weights or {}
+    limits = limits or {}
+    budget0 = [int(owned.get(k, 0)) for k in engine.GEAR_RESOURCES]
+
+    # 가중치 큰 부위부터, 시작·한도·가중치가 같은 부위는 나란히
+    parts = sorted(
+        current,
+        key=lambda p: (-weights.get(p, 1), table.index[current[p]], limits.get(p, ""), p),
+    )
+    start = [table.index[current[p]] for p in parts]
+    top = [max(s, table.index[limits[p]]) if p in limits else len(cum) - 1 for p, s in zip(parts, start)]
+    w = [weights.get(p, 1) for p in parts]
+    if any(wi <= 0 for wi in w):
+        raise ValueError("weights must be positive")
+    n = len(parts)
+    twin = [k > 0 and (start[k], top[k], w[k]) == (start[k - 1], top[k - 1], w[k - 1]) for k in range(n)]
+    integral = all(float(wi).is_integer() for wi in w)
+
+    # 깊이 k 의 방향별 LP 완화 (방향: 보유량으로 정규화한 자원 부분집합, 자원 4개면 15개)
+    dims = len(budget0)
+    directions = [
+        [1.0 / max(b, 1) if mask >> r & 1 else 0.0 for r, b in enumerate(budget0)]
+        for mask in range(1, 1 << dims)
+    ]
+    part_points = [
+        (
+            [[x - y for x, y in zip(cum[t], cum[start[i]])] for t in range(start[i], top[i] + 1)],
+            [w[i] * (t - start[i]) for t in range(start[i], top[i] + 1)],
+        )
+        for i in range(n)
+    ]
+    relax: List[List[_DirectionBound]] = [[] for _ in range(n)]
+    for d in directions:
+        hulls = [
+            _hull_segments([(sum(a * x for a, x in zip(d, row)), g) for row, g in zip(rows, gains)])
+            for rows, gains in part_points
+        ]
+        for k in range(n):
+            relax[k].append(_DirectionBound(d, [seg for hull in hulls[k:] for seg in hull]))
+
+    best = _greedy(cum, start, top, w, budget0)
+    best_value = sum(wi * (t - c) for wi, t, c in zip(w, best, start))
+    chosen = list(start)
+    nodes = 0
+
+    def pruned(bound: float) -> bool:
+        if integral:
+            bound = math.floor(bound + 1e-9)
+        return bound <= best_value + 1e-9
+
+    def search(k: int, budget: List[int], value: float) -> None:
+        nonlocal best_value, best, nodes
+        nodes += 1
+        if k == n:
+            if value > best_value:
+                best_value, best = value, list(chosen)
+            return
+        highest = [_highest(cum, start[i], top[i], budget) for i in range(k, n)]
+        if pruned(value + sum(w[i] * (highest[i - k] - start[i]) for i in range(k, n))):
+            return
+        if any(pruned(value + r.bound(budget)) for r in relax[k]):
+            return
+        c = start[k]
+        hi = min(highest[0], chosen[k - 1]) if twin[k] else highest[0]
+        if k == n - 1:
+            chosen[k] = hi
+            search(k + 1, budget, value + w[k] * (hi - c))
+            return
+        base = cum[c]
+        for t in range(hi, c - 1, -1):
+            chosen[k] = t
+            search(k + 1, [r - (x - b) for r, x, b in zip(budget, cum[t], base)], value + w[k] * (t - c))
+        chosen[k] = c
+
+    if n:
+        search(0, budget0, 0)
+
+    cost = [0] * dims
+    for c, t in zip(start, best):
+        for j, (x, y) in enumerate(zip(cum[t], cum[c])):
+            cost[j] += x - y
+    return ReachPlan(
+        targets={p: table.levels[t] for p, t in zip(parts, best)},
+        steps={p: t - c for p, c, t in zip(parts, start, best)},
+        value=best_value,
+        cost=dict(zip(engine.GEAR_RESOURCES, cost)),
+        leftover={k: b - c for k, b, c in zip(engine.GEAR_RESOURCES, budget0, cost)},
+        nodes=nodes,
+    )
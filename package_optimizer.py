@@ -0,0 +1,584 @@
+"""부족 자원을 가장 싸게 채우는 패키지 조합 (정확해, 분기 한정법).
+
+    from package_optimizer import cheapest_packages
+    plan = cheapest_packages({"Design": 4805, "Alloy": 2139200, "Polish": 21926})
+    plan.counts, plan.cost
+
+탐색 방식
+  - 같은 방향(정수배)인 패키지는 한 묶음으로 합친다 (예: Exquisite / Classic 전 가격대).
+    묶음마다 "기준 벡터 u 개를 정확히 사는 최저가" 를 한도 있는 배낭 DP 로 미리 구해 두고,
+    묶음별 u 를 정하는 깊이 우선 탐색을 한다. 순서는 축소 비용(가격 - λ·자원) 순.
+  - 하한: 남은 패키지 집합에 대한 LP 완화의 라그랑주 쌍대값
+        g(λ) = λ·남은 부족량 - Σ cap_j · max(0, λ·a_j - p_j)
+    쌍대 함수의 꼭짓점 λ 들은 부족량과 무관하므로 루트에서 한 번 구해 두고, 노드마다 그중
+    최댓값을 하한으로 쓴다 (= 남은 패키지에 대한 LP 완화 최적값). 비용은 가격들의 최대공약수
+    단위로 올려서 비교한다.
+  - 한도 없는 다른 패키지 여러 개로 같은 값 이하에 대체되는 패키지는 미리 뺀다
+    (예: USD 기준 Exquisite $10 = Exquisite $5 × 2). 또 한도 없는 큰 패키지 하나가 작은 패키지
+    m 개를 같은 값 이하로 대신하면 작은 패키지는 m - 1 개까지만 산다.
+  - 노드마다 가능한 모든 u 의 하한을 numpy 로 한 번에 계산해 하한이 작은 u 부터 내려가고,
+    하한이 현재 최선해 이상이 되면 멈춘다. 마지막 두 묶음은 분기 없이 numpy 로 바로 푼다.
+"""
+
+import math
+from dataclasses import dataclass, field
+from functools import reduce
+from itertools import combinations
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+import calc_engine as engine
+
+# 깊이별로 하한 계산에 쓰는 λ 최대 개수
+_MAX_MULTIPLIERS = 48
+# 그중 u 를 먼저 걸러 낼 때 쓰는 λ 개수
+_ROUGH_MULTIPLIERS = 4
+# u 가 이 개수 이하이면 하한을 행렬 곱 한 번으로 계산한다 (_relaxed)
+_SMALL_ROWS = 256
+# 끝의 두 묶음을 후보 여러 개에 대해 한 번에 풀 때 (후보 수 × 수량) 최대 칸 수
+_BATCH_CELLS = 1 << 20
+
+
+@dataclass
+class PurchasePlan:
+    counts: Dict[str, int]
+    cost: int
+    currency: str
+    # 구매로 얻는 자원 합계와, 그중 부족량을 넘는 잉여분
+    provided: Dict[str, int]
+    surplus: Dict[str, int]
+    # 어떤 패키지에도 없는 자원 (예: Amber) 의 부족량 — 구매로 채울 수 없음
+    uncovered: Dict[str, int] = field(default_factory=dict)
+    nodes: int = 0
+
+
+def _dual_vertices(items, dims: int) -> List[Tuple[float, ...]]:
+    """LP 완화 쌍대 함수의 후보 꼭짓점 λ.
+
+    g(λ) = λ·rem - Σ cap_j · max(0, λ·a_j - p_j) 는 λ ≥ 0 에서 오목한 조각별 선형이라,
+    어떤 부족량 rem 에 대해서도 최댓값은 초평면 λ·a_j = p_j, λ_r = 0 중 dims 개를 교차한
+    꼭짓점에서 나온다. 뒤쪽 패키지만 남은 부분 문제의 꼭짓점도 이 집합에 포함된다.
+    모든 조합의 연립방정식을 numpy 로 한 번에 푼다. 계수가 정수라 행렬식이 0 이 아니면 절댓값이
+    1 이상이므로 0.5 로 특이 행렬을 가르고, 여러 조합이 만나는 같은 꼭짓점은 반올림해 하나만 남긴다.
+    """
+    planes = [(a, p) for p, a in items]
+    planes += [(tuple(1 if s == r else 0 for s in range(dims)), 0) for r in range(dims)]
+    combos = np.array(list(combinations(range(len(planes)), dims)), dtype=np.int64).reshape(-1, dims)
+    rows = np.array([a for a, _ in planes], dtype=float)[combos]
+    rhs = np.array([p for _, p in planes], dtype=float)[combos]
+    regular = np.abs(np.linalg.det(rows)) > 0.5
+    lams = np.linalg.solve(rows[regular], rhs[regular][..., None])[..., 0]
+    lams = lams[(lams.min(axis=1) >= -1e-9) & (lams.max(axis=1) > 0)]
+    vertices = {tuple(np.round(lam, 9)): tuple(max(0.0, float(x)) for x in lam) for lam in lams}
+    return sorted(vertices.values())
+
+
+def _exchange_caps(items, caps, unlimited) -> List[int]:
+    """한도 없는 j 하나가 k 의 m 개(m ≥ 2)를 덮고(a_j ≥ m·a_k) 값도 p_j ≤ m·p_k 이면,
+    k 를 m 개 이상 사는 해는 j 로 바꿔 개수를 줄일 수 있으므로 k 는 m - 1 개까지만 본다.
+    """
+    caps = list(caps)
+    for k, (p_k, a_k) in enumerate(items):
+        for j, (p_j, a_j) in enumerate(items):
+            if j == k or not unlimited[j]:
+                continue
+            m = min((x // y for x, y in zip(a_j, a_k) if y > 0), default=0)
+            if m >= 2 and p_j <= m * p_k:
+                caps[k] = min(caps[k], m - 1)
+    return caps
+
+
+def _undominated(items, unlimited) -> List[int]:
+    """다른 패키지 k 의 m 개 묶음(m·a_k ≥ a_j)이 p_j 이하로 j 를 대신할 수 있으면 j 를 뺀다.
+
+    k 에 구매 한도가 없을 때만 대체가 항상 가능하다. 남은 패키지 중에서만 비교하므로
+    똑같은 패키지가 둘이면 하나는 남는다.
+    """
+    kept = list(range(len(items)))
+    for j in range(len(items)):
+        p_j, a_j = items[j]
+        for k in kept:
+            if k == j or not unlimited[k]:
+                continue
+            p_k, a_k = items[k]
+            if any(x > 0 and y == 0 for x, y in zip(a_j, a_k)):
+                continue
+            m = max(-(-x // y) for x, y in zip(a_j, a_k) if x > 0)
+            if m * p_k <= p_j:
+                kept.remove(j)
+                break
+    return kept
+
+
+def _relaxed(
+    lams: np.ndarray, pens: np.ndarray, fixed: np.ndarray, cols: Dict[int, np.ndarray], size: int
+) -> np.ndarray:
+    """u 별 남은 부족량의 LP 하한 max(0, max_v λ_v·rem_after - pen_v).
+
+    fixed 는 u 와 무관한 자원의 남은 부족량 (나머지 자리는 0), cols 는 자원 → u 별 남은 부족량.
+    u 가 많으면 자원 축이 짧아 (u, 자원) @ (자원, λ) 행렬 곱과 짧은 축의 max 보다 λ 마다 1차원 배열로
+    더하는 편이 빠르고, u 가 몇 개 안 되면 λ 마다 도는 파이썬 반복이 더 비싸다.
+    """
+    consts = lams @ fixed - pens
+    if size <= _SMALL_ROWS:
+        rem_after = np.zeros((size, len(fixed)))
+        for r, col in cols.items():
+            rem_after[:, r] = col
+        return np.maximum((rem_after @ lams.T + consts).max(axis=1, initial=0.0), 0.0)
+    out = np.zeros(size)
+    for lam, const in zip(lams, consts):
+        term = np.full(size, const)
+        for r, col in cols.items():
+            term += lam[r] * col
+        np.maximum(out, term, out=out)
+    return out
+
+
+def _lower_bounds(group, us, cost, rem, lams, pens, grain, limit) -> Tuple[np.ndarray, np.ndarray]:
+    """묶음 group 을 u (us) 개 살 때의 하한: 비용 + 묶음 최저가 + 남은 부족량의 LP 완화 (grain 단위로 올림).
+
+    limit 이 있으면 먼저 rem 에서 값이 큰 λ 몇 개로 하한이 limit 이상인 u 를 버리고 (u 가 수만 개일 때
+    λ 전부에 대한 계산이 대부분의 시간이다) 남은 u 에만 λ 전부를 쓴다. (남은 u, 하한) 을 돌려준다.
+    """
+    fixed = np.array([max(x, 0) if y == 0 else 0 for x, y in zip(rem, group.base)], dtype=float)
+    cols = {r: np.maximum(x - us * y, 0).astype(float) for r, (x, y) in enumerate(zip(rem, group.base)) if y}
+    bounds = cost + group.cost[us]
+    if len(pens) and limit < math.inf:
+        v = np.argsort(pens - lams @ np.array(rem, dtype=float), kind="stable")[:_ROUGH_MULTIPLIERS]
+        rough = bounds + _relaxed(lams[v], pens[v], fixed, cols, len(us))
+        keep = np.flatnonzero(grain * np.ceil(rough / grain - 1e-6) < limit)
+        us, bounds = us[keep], bounds[keep]
+        cols = {r: col[keep] for r, col in cols.items()}
+    if len(pens):
+        bounds = bounds + _relaxed(lams, pens, fixed, cols, len(us))
+    # 비용은 모두 grain 의 배수이므로 하한도 grain 단위로 올린다
+    return us, grain * np.ceil(bounds / grain - 1e-6)
+
+
+def _suffix_bounds(group_list, folded, vertices, excess, need):
+    """깊이 i 이후 묶음들에 대한 하한 재료: λ 행렬과 벌점 벡터, 자원별 잔여 용량 (깊이 0 ~ 묶음 수).
+
+    꼭짓점이 많으면 루트 부족량 / 자원별 방향에서 값이 큰 것만 남긴다 (일부만 써도 유효한 하한).
+    합친 묶음 (folded) 은 언제나 남은 묶음에 들어 있다.
+    """
+    n_dims = len(need)
+    lam_mats: List[np.ndarray] = []
+    pen_vecs: List[np.ndarray] = []
+    suffix_capacity: List[List[int]] = []
+    penalties = excess[:, [j for group in folded for j in group.members]].sum(axis=1)
+    directions = np.array(
+        [need] + [[n if s == r else 0 for s, n in enumerate(need)] for r in range(n_dims)], dtype=float
+    )
+    for i in range(len(group_list), -1, -1):
+        if i < len(group_list):
+            penalties = penalties + excess[:, group_list[i].members].sum(axis=1)
+        picked = np.arange(len(vertices))
+        if len(vertices) > _MAX_MULTIPLIERS:
+            scores = vertices @ directions.T - penalties[:, None]
+            ranked = np.argsort(-scores, axis=0, kind="stable")[:_MAX_MULTIPLIERS // len(directions)]
+            picked = np.unique(ranked)
+        lam_mats.append(vertices[picked])
+        pen_vecs.append(penalties[picked])
+        suffix_capacity.append([
+            sum(group.max_units * group.base[r] for group in group_list[i:] + folded) for r in range(n_dims)
+        ])
+    return lam_mats[::-1], pen_vecs[::-1], suffix_capacity[::-1]
+
+
+class _Group:
+    """기준 벡터가 같은 패키지 묶음. 패키지 j 는 기준 벡터 units[j] 개에 해당한다.
+
+    cost[u] 는 묶음 안의 패키지로 기준 벡터를 정확히 u 개 사는 최저가 (불가능하면 inf).
+    한도가 있는 배낭 문제를 이진 분할(1, 2, 4, ... 개 묶음)로 0/1 배낭으로 바꿔 numpy 로 푼다.
+    수량 범위를 거의 혼자 채우는 패키지 b 가 있으면 (예: 한도가 걸린 Exquisite $100 과 교환 한도로
+    몇 개만 남는 작은 가격대) b 는 분할하지 않는다: 나머지만의 DP rest 를 그 몫 R 까지만 풀고
+        cost[u] = min_x x·p_b + rest[u - x·w_b]    (u - x·w_b 가 0 ~ R 인 x 는 R / w_b + 2 개 이하)
+    로 합친다. 큰 배열을 도는 횟수가 조각 수 대신 R / w_b + 2 번이 된다.
+    """
+
+    def __init__(self, base: Tuple[int, ...]):
+        self.base = base
+        self.members: List[int] = []
+        self.units: List[int] = []
+
+    def add(self, j: int, units: int) -> None:
+        self.members.append(j)
+        self.units.append(units)
+
+    def build(self, items, caps, need) -> None:
+        step = reduce(math.gcd, self.units)
+        self.base = tuple(x * step for x in self.base)
+        self.units = [u // step for u in self.units]
+        self.step = max(self.units)
+        # 부족량을 다 채운 뒤에도 패키지 하나를 더 얹는 해는 최적이 아니므로 그 이상은 필요 없다
+        useful = max(-(-n // x) for n, x in zip(need, self.base) if x > 0)
+        spans = [caps[j] * u for j, u in zip(self.members, self.units)]
+        self.max_units = min(sum(spans), useful + self.step - 1)
+        self.prices = {j: items[j][0] for j in self.members}
+        # 이진 분할 조각 (패키지, 개수, 기준 벡터 수) — 고른 u 의 구성은 counts() 에서 다시 풀어 찾는다
+        pieces: List[Tuple[int, int, int]] = []
+        for j, u in zip(self.members, self.units):
+            left, m = caps[j], 1
+            while left > 0:
+                m = min(m, left)
+                if m * u <= self.max_units:
+                    pieces.append((j, m, m * u))
+                left -= m
+                m *= 2
+        b = max(range(len(self.members)), key=spans.__getitem__)
+        rest_span = min(sum(spans) - spans[b], self.max_units)
+        rest_pieces = [piece for piece in pieces if piece[0] != self.members[b]]
+        self._big: Optional[Tuple[int, int, int]] = None
+        # 큰 배열을 도는 횟수로 두 방법을 비교한다
+        split = (rest_span // self.units[b] + 2) * self.max_units + len(rest_pieces) * rest_span
+        if split < len(pieces) * self.max_units:
+            self._big = (self.members[b], self.units[b], caps[self.members[b]])
+            self._rest_span = rest_span
+            pieces = rest_pieces
+        self._pieces = pieces
+        self.cost = self._solve(self.max_units)
+        self.feasible = np.flatnonzero(np.isfinite(self.cost))
+        self.folded: Optional[Tuple[int, "_Group", np.ndarray]] = None
+        self._set_cover(self.cost)
+
+    def _set_cover(self, cost: np.ndarray) -> None:
+        # cover[u] = 기준 벡터를 u 개 이상 사는 최저가, cover_at[u] = 그때 실제로 사는 개수
+        # (끝에 inf 하나를 붙여 "채울 수 없음" 자리로 쓴다)
+        padded = np.append(cost, np.inf)
+        self.cover = np.minimum.accumulate(padded[::-1])[::-1]
+        records = np.where(padded == self.cover, np.arange(len(padded)), len(padded) - 1)
+        self.cover_at = np.minimum.accumulate(records[::-1])[::-1]
+
+    def fold(self, other: "_Group", r: int, need_r: int) -> None:
+        """자원 r 하나만 주는 묶음 other 를 이 묶음 (마지막 묶음) 에 합친다.
+
+        r 을 주는 묶음이 이 둘뿐이면 r 의 남은 부족량은 언제나 need_r 이고, 이 묶음을 v 개 산 뒤 남는
+        r 은 other 의 cover 로 바로 덮인다. 그래서 cover 를 "v 개 이상 + 남은 r 을 other 로" 의 최저가로
+        바꾸고 units_to_cover 는 r 을 보지 않는다 — other 는 분기하지 않는다.
+        """
+        left = np.maximum(need_r - np.arange(len(self.cost)) * self.base[r], 0)
+        other_units = np.minimum(-(-left // other.base[r]), len(other.cover) - 1)
+        self.folded = (r, other, other.cover_at[other_units])
+        self._set_cover(self.cost + other.cover[other_units])
+
+    def units_to_cover(self, rems: np.ndarray, other: Optional["_Group"] = None, us=0) -> np.ndarray:
+        """부족량 rems[..., :] 에서 묶음 other 를 us 개 산 뒤 남는 부족량을 이 묶음만으로 채우는 최소 개수
+        (불가능하면 len(cover) - 1). us 는 rems[..., 0] 과 브로드캐스트된다."""
+        moved = other.base if other is not None else (0,) * rems.shape[-1]
+        never = len(self.cover) - 1
+        need = np.zeros(np.broadcast(rems[..., 0], us).shape, dtype=np.int64)
+        for r, (y, z) in enumerate(zip(moved, self.base)):
+            if self.folded is not None and r == self.folded[0]:
+                continue
+            left = np.maximum(rems[..., r] - us * y, 0)
+            if z > 0:
+                need = np.maximum(need, -(-left // z))
+            else:
+                need = np.where(left > 0, never, need)
+        return np.minimum(need, never)
+
+    def _knapsack(self, size: int, takes: Optional[List[np.ndarray]] = None) -> np.ndarray:
+        """0/1 배낭 (조각마다 한 번): cost[u] = 조각들로 기준 벡터를 정확히 u 개 사는 최저가.
+
+        takes 를 주면 조각마다 "이 조각을 넣어 값이 줄었는지" 를 남긴다 (구성 복원용, 메모리 size × 조각 수).
+        """
+        cost = np.full(size + 1, np.inf)
+        cost[0] = 0.0
+        buf = np.empty(size + 1)
+        for j, m, w in self._pieces:
+            if w > size:
+                continue
+            cand = np.add(cost[:-w], m * self.prices[j], out=buf[:size + 1 - w])
+            if takes is not None:
+                take = np.zeros(size + 1, dtype=bool)
+                np.less(cand, cost[w:], out=take[w:])
+                takes.append(take)
+            np.minimum(cost[w:], cand, out=cost[w:])
+        return cost
+
+    def _solve(self, size: int) -> np.ndarray:
+        if self._big is None:
+            return self._knapsack(size)
+        j, w, cap = self._big
+        rest = self._knapsack(min(self._rest_span, size))
+        # u = q·w + r 를 (q, r) 행렬로 놓으면 x = q - t 일 때 rest 자리는 t·w + r 이라 행마다 같은 조각이다
+        n_t = len(rest) // w + 2
+        shifted = np.full(n_t * w, np.inf)
+        shifted[:len(rest)] = rest
+        rows = size // w + 1
+        price = float(self.prices[j])
+        paid = np.arange(rows, dtype=float)[:, None] * price
+        cost = np.full((rows, w), np.inf)
+        for t in range(min(n_t, rows)):
+            block = cost[t:t + cap + 1]
+            np.minimum(block, paid[:len(block)] + shifted[t * w:(t + 1) * w], out=block)
+        return cost.ravel()[:size + 1]
+
+    def counts(self, u: int) -> Dict[int, int]:
+        """cost[u] 를 만드는 패키지별 수량 (조각 DP 를 필요한 만큼만 다시 풀어 선택 기록을 거꾸로 따라간다)."""
+        result: Dict[int, int] = {}
+        if self._big is not None:
+            j, w, cap = self._big
+            rest = self._knapsack(min(self._rest_span, u))
+            x = min(
+                (x for x in range(max(0, -(-(u - len(rest) + 1) // w)), min(cap, u // w) + 1)),
+                key=lambda x: x * self.prices[j] + rest[u - x * w],
+            )
+            if x:
+                result[j] = x
+            u -= x * w
+        takes: List[np.ndarray] = []
+        self._knapsack(u, takes)
+        pieces = [piece for piece in self._pieces if piece[2] <= u]
+        for (j, m, w), take in zip(reversed(pieces), reversed(takes)):
+            if u > 0 and take[u]:
+                result[j] = result.get(j, 0) + m
+                u -= w
+        return result
+
+
+def cheapest_packages(
+    deficit: Mapping[str, int],
+    caps: Optional[Mapping[str, int]] = None,
+    currency: str = "usd",
+    packages: Optional[engine.PackageMatrix] = None,
+) -> PurchasePlan:
+    """deficit 를 모두 채우는 최저가 패키지 조합.
+
+    caps: 패키지 키 → 최대 구매 수량 (없으면 제한 없음).
+    currency: "usd" (센트 단위) 또는 "krw" (원 단위) — 비용 비교 기준.
+    구매 제한 때문에 채울 수 없으면 ValueError.
+    """
+    packages = packages or engine.load_packages()
+    caps = caps or {}
+    need_all = [max(0, int(deficit.get(k, 0))) for k in engine.GEAR_RESOURCES]
+
+    # 어떤 패키지에도 없는 자원은 최적화 대상에서 제외
+    supplied = [r for r in range(len(engine.GEAR_RESOURCES)) if any(row[r] > 0 for row in packages.rows)]
+    uncovered = {
+        engine.GEAR_RESOURCES[r]: need_all[r]
+        for r in range(len(need_all)) if r not in supplied and need_all[r] > 0
+    }
+    dims = [r for r in supplied if need_all[r] > 0]
+    need = [need_all[r] for r in dims]
+    if not dims:
+        zero = {k: 0 for k in engine.GEAR_RESOURCES}
+        return PurchasePlan({}, 0, currency, zero, {}, uncovered)
+
+    # (가격, 자원 벡터), 한도 — 필요 이상으로 사는 수량은 의미가 없으므로 그 이하로 자른다
+    items: List[Tuple[int, Tuple[int, ...]]] = []
+    keys: List[str] = []
+    item_caps: List[int] = []
+    # 한도가 없거나, 한도가 "그 패키지만으로 부족량을 다 채우는 수량" 이상이면 한도가 없는 것과 같다
+    # (그만큼 사면 다른 패키지가 필요 없으므로 대체 / 교환 논리가 그대로 성립한다)
+    unlimited: List[bool] = []
+    capped = False
+    for key, row in zip(packages.keys, packages.rows):
+        a = tuple(row[r] for r in dims)
+        if not any(a):
+            continue
+        useful = max(-(-n // x) for n, x in zip(need, a) if x > 0)
+        cap = min(useful, caps[key]) if key in caps else useful
+        capped = capped or cap < useful
+        if cap <= 0:
+            continue
+        items.append((engine.package_price(key, currency), a))
+        keys.append(key)
+        item_caps.append(cap)
+        unlimited.append(cap == useful)
+    kept = _undominated(items, unlimited)
+    items = [items[j] for j in kept]
+    keys = [keys[j] for j in kept]
+    unlimited = [unlimited[j] for j in kept]
+    item_caps = _exchange_caps(items, [item_caps[j] for j in kept], unlimited)
+
+    for r, n in enumerate(need):
+        if sum(c * a[r] for c, (_, a) in zip(item_caps, items)) < n:
+            raise ValueError(
+                f"{engine.GEAR_RESOURCES[dims[r]]} 부족량 {n:,} 을 구매 한도 안에서 채울 수 없습니다"
+            )
+
+    # 한도를 모두 풀어 본 최적해는 한도 있는 문제의 하한이다. 그 해가 한도 안이면 그대로 답이고,
+    # 아니면 탐색이 그 값에 닿는 순간 멈춘다 (한도가 최적 비용을 바꾸지 않는 경우 LP 하한과의
+    # 작은 차이를 증명하느라 노드 수천 개를 도는 일이 없어진다).
+    floor = 0
+    if capped:
+        free = cheapest_packages(deficit, None, currency, packages)
+        if all(c <= caps.get(k, c) for k, c in free.counts.items()):
+            return free
+        floor = free.cost
+
+    n_items, n_dims = len(items), len(need)
+    vertices = np.array(_dual_vertices(items, n_dims), dtype=float).reshape(-1, n_dims)
+    # excess[v, j] = cap_j · max(0, λ_v·a_j - p_j) — 쌍대값 g(λ_v) 에서 패키지 j 가 빼는 몫
+    excess = np.maximum(
+        vertices @ np.array([a for _, a in items], dtype=float).T - np.array([p for p, _ in items], dtype=float),
+        0.0,
+    ) * np.array(item_caps, dtype=float)
+    lam_star = tuple(vertices[int(np.argmax(vertices @ np.array(need, dtype=float) - excess.sum(axis=1)))])
+    order = sorted(
+        range(n_items),
+        key=lambda j: (items[j][0] - sum(lam * a for lam, a in zip(lam_star, items[j][1]))) / items[j][0],
+    )
+    items = [items[j] for j in order]
+    keys = [keys[j] for j in order]
+    item_caps = [item_caps[j] for j in order]
+    excess = excess[:, order]
+    grain = reduce(math.gcd, (p for p, _ in items))
+
+    # 같은 방향(정수배)의 패키지는 한 묶음으로 합친다 (예: Exquisite $5 ~ $100, Classic).
+    # 묶음 안에서는 "기준 벡터 u 개를 정확히 사는 최저가" 를 배낭 DP 로 미리 구해 두고,
+    # 탐색은 묶음마다 u 를 정한다.
+    groups: Dict[Tuple[int, ...], _Group] = {}
+    for j, (_, a) in enumerate(items):
+        g = reduce(math.gcd, a)
+        groups.setdefault(tuple(x // g for x in a), _Group(tuple(x // g for x in a))).add(j, g)
+    group_list = list(groups.values())
+    for group in group_list:
+        group.build(items, item_caps, need)
+    group_list.sort(key=lambda group: min(group.members))
+    # 자원 하나만 주는 묶음 (예: DawnMarket 의 Design) 은 그 자원을 주는 다른 묶음이 하나뿐이면 그 묶음에
+    # 합쳐 마지막에 둔다 (_Group.fold). 분기할 묶음이 하나 줄고 그 자원의 정수 효과가 정확히 계산된다.
+    folded: List[_Group] = []
+    for group in sorted(group_list, key=lambda group: group.max_units, reverse=True):
+        given = [r for r, y in enumerate(group.base) if y]
+        others = [other for other in group_list if other is not group and other.base[given[0]]]
+        if folded or len(given) != 1 or len(others) != 1:
+            continue
+        others[0].fold(group, given[0], need[given[0]])
+        folded = [group]
+        group_list = [other for other in group_list if other is not group and other is not others[0]] + others
+    # 마지막 두 묶음은 분기 없이 풀리므로 수량 범위가 가장 넓은 두 묶음을 맨 뒤로 보낸다
+    if folded:
+        widest = sorted(group_list[:-1], key=lambda group: group.max_units)[-1:] + group_list[-1:]
+    else:
+        widest = sorted(group_list, key=lambda group: group.max_units)[-2:]
+    group_list = [group for group in group_list if group not in widest] + widest
+    n_groups = len(group_list)
+
+    lam_mats, pen_vecs, suffix_capacity = _suffix_bounds(group_list, folded, vertices, excess, need)
+
+    best_cost = math.inf
+    best_units: List[int] = []
+    units = [0] * n_groups
+    nodes = 0
+    diving = True
+
+    def search(i: int, cost: float, rem: List[int]) -> None:
+        nonlocal best_cost, best_units, nodes
+        nodes += 1
+        if all(x <= 0 for x in rem):
+            if cost < best_cost:
+                best_cost, best_units = cost, list(units)
+            return
+        if i == n_groups:
+            return
+        group, last = group_list[i], group_list[-1]
+        if i == n_groups - 1:
+            # 묶음이 하나뿐인 경우: 남은 부족량을 덮는 최저가
+            u = int(last.units_to_cover(np.array(rem, dtype=np.int64)))
+            if cost + last.cover[u] < best_cost:
+                units[i] = int(last.cover_at[u])
+                best_cost, best_units = float(cost + last.cover[u]), list(units)
+                units[i] = 0
+            return
+        if i == n_groups - 2:
+            finish(i, np.array([cost]), np.array([rem], dtype=np.int64))
+            return
+        # 다음 묶음들의 잔여 용량으로 채울 수 있으려면 u >= lo,
+        # 이 묶음이 주는 자원을 모두 넘치게 사는 수량은 의미가 없으므로 u <= hi
+        lo, useful = 0, 0
+        for x, y, cap in zip(rem, group.base, suffix_capacity[i + 1]):
+            if x > cap:
+                if y == 0:
+                    return
+                lo = max(lo, -(-(x - cap) // y))
+            if y > 0 and x > 0:
+                useful = max(useful, -(-x // y))
+        hi = min(group.max_units, useful + group.step - 1)
+        if lo > hi:
+            return
+
+        us = group.feasible[np.searchsorted(group.feasible, lo):np.searchsorted(group.feasible, hi, "right")]
+        us, bounds = _lower_bounds(group, us, cost, rem, lam_mats[i + 1], pen_vecs[i + 1], grain, best_cost)
+        order = np.argsort(bounds, kind="stable")
+        if i == n_groups - 3:
+            # 다음 묶음이 끝에서 두 번째면 후보 여러 개를 한 번에 푼다 (하한 순서로 1, 2, 4, ... 개씩)
+            start, size = 0, 1
+            while start < len(order) and best_cost > floor and not (diving and best_cost < math.inf):
+                picked = order[start:start + size]
+                picked = us[picked[bounds[picked] < best_cost]]
+                if not len(picked):
+                    break
+                nodes += len(picked)
+                rems = np.array(rem, dtype=np.int64) - picked[:, None] * np.array(group.base, dtype=np.int64)
+                finish(i + 1, cost + group.cost[picked], rems, picked)
+                start += size
+                size = min(2 * size, max(1, _BATCH_CELLS // len(group_list[i + 1].feasible)))
+            return
+        for k in order:
+            if bounds[k] >= best_cost or best_cost <= floor or (diving and best_cost < math.inf):
+                break
+            u = int(us[k])
+            units[i] = u
+            search(i + 1, cost + group.cost[u], [x - u * y for x, y in zip(rem, group.base)])
+        units[i] = 0
+
+    def finish(i: int, costs: np.ndarray, rems: np.ndarray, parents: Optional[np.ndarray] = None) -> None:
+        """끝에서 두 번째 묶음부터는 분기 없이 바로 푼다: 남은 부족량 rems[k] (비용 costs[k]) 마다 이 묶음
+        u 개를 사고 남는 부족량을 마지막 묶음으로 덮는 최저가(cover)를 더해 가장 싼 (k, u) 를 고른다.
+        parents 는 행마다 바로 앞 묶음의 개수 (앞 묶음 후보 여러 개를 한 번에 풀 때)."""
+        nonlocal best_cost, best_units
+        group, last = group_list[i], group_list[-1]
+        useful = max(-(-max(int(rems[:, r].max()), 0) // y) for r, y in enumerate(group.base) if y)
+        us = group.feasible[:np.searchsorted(group.feasible, useful + group.step - 1, "right")]
+        last_units = last.units_to_cover(rems[:, None, :], group, us)
+        totals = costs[:, None] + group.cost[us] + last.cover[last_units]
+        k, t = np.unravel_index(int(np.argmin(totals)), totals.shape)
+        if totals[k, t] < best_cost:
+            if parents is not None:
+                units[i - 1] = int(parents[k])
+            units[i], units[-1] = int(us[t]), int(last.cover_at[last_units[k, t]])
+            best_cost, best_units = float(totals[k, t]), list(units)
+            units[i] = units[-1] = 0
+            if parents is not None:
+                units[i - 1] = 0
+
+    # 먼저 하한이 가장 작은 쪽으로만 내려가 첫 해를 얻는다. 그 해를 상한으로 분기 순서를 다시 정한다:
+    # 묶음마다 "그 묶음만 정하고 나머지는 LP" 인 하한이 상한보다 작은 u 의 개수 (= 맨 앞에서 분기할 때
+    # 내려갈 후보 수) 를 세어 적은 묶음부터 분기하고, 가장 많은 묶음은 분기 없이 푸는 끝에서 두 번째
+    # 자리로 보낸다. LP 해가 한도 / 0 에 걸린 묶음은 후보가 몇 개뿐이라 앞에서 거의 바로 정해진다.
+    search(0, 0, list(need))
+    diving = False
+    if n_groups > 2 and floor < best_cost < math.inf:
+        rest_pen = excess.sum(axis=1)
+        fan_out = {}
+        for group in group_list[:-1]:
+            pens = rest_pen - excess[:, group.members].sum(axis=1)
+            _, bounds = _lower_bounds(group, group.feasible, 0.0, need, vertices, pens, grain, best_cost)
+            fan_out[group] = int(np.count_nonzero(bounds < best_cost))
+        found = dict(zip(group_list, best_units))
+        group_list = sorted(group_list[:-1], key=fan_out.__getitem__) + group_list[-1:]
+        best_units = [found[group] for group in group_list]
+        lam_mats, pen_vecs, suffix_capacity = _suffix_bounds(group_list, folded, vertices, excess, need)
+    search(0, 0, list(need))
+    if best_cost == math.inf:
+        raise ValueError("구매 한도 안에서 부족량을 채울 수 없습니다")
+
+    best_counts = [0] * n_items
+    for group, u in zip(group_list, best_units):
+        parts = [(group, u)]
+        if group.folded is not None:
+            parts.append((group.folded[1], int(group.folded[2][u])))
+        for part, n in parts:
+            for j, c in part.counts(n).items():
+                best_counts[j] = c
+    chosen = {k: c for k, c in zip(keys, best_counts) if c > 0}
+    provided = packages.totals(chosen)
+    surplus = {
+        k: provided[k] - need_all[r]
+        for r, k in enumerate(engine.GEAR_RESOURCES) if provided[k] > need_all[r]
+    }
+    ordered = {k: chosen[k] for k in packages.keys if k in chosen}
+    return PurchasePlan(ordered, int(best_cost), currency, provided, surplus, uncovered, nodes)
@@ -0,0 +1,203 @@
+"""Streamlit 실행(rerun) 한 번의 구간별 시간 측정 (선택 사항).
+
+켜는 방법: 환경 변수 WOS_DEBUG=1 또는 URL 에 ?debug=1
+  - 구간별 시간: 스크립트 중간중간 prof.mark("구간 이름") — 직전 mark 이후 걸린 시간이 그 구간
+  - 구간별 DataFrame 생성 횟수: 앱 코드가 pd.DataFrame 대신 perf_debug.dataframe 으로 만든 표만 센다
+    (pandas / Streamlit 이 안에서 만드는 표는 세지 않는다). 이 실행(스크립트 스레드) 기준.
+  - 최대 메모리: 서버에 WOS_DEBUG 가 켜져 있을 때만 잰다 (?debug=1 로는 켜지지 않는다).
+    측정하는 실행 동안만 tracemalloc 을 켜고 마지막 실행이 끝나면 끈다. tracemalloc 은 프로세스
+    전체 기준이라 다른 디버그 실행과 겹친 실행은 최고치를 기록하지 않는다 (None).
+결과는 화면 아래 "🐞 디버그" 패널과 JSON 한 줄씩 (WOS_DEBUG_LOG, 기본 logs/perf_debug.jsonl).
+
+    prof = perf_debug.start("gear_calc")
+    ...
+    prof.mark("load")
+    ...
+    prof.note("cache", cache.stats())   # 그 밖의 값도 기록에 함께
+    prof.finish()
+
+꺼져 있으면 start() 가 아무 일도 하지 않는 객체를 돌려준다.
+"""
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+import weakref
+from pathlib import Path
+from typing import Dict, Optional
+
+LOG_PATH = Path(os.environ.get("WOS_DEBUG_LOG", "logs/perf_debug.jsonl"))
+
+_log_lock = threading.Lock()
+_RECORD_KEYS = ("ts", "app", "session", "total_ms", "phases_ms", "dataframes", "peak_kb")
+
+# 스크립트 스레드마다 지금 재는 Profiler (약한 참조 — 끝나지 않은 실행이 메모리 추적을 붙잡지 않게)
+_local = threading.local()
+
+# 메모리를 재는 중인 Profiler 들 (tracemalloc 켜고 끄기 / 겹침 표시). finish() 전에 스크립트가
+# 예외나 재실행으로 끝나도 Profiler 가 사라질 때 빠지도록 약한 참조로 둔다.
+_trace_lock = threading.RLock()
+_tracing: "weakref.WeakSet[Profiler]" = weakref.WeakSet()
+_started_tracing = False
+
+
+def _env_on() -> bool:
+    return os.environ.get("WOS_DEBUG", "").lower() in ("1", "true", "yes")
+
+
+def enabled() -> bool:
+    if _env_on():
+        return True
+    try:
+        import streamlit as st
+
+        return st.query_params.get("debug", "").lower() in ("1", "true", "yes")
+    except Exception:
+        return False
+
+
+def _trace_begin(prof: "Profiler") -> None:
+    global _started_tracing
+    # 약한 참조 콜백은 나중에 만든 것부터 불리므로 WeakSet 에 넣기 전에 등록한다 (빠진 뒤에 끄도록)
+    weakref.finalize(prof, _trace_release)
+    with _trace_lock:
+        if _tracing:
+            # 다른 실행과 겹친다: 최고치가 섞이므로 양쪽 모두 기록하지 않는다
+            prof.overlapped = True
+            for other in _tracing:
+                other.overlapped = True
+        else:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _started_tracing = True
+            tracemalloc.reset_peak()
+        _tracing.add(prof)
+
+
+def _trace_release() -> None:
+    """재는 중인 실행이 하나도 없으면 직접 켠 tracemalloc 을 끈다."""
+    global _started_tracing
+    with _trace_lock:
+        # 직접 켠 경우에만 끈다 (python -X tracemalloc 등 밖에서 켠 추적은 그대로)
+        if not _tracing and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+def _trace_end(prof: "Profiler") -> Optional[float]:
+    with _trace_lock:
+        peak = None if prof.overlapped else round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        _tracing.discard(prof)
+        _trace_release()
+        return peak
+
+
+def dataframe(*args, **kwargs):
+    """pd.DataFrame(*args, **kwargs) — 이 스레드에서 재는 실행이 있으면 현재 구간의 생성 횟수에 더한다."""
+    import pandas as pd
+
+    ref = getattr(_local, "profiler", None)
+    prof = ref() if ref is not None else None
+    if prof is not None:
+        prof.frames += 1
+    return pd.DataFrame(*args, **kwargs)
+
+
+class _Noop:
+    def mark(self, name: str) -> None:
+        pass
+
+    def note(self, key: str, value) -> None:
+        pass
+
+    def finish(self) -> None:
+        pass
+
+
+class Profiler:
+    def __init__(self, app: str, trace_memory: bool = False):
+        self.app = app
+        self.phases: Dict[str, float] = {}
+        self.notes: Dict[str, object] = {}
+        # 구간 이름 → DataFrame 생성 횟수, frames 는 직전 mark 이후 센 수
+        self.dataframes: Dict[str, int] = {}
+        self.frames = 0
+        self.trace_memory = trace_memory
+        self.overlapped = False
+        if trace_memory:
+            _trace_begin(self)
+        _local.profiler = weakref.ref(self)
+        self._start = self._last = time.perf_counter()
+
+    def mark(self, name: str) -> None:
+        now = time.perf_counter()
+        self.phases[name] = self.phases.get(name, 0.0) + (now - self._last) * 1000
+        self._last = now
+        if self.frames:
+            self.dataframes[name] = self.dataframes.get(name, 0) + self.frames
+            self.frames = 0
+
+    def note(self, key: str, value) -> None:
+        self.notes[key] = value
+
+    def record(self, peak_kb: Optional[float] = None) -> dict:
+        return {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "app": self.app,
+            "session": _session_id(),
+            "total_ms": round((time.perf_counter() - self._start) * 1000, 3),
+            "phases_ms": {k: round(v, 3) for k, v in self.phases.items()},
+            "dataframes": dict(self.dataframes),
+            "peak_kb": peak_kb,
+            **self.notes,
+        }
+
+    def finish(self) -> None:
+        self.mark("rest")  # 마지막 mark 이후 ~ 스크립트 끝
+        if getattr(_local, "profiler", None) is not None and _local.profiler() is self:
+            _local.profiler = None
+        peak_kb = _trace_end(self) if self.trace_memory else None
+        record = self.record(peak_kb)
+        write_jsonl(record)
+        render(record)
+
+
+def _session_id() -> Optional[str]:
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        ctx = get_script_run_ctx()
+        return ctx.session_id if ctx else None
+    except Exception:
+        return None
+
+
+def write_jsonl(record: dict, path: Path = LOG_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with _log_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(line)
+
+
+def render(record: dict) -> None:
+    import streamlit as st
+
+    with st.expander(f"🐞 디버그: {record['total_ms']:.1f} ms", expanded=False):
+        frames = record.get("dataframes", {})
+        st.table([
+            {"구간": k, "ms": f"{v:.3f}", "DataFrame": frames.get(k, 0)} for k, v in record["phases_ms"].items()
+        ])
+        if record["peak_kb"] is not None:
+            st.markdown(f"- 최대 메모리 (tracemalloc): **{record['peak_kb']:,.1f} KB**")
+        extra = {k: v for k, v in record.items() if k not in _RECORD_KEYS}
+        if extra:
+            st.json(extra, expanded=False)
+
+
+def start(app: str):
+    """디버그가 켜져 있으면 Profiler (메모리는 서버의 WOS_DEBUG 일 때만), 아니면 아무 일도 하지 않는 객체."""
+    if not enabled():
+        return _Noop()
+    return Profiler(app, trace_memory=_env_on())
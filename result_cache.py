@@ -0,0 +1,200 @@
+"""세션 간 공유 결과 캐시 (프로세스 전체, 크기 + 나이 제한 LRU).
+
+같은 계획(입력)은 누가 제출하든 같은 키가 되도록 입력을 정규화해 문자열로 만든다.
+이 문자열은 URL 쿼리(?plan=...)에도 그대로 쓰여, 공유 링크를 열면 바로 결과가 나온다.
+
+    cache = result_cache.shared("build_time_new", maxsize=256, ttl=3600)
+    key = result_cache.encode_plan({"levels": ..., "cs": 85.0})
+    result = cache.get_or_compute(key, lambda: compute(...))
+    cache.stats()  # {"hits": .., "misses": .., "evicted": .., "expired": .., "size": ..}
+
+  - encode_plan: 키 정렬 + 공백 없는 JSON → URL-safe base64 (패딩 제거). 튜플은 리스트로 같아진다.
+  - sanitize_plan: 링크는 누구나 고칠 수 있으므로 decode_plan 결과를 앱이 쓰기 전에 필드별로 검사한다.
+  - 캐시 값은 세션끼리 공유되므로 꺼낸 쪽에서 고치면 안 된다.
+  - 데이터 표가 바뀌면 (data_watch) clear_all() 로 비운다. 비우기 전에 시작한 계산 결과는 넣지 않는다.
+"""
+
+import base64
+import binascii
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Sequence
+
+# st.number_input 이 받는 가장 큰 정수 (JS Number.MAX_SAFE_INTEGER)
+MAX_COUNT = 2 ** 53 - 1
+
+
+def encode_plan(plan: Any) -> str:
+    raw = json.dumps(plan, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_plan(text: str) -> Optional[Any]:
+    """encode_plan 의 역. 깨진 문자열(잘린 링크 등)이면 None."""
+    try:
+        raw = base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+        return json.loads(raw.decode("utf-8"))
+    except (binascii.Error, ValueError):
+        return None
+
+
+# --- 공유 계획 검사 ---
+# 검사 함수는 값을 받아 앱이 그대로 써도 되는 값을 돌려주거나 TypeError / ValueError 를 낸다.
+
+
+def sanitize_plan(plan: Any, fields: Mapping[str, Callable[[Any], Any]]) -> dict:
+    """fields 에 있는 키만, 검사를 통과한 값으로 남긴다 (통과 못 한 필드는 빠져 앱의 기본값이 된다)."""
+    if not isinstance(plan, dict):
+        return {}
+    clean = {}
+    for key, check in fields.items():
+        if key in plan:
+            try:
+                clean[key] = check(plan[key])
+            except (TypeError, ValueError):
+                pass
+    return clean
+
+
+def _number(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError(f"not a number: {value!r}")
+    if not math.isfinite(value):
+        raise ValueError(f"not finite: {value!r}")
+    return value
+
+
+def count(value: Any) -> int:
+    """0 이상 정수 (소수는 버리고, 범위 밖은 0 ~ MAX_COUNT 로 자른다)."""
+    return min(max(int(_number(value)), 0), MAX_COUNT)
+
+
+def amount(value: Any) -> float:
+    """0 이상 실수 (음수는 0)."""
+    return max(float(_number(value)), 0.0)
+
+
+def flag(value: Any) -> bool:
+    if not isinstance(value, bool):
+        raise TypeError(f"not a boolean: {value!r}")
+    return value
+
+
+def one_of(options: Sequence) -> Callable[[Any], Any]:
+    """options 중 하나 (타입까지 같아야 한다 — JSON 의 true 가 0 / 1 로 통하지 않게)."""
+    def check(value: Any) -> Any:
+        if not any(type(value) is type(o) and value == o for o in options):
+            raise ValueError(f"unknown option: {value!r}")
+        return value
+
+    return check
+
+
+def pair(options: Sequence) -> Callable[[Any], tuple]:
+    """options 에 있는 값 두 개 (현재, 목표)."""
+    item = one_of(options)
+
+    def check(value: Any) -> tuple:
+        if not isinstance(value, list) or len(value) != 2:
+            raise TypeError(f"not a pair: {value!r}")
+        return item(value[0]), item(value[1])
+
+    return check
+
+
+def record(checks: Mapping[str, Callable[[Any], Any]]) -> Callable[[Any], dict]:
+    """키마다 검사가 정해진 객체. 모르는 키 (표에 없는 부위 / 건물 등) 가 하나라도 있으면 필드 전체를 버린다."""
+    def check(value: Any) -> dict:
+        if not isinstance(value, dict):
+            raise TypeError(f"not an object: {value!r}")
+        unknown = set(value) - set(checks)
+        if unknown:
+            raise ValueError(f"unknown keys: {sorted(unknown)}")
+        return {k: checks[k](v) for k, v in value.items()}
+
+    return check
+
+
+class ResultCache:
+    """스레드 안전 LRU. maxsize 를 넘으면 가장 오래 안 쓴 것부터, ttl 초가 지난 것은 꺼낼 때 버린다."""
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evicted = self.expired = 0
+        # clear() 마다 1씩 — 비우기 전에 시작한 계산이 끝나고 넣으려는 값을 버리는 데 쓴다
+        self.generation = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._data[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evicted += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """없으면 compute() 로 채운다 (계산은 잠금 밖에서 — 동시에 같은 키면 중복 계산될 수 있다)."""
+        missing = object()
+        generation = self.generation
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value, generation)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evicted": self.evicted,
+                "expired": self.expired,
+                "size": len(self._data),
+            }
+
+
+_caches: Dict[str, ResultCache] = {}
+_caches_lock = threading.Lock()
+
+
+def shared(name: str, maxsize: int = 256, ttl: Optional[float] = 3600) -> ResultCache:
+    """이름별 프로세스 전체 캐시 (Streamlit 은 rerun 마다 스크립트를 다시 실행하지만 모듈은 한 번만 import)."""
+    with _caches_lock:
+        if name not in _caches:
+            _caches[name] = ResultCache(maxsize, ttl)
+        return _caches[name]
+
+
+def clear_all() -> None:
+    """이름별 공유 캐시를 모두 비운다 (데이터 표가 바뀌었을 때)."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
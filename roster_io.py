@@ -0,0 +1,109 @@
+"""연맹원 명단 CLI (batch_deficit, gear_forecast) 가 같이 쓰는 입출력 / 프로세스 풀 도구.
+
+  - read_profiles : CSV 또는 JSONL 명단 → 한 줄씩 (읽지 못한 JSONL 줄은 BadLine)
+  - map_chunks    : 청크마다 함수를 돌려 입력 순서대로 (workers > 0 이면 프로세스 풀)
+  - write_rows    : 결과 dict 를 CSV / JSONL 로 스트리밍
+  - default_workers, open_streams : 명령줄 기본값 / 파일 열고 닫기
+"""
+
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class BadLine:
+    """읽지 못한 JSONL 줄 — 실행을 멈추지 않고 그 자리에 error 행으로 나간다."""
+
+    line: int
+    error: str
+
+
+def read_profiles(f: TextIO, fmt: str) -> Iterator[Union[dict, BadLine]]:
+    if fmt == "csv":
+        yield from csv.DictReader(f)
+        return
+    for lineno, line in enumerate(f, 1):
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                yield BadLine(lineno, f"JSONDecodeError: {e}")
+
+
+def detect_format(path: str) -> str:
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def chunks(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    it = iter(items)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def map_chunks(fn: Callable[..., List[dict]], jobs: Iterable[Tuple], workers: int = 0) -> Iterator[dict]:
+    """jobs 의 인자 묶음마다 fn(*args) (결과 목록) 을 입력 순서대로 이어 내보낸다.
+
+    workers > 0 이면 프로세스 풀을 쓰되, 동시에 대기하는 청크는 workers * 2 개까지만
+    유지해 입력 크기와 상관없이 메모리 사용량이 일정하다.
+    """
+    if workers <= 0:
+        for args in jobs:
+            yield from fn(*args)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for args in jobs:
+            pending.append(pool.submit(fn, *args))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def write_rows(results: Iterable[dict], out: TextIO, fmt: str, fields: Sequence[str]) -> int:
+    n = 0
+    writer: Optional[csv.DictWriter] = None
+    for result in results:
+        if fmt == "csv":
+            if writer is None:
+                writer = csv.DictWriter(out, fieldnames=fields)
+                writer.writeheader()
+            writer.writerow(result)
+        else:
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        n += 1
+    return n
+
+
+def default_workers(path: str, threshold_bytes: int) -> int:
+    """입력 파일이 threshold_bytes 이상이고 CPU 가 2개 이상이면 CPU 수, 아니면 0 (stdin 은 0)."""
+    cpus = os.cpu_count() or 1
+    large = path != "-" and os.path.getsize(path) >= threshold_bytes
+    return cpus if large and cpus > 1 else 0
+
+
+@contextmanager
+def open_streams(input_path: str, output_path: str) -> Iterator[Tuple[TextIO, TextIO]]:
+    """'-' 는 stdin / stdout (닫지 않는다)."""
+    fin = sys.stdin if input_path == "-" else open(input_path, newline="", encoding="utf-8-sig")
+    try:
+        fout = sys.stdout if output_path == "-" else open(output_path, "w", newline="", encoding="utf-8")
+        try:
+            yield fin, fout
+        finally:
+            if fout is not sys.stdout:
+                fout.close()
+    finally:
+        if fin is not sys.stdin:
+            fin.close()
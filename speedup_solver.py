@@ -0,0 +1,121 @@
+"""건설 계획에 가속 아이템 배분 (업그레이드별 초과분 최소화).
+
+    from speedup_solver import allocate_speedups
+    plan = allocate_speedups(upgrades, construction={"1h": 300, "24h": 20}, general={"5m": 900})
+    plan.uses[0].construction, plan.total_overshoot
+
+upgrades 는 build_scheduler.Upgrade 목록 (seconds = 버프 적용 후 건설 시간) 이고, 주어진 순서대로
+(보통 대기열 일정의 시작 순) 한 업그레이드씩 즉시 완료시킨다.
+
+업그레이드마다
+  - 필요한 분 M = ⌈초 / 60⌉ 이상을 만드는 조합 중 합이 가장 작은 것 (초과분 = 합 - 건설 시간) 을
+    정확히 구한다. 도달 가능한 분 합을 파이썬 정수 비트셋으로 만들고 (아이템 개수는 1, 2, 4, ...
+    묶음으로 나눠 비트 시프트), M 이상인 가장 작은 합을 고른다.
+  - 합이 같은 조합이 여럿이면 건설 가속을 일반 가속보다, 큰 아이템을 작은 아이템보다 먼저 쓴다
+    (일반 가속과 잔돈 역할의 작은 아이템을 뒤 업그레이드용으로 남긴다).
+  - 남은 아이템으로 완료할 수 없으면 남은 것을 모두 쓰고 (초과분 0) 이후 업그레이드는 건너뛴다.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from build_scheduler import Upgrade
+
+# 가속 아이템 → 분
+SPEEDUP_MINUTES: Dict[str, int] = {"1m": 1, "5m": 5, "1h": 60, "3h": 180, "8h": 480, "24h": 1440}
+
+
+@dataclass(frozen=True)
+class SpeedupUse:
+    building: str
+    level: str
+    seconds: float
+    construction: Dict[str, int]
+    general: Dict[str, int]
+    # 아이템 합이 건설 시간을 넘는 초 / 아이템이 모자라 남은 초
+    overshoot: float
+    remaining: float = 0.0
+
+
+@dataclass
+class SpeedupPlan:
+    uses: List[SpeedupUse]
+    leftover_construction: Dict[str, int]
+    leftover_general: Dict[str, int]
+
+    @property
+    def total_overshoot(self) -> float:
+        return sum(u.overshoot for u in self.uses)
+
+    @property
+    def completed(self) -> int:
+        return sum(1 for u in self.uses if u.remaining == 0)
+
+
+def _pieces(stock: Mapping[str, int], limit: int) -> List[Tuple[str, int, int]]:
+    """(아이템, 개수, 분) 묶음 — 큰 아이템부터, 개수는 limit 분을 넘지 않게 자른 뒤 이진 분할."""
+    pieces = []
+    for name, minutes in sorted(SPEEDUP_MINUTES.items(), key=lambda kv: -kv[1]):
+        left, m = min(stock.get(name, 0), -(-limit // minutes)), 1
+        while left > 0:
+            m = min(m, left)
+            pieces.append((name, m, m * minutes))
+            left -= m
+            m *= 2
+    return pieces
+
+
+def _cover(
+    need: int, construction: Mapping[str, int], general: Mapping[str, int]
+) -> Tuple[int, Dict[str, int], Dict[str, int]]:
+    """need 분 이상 중 가장 작은 합과 그 조합. 만들 수 없으면 합 -1."""
+    limit = need + max(SPEEDUP_MINUTES.values())
+    pieces = [(0, *p) for p in _pieces(construction, limit)] + [(1, *p) for p in _pieces(general, limit)]
+    mask = (1 << (limit + 1)) - 1
+    reach = [1]
+    for _, _, _, minutes in pieces:
+        reach.append((reach[-1] | reach[-1] << minutes) & mask)
+    above = reach[-1] >> need
+    if not above:
+        return -1, {}, {}
+    total = need + ((above & -above).bit_length() - 1)
+    # 뒤쪽 묶음(일반 가속, 작은 아이템)부터 빼 보며 되짚는다
+    used: Tuple[Dict[str, int], Dict[str, int]] = ({}, {})
+    t = total
+    for i in range(len(pieces) - 1, -1, -1):
+        if reach[i] >> t & 1:
+            continue
+        pool, name, count, minutes = pieces[i]
+        used[pool][name] = used[pool].get(name, 0) + count
+        t -= minutes
+    return total, used[0], used[1]
+
+
+def allocate_speedups(
+    upgrades: Sequence[Upgrade],
+    construction: Mapping[str, int],
+    general: Optional[Mapping[str, int]] = None,
+) -> SpeedupPlan:
+    stock = ({k: int(v) for k, v in construction.items() if v > 0},
+             {k: int(v) for k, v in (general or {}).items() if v > 0})
+    uses: List[SpeedupUse] = []
+    exhausted = False
+    for up in upgrades:
+        need = math.ceil(up.seconds / 60)
+        total, con, gen = (-1, {}, {}) if exhausted else _cover(need, *stock)
+        if total < 0:
+            # 남은 아이템을 모두 써도 완료할 수 없음
+            con, gen = dict(stock[0]), dict(stock[1])
+            spent = 60 * sum(SPEEDUP_MINUTES[k] * c for pool in (con, gen) for k, c in pool.items())
+            overshoot, remaining = 0.0, max(0.0, up.seconds - spent)
+            exhausted = True
+        else:
+            overshoot, remaining = 60 * total - up.seconds, 0.0
+        for pool, used in zip(stock, (con, gen)):
+            for k, c in used.items():
+                pool[k] -= c
+                if not pool[k]:
+                    del pool[k]
+        uses.append(SpeedupUse(up.building, up.level, up.seconds, con, gen, overshoot, remaining))
+    return SpeedupPlan(uses, dict(stock[0]), dict(stock[1]))
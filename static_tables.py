@@ -0,0 +1,155 @@
+"""모든 (현재, 목표) 조합의 비용을 미리 계산해 정적 파일로 쓴다 (빌드 단계).
+
+    python static_tables.py                # → dist/
+    python static_tables.py --out /srv/wos --check
+
+장비 등급 42개, 건물당 레벨 80개 이하라 전부 펼쳐도 작다. 파이썬 서버 없이 정적 호스팅(CDN)
+만으로 프런트엔드가 표 조회 한 번으로 답할 수 있다.
+
+출력
+  - manifest.json            : 파일 이름, 모양, 원본 CSV 체크섬. 이것만 짧게 캐시한다.
+  - gear.<해시>.json          : {"levels": [...], "resources": [...], "costs": [[[D, A, P, Am], ...], ...]}
+                               costs[i][j] = i번 등급 → j번 등급 비용 (i >= j 면 0)
+  - build.<해시>.json         : {건물: {"levels": [...], "seconds": [[...], ...]}}
+                               seconds[i][j] = i번 레벨 → j번 레벨 순수 건설 시간(초, 버프 전)
+  - tables.<해시>.bin         : 위 두 표를 int64 (리틀 엔디언) 로 이어 붙인 것. 위치는 manifest 의 "binary".
+  - index.html               : static/index.html (manifest 만 읽어 조회하는 정적 페이지)
+
+  파일 이름에 내용 해시가 들어가므로 표 파일은 오래 캐시해도 된다 (immutable).
+"""
+
+import argparse
+import hashlib
+import json
+import shutil
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import calc_engine as engine
+import data_snapshot
+
+ROOT = Path(__file__).resolve().parent
+DEFAULT_OUT = ROOT / "dist"
+FRONTEND = ROOT / "static" / "index.html"
+
+
+def gear_matrix(table: Optional[engine.GearTable] = None) -> List[List[Tuple[int, ...]]]:
+    table = table or engine.load_gear_table()
+    n = len(table.levels)
+    return [[table.range_cost_between(i, j) for j in range(n)] for i in range(n)]
+
+
+def build_matrix(building: str, table: Optional[engine.BuildTable] = None) -> List[List[int]]:
+    table = table or engine.load_build_table()
+    nums = sorted(table.totals[building])
+    return [[int(table.range_total_between(building, lo, hi)) for hi in nums] for lo in nums]
+
+
+def _write(out: Path, stem: str, suffix: str, data: bytes) -> str:
+    name = f"{stem}.{hashlib.blake2b(data, digest_size=6).hexdigest()}{suffix}"
+    (out / name).write_bytes(data)
+    return name
+
+
+def _json(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def build(out: Path = DEFAULT_OUT) -> Path:
+    """표를 펼쳐 out 에 쓰고 manifest.json 경로를 돌려준다 (예전 해시 파일은 지운다)."""
+    out = Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    gear_table = engine.load_gear_table()
+    build_table = engine.load_build_table()
+
+    gear = gear_matrix(gear_table)
+    build_tables = {b: build_matrix(b, build_table) for b in build_table.levels}
+
+    flat = array("q")
+    binary: Dict[str, Dict] = {}
+
+    def add(name: str, shape: List[int], values) -> None:
+        binary[name] = {"offset": len(flat) * 8, "shape": shape}
+        flat.extend(values)
+
+    add("gear", [len(gear), len(gear), len(engine.GEAR_RESOURCES)], (v for row in gear for cost in row for v in cost))
+    for b, matrix in build_tables.items():
+        add(f"build/{b}", [len(matrix), len(matrix)], (v for row in matrix for v in row))
+    if sys.byteorder != "little":
+        flat.byteswap()
+
+    old = {p.name for p in out.glob("*.*.json")} | {p.name for p in out.glob("*.*.bin")}
+    files = {
+        "gear": _write(out, "gear", ".json", _json({
+            "levels": list(gear_table.levels),
+            "resources": list(engine.GEAR_RESOURCES),
+            "costs": [[list(cost) for cost in row] for row in gear],
+        })),
+        "build": _write(out, "build", ".json", _json({
+            b: {"levels": list(build_table.levels[b]), "seconds": matrix} for b, matrix in build_tables.items()
+        })),
+        "binary": _write(out, "tables", ".bin", flat.tobytes()),
+    }
+    manifest = {
+        "files": files,
+        "binary": {"dtype": "<i8", "arrays": binary},
+        "sources": {name: data_snapshot.checksum(engine.DATA_DIR / name) for name in data_snapshot.SOURCES.values()},
+    }
+    path = out / "manifest.json"
+    path.write_bytes(_json(manifest))
+    if FRONTEND.exists():
+        shutil.copyfile(FRONTEND, out / "index.html")
+    for name in old - set(files.values()):
+        (out / name).unlink()
+    return path
+
+
+def check(out: Path = DEFAULT_OUT) -> int:
+    """쓴 파일을 다시 읽어 calc_engine 계산과 모든 칸을 비교한다. 다른 칸 수를 돌려준다."""
+    out = Path(out)
+    manifest = json.loads((out / "manifest.json").read_text(encoding="utf-8"))
+    gear = json.loads((out / manifest["files"]["gear"]).read_text(encoding="utf-8"))
+    build_tables = json.loads((out / manifest["files"]["build"]).read_text(encoding="utf-8"))
+    gear_table, build_table = engine.load_gear_table(), engine.load_build_table()
+
+    bad = 0
+    for i, cur in enumerate(gear["levels"]):
+        for j, tar in enumerate(gear["levels"]):
+            bad += list(gear_table.range_cost(cur, tar)) != gear["costs"][i][j]
+    for b, t in build_tables.items():
+        for i, start in enumerate(t["levels"]):
+            for j, end in enumerate(t["levels"]):
+                bad += int(build_table.range_total(b, start, end)) != t["seconds"][i][j]
+
+    flat = array("q", (out / manifest["files"]["binary"]).read_bytes())
+    if sys.byteorder != "little":
+        flat.byteswap()
+    spec = manifest["binary"]["arrays"]["gear"]
+    n, _, r = spec["shape"]
+    start = spec["offset"] // 8
+    bad += list(flat[start:start + n * n * r]) != [v for row in gear["costs"] for cost in row for v in cost]
+    return bad
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="모든 구간 비용 정적 표 빌드")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT)
+    parser.add_argument("--check", action="store_true", help="쓴 뒤 calc_engine 과 모든 칸 비교")
+    args = parser.parse_args(argv)
+
+    manifest = build(args.out)
+    sizes = sorted((p.name, p.stat().st_size) for p in args.out.iterdir() if p.is_file())
+    for name, size in sizes:
+        print(f"  {name:<32} {size:>10,} bytes")
+    print(f"→ {manifest}")
+    if args.check:
+        bad = check(args.out)
+        print(f"check: {'OK' if not bad else f'{bad} mismatches'}")
+        return 1 if bad else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""api_server 의 요청 검사 — 잘못된 값은 연결을 끊지 않고 400 으로 답한다.
+
+    python -m pytest tests
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import api_server  # noqa: E402
+import result_cache  # noqa: E402
+
+LEVELS = {"Furnace": ["FC5", "FC8"]}
+
+
+def _post(path, body):
+    api = api_server.Api(result_cache.ResultCache(maxsize=16, ttl=60))
+    return api.dispatch("POST", path, json.dumps(body).encode())
+
+
+def test_build_time_ok():
+    status, payload = _post("/build/time", {"levels": LEVELS, "construction_speed": 85, "vp": False})
+    assert status == 200
+    assert 0 < payload["adjusted_seconds"] < payload["total_seconds"]
+
+
+@pytest.mark.parametrize("field", ["construction_speed", "hyena"])
+@pytest.mark.parametrize("value", [-100, -150, "85", True, None])
+def test_build_time_rejects_bad_rates(field, value):
+    status, payload = _post("/build/time", {"levels": LEVELS, field: value, "vp": False})
+    assert status == 400
+    assert field in payload["error"]
+
+
+@pytest.mark.parametrize("raw", [b'{"levels": {}, "construction_speed": Infinity}',
+                                 b'{"levels": {}, "hyena": NaN}'])
+def test_build_time_rejects_non_finite(raw):
+    api = api_server.Api(result_cache.ResultCache(maxsize=16, ttl=60))
+    status, _ = api.dispatch("POST", "/build/time", raw)
+    assert status == 400
+
+
+@pytest.mark.parametrize("flag", ["double_time", "vp"])
+def test_build_time_rejects_non_boolean_flags(flag):
+    status, payload = _post("/build/time", {"levels": LEVELS, flag: "false"})
+    assert status == 400
+    assert flag in payload["error"]
+
+
+def test_arithmetic_error_becomes_400(monkeypatch):
+    def broken(body):
+        return 1 / 0
+
+    monkeypatch.setitem(api_server.HANDLERS, "/build/time", broken)
+    status, payload = _post("/build/time", {})
+    assert status == 400
+    assert payload["error"].startswith("ZeroDivisionError")
+
+
+@pytest.mark.parametrize("count", [-1, 1.5, "2", True])
+def test_package_totals_rejects_bad_counts(count):
+    status, _ = _post("/packages/totals", {"packages": {"Sublime_$5": count}})
+    assert status == 400
+
+
+def test_package_totals_ok():
+    status, payload = _post("/packages/totals", {"packages": {"Sublime_$5": 2}})
+    assert status == 200
+    assert any(payload.values())
+
+
+@pytest.mark.parametrize("body", [
+    {"parts": {"Coat": ["Gold", "Legendary"]}, "owned": {"Alloy": -5}},
+    {"parts": {"Coat": ["Gold", "Legendary"]}, "owned": {"Alloy": 0.5}},
+    {"parts": {"Coat": ["Gold", "Legendary"]}, "packages": {"Sublime_$5": -1}},
+    {"Coat_cur": "Gold", "Coat_tar": "Legendary", "Polish": -1},
+])
+def test_gear_deficit_rejects_bad_amounts(body):
+    status, _ = _post("/gear/deficit", body)
+    assert status == 400
+
+
+def test_gear_deficit_ok():
+    status, payload = _post("/gear/deficit", {"parts": {"Coat": ["Gold", "Legendary"]}, "owned": {"Alloy": 100}})
+    assert status == 200
+    assert payload["Alloy_owned"] == 100
+
+
+def test_batch_reports_errors_per_item():
+    status, payload = _post("/batch", [
+        {"path": "/build/time", "body": {"levels": LEVELS, "construction_speed": -100, "vp": False}},
+        {"path": "/build/time", "body": {"levels": LEVELS}},
+    ])
+    assert status == 200
+    assert payload[0]["status"] == 400 and "result" in payload[1]
@@ -0,0 +1,74 @@
+"""앱 화면에 쓰는 고정 이름표 (프로세스 전체가 읽기 전용 한 벌을 같이 쓴다).
+
+앱 스크립트는 실행(rerun) 마다 처음부터 다시 돌고, 위젯의 format_func · fragment 가 그 실행의
+전역을 붙잡고 있어 스크립트 안에서 만든 표는 접속한 세션마다 한 벌씩 남는다. 바뀌지 않는 이름표는
+여기 두고 스크립트는 참조만 한다 (표 데이터는 calc_engine / data_snapshot 이 같은 방식으로 공유).
+"""
+
+from types import MappingProxyType
+from typing import Mapping, Tuple
+
+# --- 영주 장비 ---
+
+GEAR_LEVELS_KO: Mapping[str, str] = MappingProxyType({
+    "Green": "고급", "Green 1*": "고급 1성",
+    "Blue": "레어", "Blue 1*": "레어 1성", "Blue 2*": "레어 2성", "Blue 3*": "레어 3성",
+    "Purple": "에픽", "Purple 1*": "에픽 1성", "Purple 2*": "에픽 2성", "Purple 3*": "에픽 3성",
+    "Purple T1": "에픽 T1", "Purple T1 1*": "에픽 T1 1성", "Purple T1 2*": "에픽 T1 2성", "Purple T1 3*": "에픽 T1 3성",
+    "Gold": "레전드", "Gold 1*": "레전드 1성", "Gold 2*": "레전드 2성", "Gold 3*": "레전드 3성",
+    "Gold T1": "레전드 T1", "Gold T1 1*": "레전드 T1 1성", "Gold T1 2*": "레전드 T1 2성", "Gold T1 3*": "레전드 T1 3성",
+    "Gold T2": "레전드 T2", "Gold T2 1*": "레전드 T2 1성", "Gold T2 2*": "레전드 T2 2성", "Gold T2 3*": "레전드 T2 3성",
+    "Legendary": "신화", "Legendary 1*": "신화 1성", "Legendary 2*": "신화 2성", "Legendary 3*": "신화 3성",
+    "Legendary T1": "신화 T1", "Legendary T1 1*": "신화 T1 1성", "Legendary T1 2*": "신화 T1 2성", "Legendary T1 3*": "신화 T1 3성",
+    "Legendary T2": "신화 T2", "Legendary T2 1*": "신화 T2 1성", "Legendary T2 2*": "신화 T2 2성", "Legendary T2 3*": "신화 T2 3성",
+    "Legendary T3": "신화 T3", "Legendary T3 1*": "신화 T3 1성", "Legendary T3 2*": "신화 T3 2성", "Legendary T3 3*": "신화 T3 3성",
+})
+
+# 병종별 부위
+GEAR_GROUPS_KO: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "방패병": ("Coat", "Pants"),
+    "궁병": ("Ring", "Cudgel"),
+    "창병": ("Hat", "Watch"),
+})
+GEAR_GROUPS_EN: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "Infantry": ("Coat", "Pants"),
+    "Marksman": ("Ring", "Cudgel"),
+    "Lancer": ("Hat", "Watch"),
+})
+
+GEAR_PARTS_KO: Mapping[str, str] = MappingProxyType({
+    "Hat": "모자",
+    "Coat": "상의",
+    "Ring": "반지",
+    "Watch": "시계",
+    "Pants": "하의",
+    "Cudgel": "지팡이",
+})
+
+
+def gear_level_ko(level: str) -> str:
+    """selectbox format_func 용 (스크립트의 람다와 달리 실행 전역을 붙잡지 않는다)."""
+    return GEAR_LEVELS_KO.get(level, level)
+
+
+# --- 패키지 ---
+
+PACKAGE_PRICES: Tuple[str, ...] = ("$5", "$10", "$20", "$50", "$100")
+PACKAGE_PRICES_KRW: Mapping[str, str] = MappingProxyType({
+    "$5": "7,500원", "$10": "15,000원", "$20": "30,000원", "$50": "79,000원", "$100": "149,000원",
+})
+ARTISAN_TYPES: Tuple[str, ...] = ("Sublime", "Exquisite", "Classic")
+
+# --- 건물 (영어 → 한글 병기) ---
+
+BUILDING_LABELS: Mapping[str, str] = MappingProxyType({
+    "Furnace": "Furnace (용광로)",
+    "Embassy": "Embassy (대사관)",
+    "Command Center": "Command Center (지휘부)",
+    "Infantry Camp": "Infantry Camp (방패병영)",
+    "Lancer Camp": "Lancer Camp (창병병영)",
+    "Marksman Camp": "Marksman Camp (궁병병영)",
+    "War Academy": "War Academy (전쟁아카데미)",
+    "Infirmary": "Infirmary (의무실)",
+    "Research Center": "Research Center (연구소)",
+})